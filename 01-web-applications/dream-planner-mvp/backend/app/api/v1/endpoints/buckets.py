@@ -0,0 +1,336 @@
+"""
+Bucket API endpoints - the Foundation/Dream/Life money ledger
+
+Balances are read from a materialized table (three rows per user), and
+history pages are index range scans, so neither slows down as the ledger
+grows. The ledger is append-only: mistakes are fixed with an adjustment.
+/optimize sweeps a grid of Foundation/Dream/Life splits against the user's
+dreams and returns the Pareto front.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.compute import compute_executor, offload
+from app.core.config import settings
+from app.core.telemetry import telemetry
+from app.models.bucket import Bucket, BucketEntry, BucketTransaction, ReasonCategory, TransactionType
+from app.models.database import get_async_db
+from app.models.dream import Dream, DreamStatus
+from app.schemas.bucket import (
+    AllocationRequest,
+    AllocationResponse,
+    BucketTransactionCreate,
+    BucketTransactionResponse,
+    BucketBalanceResponse,
+    BucketBalancesResponse,
+    BucketHistoryEntry,
+    BucketStatistics
+)
+from app.services.allocation import (
+    BUCKETS,
+    SplitScores,
+    build_plan,
+    merge_fronts,
+    dominated_by,
+    plan_chunks,
+    recommend,
+    score_splits,
+    split_grid,
+    strategy_shares,
+    sweep_front
+)
+from app.services.finance import periods_to_goal
+from app.services.ledger import InsufficientFunds, get_balances, record_transaction, transaction_statistics
+from app.services.metrics import dream_metrics
+from app.services.pagination import InvalidCursor, apply_keyset, decode_cursor, encode_cursor
+
+router = APIRouter()
+
+# Cursor sort key for bucket history pages
+HISTORY_SORT = "bucket_history"
+
+@router.post("/transactions", response_model=BucketTransactionResponse, status_code=201)
+async def create_transaction(
+    transaction: BucketTransactionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Record a money movement into, out of, or between buckets.
+
+    The transaction, its per-bucket entries and the new balances are
+    written together - either all of them land or none do.
+    """
+    try:
+        db_transaction, entries = await record_transaction(
+            db,
+            user.id,
+            transaction.type,
+            transaction.amount,
+            transaction.from_bucket,
+            transaction.to_bucket,
+            transaction.reason,
+            transaction.category,
+            transaction.notes
+        )
+    except InsufficientFunds as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    await db.commit()
+
+    return BucketTransactionResponse(
+        id=db_transaction.id,
+        type=db_transaction.type,
+        amount=db_transaction.amount,
+        from_bucket=db_transaction.from_bucket,
+        to_bucket=db_transaction.to_bucket,
+        reason=db_transaction.reason,
+        category=db_transaction.category,
+        notes=db_transaction.notes,
+        created_at=db_transaction.created_at,
+        balances_after={entry.bucket.value: round(entry.balance_after, 2) for entry in entries}
+    )
+
+@router.get("/balances", response_model=BucketBalancesResponse)
+async def get_bucket_balances(
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Current balance of each bucket - a primary-key read, however long the history"""
+    balances = []
+    for bucket, row in (await get_balances(db, user.id)).items():
+        if row is None:
+            balances.append(BucketBalanceResponse(bucket=bucket, balance=0.0, total_in=0.0, total_out=0.0, entry_count=0))
+        else:
+            balances.append(BucketBalanceResponse(
+                bucket=bucket,
+                balance=round(row.balance, 2),
+                total_in=round(row.total_in, 2),
+                total_out=round(row.total_out, 2),
+                entry_count=row.entry_count,
+                updated_at=row.updated_at
+            ))
+
+    return BucketBalancesResponse(balances=balances, total=round(sum(b.balance for b in balances), 2))
+
+@router.get("/statistics", response_model=BucketStatistics)
+async def get_statistics(
+    start: Optional[datetime] = Query(None, description="Only transactions at or after this time (UTC)"),
+    end: Optional[datetime] = Query(None, description="Only transactions at or before this time (UTC)"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Transaction counts and totals by type, category, month and bucket"""
+    stats = await transaction_statistics(db, user.id, start, end)
+    balances = await get_balances(db, user.id)
+    stats["current_balances"] = {
+        bucket.value: round(row.balance, 2) if row is not None else 0.0 for bucket, row in balances.items()
+    }
+    return stats
+
+@router.get("/{bucket}/history", response_model=List[BucketHistoryEntry])
+async def get_bucket_history(
+    bucket: Bucket,
+    response: Response,
+    start: Optional[datetime] = Query(None, description="Only entries at or after this time (UTC)"),
+    end: Optional[datetime] = Query(None, description="Only entries at or before this time (UTC)"),
+    type: Optional[TransactionType] = Query(None, description="Filter by transaction type"),
+    category: Optional[ReasonCategory] = Query(None, description="Filter by reason category"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Only entries moving at least this much"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of entries to return"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Get a bucket's transactions, newest first, with the running balance.
+
+    Served from the (user, bucket, time) index: a page costs one range
+    scan whatever the ledger's size. Paging works like the dream list -
+    pass X-Next-Cursor back as `cursor`.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, HISTORY_SORT, is_datetime=True)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    query = (
+        select(BucketEntry, BucketTransaction)
+        .join(BucketTransaction, BucketTransaction.id == BucketEntry.transaction_id)
+        .where(BucketEntry.user_id == user.id, BucketEntry.bucket == bucket)
+    )
+    if start is not None:
+        query = query.where(BucketEntry.created_at >= start)
+    if end is not None:
+        query = query.where(BucketEntry.created_at <= end)
+    if type:
+        query = query.where(BucketTransaction.type == type)
+    if category:
+        query = query.where(BucketTransaction.category == category)
+    if min_amount is not None:
+        query = query.where(BucketTransaction.amount >= min_amount)
+
+    query = apply_keyset(query, BucketEntry.created_at, BucketEntry.id, True, after).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_entry = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_cursor(HISTORY_SORT, last_entry.created_at, last_entry.id)
+
+    history = []
+    for entry, transaction in rows:
+        counterparty = transaction.to_bucket if entry.amount < 0 else transaction.from_bucket
+        history.append(BucketHistoryEntry(
+            entry_id=entry.id,
+            transaction_id=transaction.id,
+            type=transaction.type,
+            category=transaction.category,
+            reason=transaction.reason,
+            amount=round(entry.amount, 2),
+            balance_after=round(entry.balance_after, 2),
+            counterparty=counterparty,
+            created_at=entry.created_at
+        ))
+    return history
+
+@router.post("/optimize", response_model=AllocationResponse)
+async def optimize_allocation(
+    request: AllocationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Find the best ways to split monthly savings across the three buckets.
+
+    Every split on the grid is scored at once - Foundation value at the
+    horizon, months the user's dreams would finish late, months to fill the
+    emergency fund - and the non-dominated splits come back with a
+    recommended one and the client-side strategies for comparison. Big
+    grids or many dreams are scored in parallel on the compute pool.
+    """
+    query = select(
+        Dream.id, Dream.title, Dream.target_amount, Dream.current_saved, Dream.target_date
+    ).where(Dream.user_id == user.id, Dream.status == DreamStatus.active)
+    if request.dream_ids:
+        query = query.where(Dream.id.in_(request.dream_ids))
+    rows = (await db.execute(query.order_by(Dream.id))).all()
+    if request.dream_ids:
+        missing = sorted(set(request.dream_ids) - {row.id for row in rows})
+        if missing:
+            raise HTTPException(status_code=404, detail=f"No active dreams with ids {missing}")
+    balances = await get_balances(db, user.id)
+    # Everything needed is loaded - give the connection back while the sweep runs
+    await db.close()
+
+    # Only dreams that still need money and still have time count towards the score
+    scored = []
+    for dream_id, title, target_amount, current_saved, target_date in rows:
+        metrics = dream_metrics.lookup(dream_id, target_amount, current_saved, target_date)
+        if metrics.days_remaining > 0 and metrics.amount_remaining > 0:
+            scored.append((dream_id, title, target_amount, current_saved or 0.0, metrics))
+
+    foundation, life = balances[Bucket.foundation], balances[Bucket.life]
+    plan = build_plan(
+        request.available_monthly,
+        [(target, saved, metrics.days_remaining, metrics.monthly_amount) for _, _, target, saved, metrics in scored],
+        savings_rate=settings.savings_annual_rate,
+        foundation_balance=foundation.balance if foundation is not None else 0.0,
+        foundation_return=request.foundation_return,
+        horizon_years=request.horizon_years,
+        emergency_gap=request.monthly_expenses * request.emergency_fund_months - (life.balance if life is not None else 0.0)
+    )
+
+    shares = split_grid(
+        request.step,
+        {bucket.value: share for bucket, share in request.min_shares.items()},
+        {bucket.value: share for bucket, share in request.max_shares.items()}
+    )
+    if not len(shares):
+        raise HTTPException(status_code=400, detail="No split on the grid satisfies the share bounds - try a finer step")
+
+    jobs = plan_chunks(len(shares), len(scored), compute_executor.max_workers, settings.allocation_parallel_cells)
+    if jobs == 1:
+        with telemetry.calc_timer():
+            front = sweep_front(shares, plan)
+        jobs = 0
+    else:
+        # Each piece of the grid is scored in its own worker; their fronts merge into the overall one
+        fronts = await asyncio.gather(*(offload(sweep_front, piece, plan) for piece in np.array_split(shares, jobs)))
+        front = merge_fronts(fronts)
+
+    # Highest Foundation share first, then highest Dream share
+    front = front.take(np.lexsort((-front.shares[:, 1], -front.shares[:, 0])))
+    best = recommend(front)
+
+    names, strategy_splits = strategy_shares()
+    strategies = score_splits(strategy_splits, plan)
+    on_front = (~dominated_by(strategies.objectives(), front.objectives())).tolist()
+
+    dream_monthly = front.shares[best, 1] * plan.available_monthly * plan.weights
+    dream_months = periods_to_goal(plan.targets, plan.saved, dream_monthly, plan.savings_rate / 12)
+
+    points = _allocation_points(front, plan.available_monthly)
+    return AllocationResponse(
+        available_monthly=request.available_monthly,
+        splits_evaluated=len(shares),
+        dreams_scored=len(scored),
+        dreams_skipped=len(rows) - len(scored),
+        parallel_jobs=jobs,
+        front=points,
+        recommended=points[best],
+        recommended_dreams=[
+            {
+                "dream_id": dream_id,
+                "title": title,
+                "monthly_contribution": round(monthly, 2),
+                "months_to_goal": _finite(months),
+                "months_available": round(deadline, 1),
+                "on_time": months <= deadline + 1e-6
+            }
+            for (dream_id, title, _, _, _), monthly, months, deadline in zip(
+                scored, dream_monthly.tolist(), dream_months.tolist(), plan.deadline_months.tolist()
+            )
+        ],
+        strategies=[
+            {**point, "strategy": name, "on_front": flag}
+            for name, point, flag in zip(names, _allocation_points(strategies, plan.available_monthly), on_front)
+        ]
+    )
+
+def _finite(value: float, digits: int = 1) -> Optional[float]:
+    """Round for display; None stands in for "never" (inf)"""
+    return round(value, digits) if np.isfinite(value) else None
+
+def _allocation_points(scores: SplitScores, available_monthly: float) -> List[dict]:
+    """Response rows for scored splits (plain lists - fronts can hold thousands of splits)"""
+    shares = scores.shares.tolist()
+    return [
+        {
+            **{f"{bucket}_share": round(share, 4) for bucket, share in zip(BUCKETS, split)},
+            **{f"{bucket}_monthly": round(share * available_monthly, 2) for bucket, share in zip(BUCKETS, split)},
+            "foundation_value": round(value, 2),
+            "months_late": _finite(late),
+            "dreams_on_time": on_time,
+            "months_to_all_dreams": _finite(last),
+            "emergency_months": _finite(emergency)
+        }
+        for split, value, late, on_time, last, emergency in zip(
+            shares,
+            scores.foundation_value.tolist(),
+            scores.months_late.tolist(),
+            scores.dreams_on_time.tolist(),
+            scores.last_dream_months.tolist(),
+            scores.emergency_months.tolist()
+        )
+    ]
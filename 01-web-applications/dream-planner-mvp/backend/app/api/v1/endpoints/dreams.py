@@ -5,28 +5,68 @@ These endpoints handle CRUD operations for financial dreams/goals.
 The magic happens in showing users their big dreams are achievable through daily habits.
 """
 
+import json
+import math
+from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.database import get_db
+from app.core.auth import CurrentUser, get_current_user
+from app.core.cache import CachedResponse, response_cache
+from app.core.coalesce import fingerprint, singleflight
+from app.core.compute import offload
+from app.core.serialization import FormatUnavailable, ListFormat, dumps, encode
+from app.core.telemetry import telemetry
+from app.models.database import AsyncSessionLocal, get_async_db
 from app.models.dream import Dream, DreamStatus, DreamCategory
+from app.models.progress import DreamProgress
+from app.models.snapshot import DreamSnapshot, SnapshotResolution
 from app.schemas.dream import (
     DreamCreate, 
     DreamUpdate, 
     DreamResponse, 
     DreamSummary,
+    DreamSort,
+    SortOrder,
     CalculationRequest,
-    CalculationResponse
+    CalculationResponse,
+    BatchCalculationRequest,
+    DreamProgressResponse,
+    ProgressPoint,
+    ProgressCheckIn,
+    ProgressCheckInResponse,
+    ProgressSummary
 )
+from app.schemas.simulation import SimulationRequest, SimulationResponse
+from app.services.calculations import (
+    COFFEE_PRICE,
+    LUNCH_PRICE,
+    STREAMING_PRICE,
+    MOVIE_PRICE,
+    ACHIEVABLE_DAILY_LIMIT,
+    calculate_batch
+)
+from app.services.finance import required_contribution
+from app.services.metrics import dream_metrics
+from app.services.pagination import InvalidCursor, apply_keyset, decode_cursor, encode_cursor
+from app.services.progress import progress_summary, record_progress
+from app.services.simulation import run_dream_simulation
+from app.services.snapshots import record_snapshots
 
 router = APIRouter()
 
+# Identical concurrent requests share one load or simulation (see app.core.coalesce)
+dream_flights = singleflight("dream_detail")
+simulation_flights = singleflight("dream_simulation")
+
 @router.post("/", response_model=DreamResponse, status_code=201)
 async def create_dream(
     dream: DreamCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
     Create a new dream/financial goal.
@@ -36,6 +76,7 @@ async def create_dream(
     """
     # Create the dream record
     db_dream = Dream(
+        user_id=user.id,
         title=dream.title,
         description=dream.description,
         category=dream.category,
@@ -47,66 +88,167 @@ async def create_dream(
     )
     
     db.add(db_dream)
-    db.commit()
-    db.refresh(db_dream)
+    await db.flush()
+    await record_snapshots(db, [(db_dream.id, db_dream.current_saved, db_dream.target_amount)])
+    await db.commit()
+    await db.refresh(db_dream)
+    await response_cache.invalidate_dream(user.id)
     
     # Return with calculated fields that show achievability
-    return _build_dream_response(db_dream)
+    return _json_response(_build_dream_response(db_dream), status_code=201)
+
+# Sort key -> (SQL expression, natural direction)
+SORT_COLUMNS = {
+    DreamSort.created: (Dream.created_at, SortOrder.desc),
+    DreamSort.target_date: (Dream.target_date, SortOrder.asc),
+    DreamSort.target_amount: (Dream.target_amount, SortOrder.asc),
+    DreamSort.daily_amount: (Dream.daily_amount, SortOrder.asc),
+    DreamSort.progress: (Dream.progress_ratio, SortOrder.desc),  # Matches ix_dreams_progress_ratio
+}
+
+# Sort keys whose cursor values are datetimes
+DATETIME_SORTS = {DreamSort.created, DreamSort.target_date}
+
+# Columns behind a DreamSummary; the derived fields come from the metrics memo
+SUMMARY_COLUMNS = (
+    Dream.id, Dream.title, Dream.category, Dream.target_amount,
+    Dream.target_date, Dream.current_saved, Dream.status
+)
+SUMMARY_FIELDS = tuple(DreamSummary.model_fields)
 
 @router.get("/", response_model=List[DreamSummary])
 async def list_dreams(
+    request: Request,
     status: Optional[DreamStatus] = Query(None, description="Filter by dream status"),
     category: Optional[DreamCategory] = Query(None, description="Filter by dream category"),
-    limit: int = Query(50, le=100, description="Maximum number of dreams to return"),
-    db: Session = Depends(get_db)
+    max_daily_amount: Optional[float] = Query(None, ge=0, description="Only dreams needing at most this much per day"),
+    min_progress: Optional[float] = Query(None, ge=0, le=100, description="Only dreams at least this far along (percent)"),
+    achievable_only: bool = Query(False, description="Only dreams with a realistic daily amount"),
+    sort: DreamSort = Query(DreamSort.created, description="Sort key"),
+    order: Optional[SortOrder] = Query(None, description="Sort direction (defaults depend on the sort key)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of dreams to return"),
+    format: ListFormat = Query(ListFormat.json, description="json, columnar (one array per field) or msgpack"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
-    Get list of user's dreams with summary information.
+    Get list of the current user's dreams with summary information.
     
     Perfect for dashboard views showing multiple dreams at once.
+    Filters and sorts on derived metrics (daily amount, progress) run
+    as SQL, so only the requested page of rows is ever loaded.
+    
+    Paging is cursor based: when more results exist the response carries an
+    X-Next-Cursor header - pass it back as `cursor` (with the same filters and
+    sort) to get the next page. Every page costs one index seek.
+    
+    Pages are served from the response cache until one of the user's dreams
+    changes, and carry an ETag for If-None-Match revalidation. Only the
+    summary columns are loaded - no ORM objects are built.
     """
-    query = db.query(Dream)
+    cache_key = None
+    if response_cache.enabled:
+        cache_key = await response_cache.list_key(user.id, {
+            "status": status, "category": category, "max_daily_amount": max_daily_amount,
+            "min_progress": min_progress, "achievable_only": achievable_only,
+            "sort": sort, "order": order, "cursor": cursor, "limit": limit, "format": format
+        })
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return cached.to_response(request)
+    
+    sort_column, default_order = SORT_COLUMNS[sort]
+    descending = (order or default_order) == SortOrder.desc
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort.value, is_datetime=sort in DATETIME_SORTS)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    # Select the sort value alongside each row so the next cursor uses exactly
+    # what the database compared, not a re-computed Python value
+    query = select(*SUMMARY_COLUMNS, sort_column.label("sort_value")).where(Dream.user_id == user.id)
     
     # Apply filters
     if status:
         query = query.filter(Dream.status == status)
     if category:
         query = query.filter(Dream.category == category)
+    if max_daily_amount is not None:
+        query = query.filter(Dream.daily_amount <= max_daily_amount)
+    if min_progress is not None:
+        query = query.filter(Dream.progress_percentage >= min_progress)
+    if achievable_only:
+        query = query.filter(Dream.is_achievable)
+    
+    # Sort in the database by (sort key, id) and start after the cursor; one
+    # row past the page tells whether a next page exists
+    result = await db.execute(apply_keyset(query, sort_column, Dream.id, descending, after).limit(limit + 1))
+    rows = result.all()
     
-    # Order by creation date (newest first) and limit results
-    dreams = query.order_by(desc(Dream.created_at)).limit(limit).all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(sort.value, last.sort_value, last.id)
     
-    return dreams
+    try:
+        body, media_type = encode([_summary_row(row) for row in rows], format, SUMMARY_FIELDS)
+    except FormatUnavailable as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    return (await response_cache.put(cache_key, body, headers, media_type)).to_response(request)
 
 @router.get("/{dream_id}", response_model=DreamResponse)
 async def get_dream(
     dream_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get detailed information about a specific dream.
     
     Includes all the motivational calculations that make big goals feel achievable.
+    Served from the response cache when possible; send If-None-Match with the
+    ETag to get a 304 when nothing changed. Concurrent misses for the same
+    dream share a single load.
     """
-    dream = db.query(Dream).filter(Dream.id == dream_id).first()
+    # Taken before the load, so a load that started before a concurrent write neither
+    # stores its body where it will be served nor is shared with requests made after it
+    cache_key = await response_cache.dream_key(user.id, dream_id)
+    if response_cache.enabled:
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return cached.to_response(request)
+    
+    cached = await dream_flights.do(cache_key, lambda: _load_dream_response(user.id, dream_id, cache_key))
+    return cached.to_response(request)
+
+async def _load_dream_response(user_id: int, dream_id: int, cache_key: str) -> CachedResponse:
+    """Load a dream and cache its encoded detail (coalesced, so it opens its own session)"""
+    async with AsyncSessionLocal() as db:
+        dream = await db.scalar(select(Dream).where(Dream.id == dream_id, Dream.user_id == user_id))
     
     if not dream:
         raise HTTPException(status_code=404, detail="Dream not found")
     
-    return _build_dream_response(dream)
+    return await response_cache.put(cache_key, dumps(_build_dream_response(dream)))
 
 @router.put("/{dream_id}", response_model=DreamResponse)
 async def update_dream(
     dream_id: int,
     dream_update: DreamUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
     Update an existing dream.
     
     Users might adjust their target amount, date, or mark progress.
     """
-    dream = db.query(Dream).filter(Dream.id == dream_id).first()
+    dream = await db.scalar(select(Dream).where(Dream.id == dream_id, Dream.user_id == user.id))
     
     if not dream:
         raise HTTPException(status_code=404, detail="Dream not found")
@@ -116,16 +258,22 @@ async def update_dream(
     for field, value in update_data.items():
         setattr(dream, field, value)
     
-    db.commit()
-    db.refresh(dream)
+    # Savings or target changes feed the progress chart
+    if "current_saved" in update_data or "target_amount" in update_data:
+        await record_snapshots(db, [(dream.id, dream.current_saved, dream.target_amount)])
+    
+    await db.commit()
+    await db.refresh(dream)
+    await response_cache.invalidate_dream(user.id, dream_id)
     
-    return _build_dream_response(dream)
+    return _json_response(_build_dream_response(dream))
 
 @router.delete("/{dream_id}")
 async def delete_dream(
     dream_id: int,
     hard_delete: bool = Query(False, description="Permanently delete vs soft delete"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
     Delete a dream (soft delete by default).
@@ -133,22 +281,190 @@ async def delete_dream(
     Soft delete preserves data for analytics while hiding from user.
     Hard delete permanently removes the record.
     """
-    dream = db.query(Dream).filter(Dream.id == dream_id).first()
+    dream = await db.scalar(select(Dream).where(Dream.id == dream_id, Dream.user_id == user.id))
     
     if not dream:
         raise HTTPException(status_code=404, detail="Dream not found")
     
     if hard_delete:
         # Permanent deletion
-        db.delete(dream)
-        db.commit()
+        await db.delete(dream)
+        await db.commit()
+        await response_cache.invalidate_dream(user.id, dream_id)
         return {"message": "Dream permanently deleted"}
     else:
         # Soft delete - just change status
         dream.status = DreamStatus.archived
-        db.commit()
+        await db.commit()
+        await response_cache.invalidate_dream(user.id, dream_id)
         return {"message": "Dream archived"}
 
+@router.get("/{dream_id}/progress", response_model=DreamProgressResponse)
+async def get_dream_progress(
+    dream_id: int,
+    resolution: SnapshotResolution = Query(SnapshotResolution.day, description="One point per day, week or month"),
+    start: Optional[date] = Query(None, description="First period to include"),
+    end: Optional[date] = Query(None, description="Last period to include"),
+    limit: int = Query(366, ge=1, le=1000, description="Maximum number of points (the most recent are kept)"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Get a dream's savings progress over time for charting.
+    
+    Points are rolled up as savings change, so this is a single primary-key
+    range read at any resolution - no history is replayed.
+    """
+    owned = await db.scalar(select(Dream.id).where(Dream.id == dream_id, Dream.user_id == user.id))
+    
+    if not owned:
+        raise HTTPException(status_code=404, detail="Dream not found")
+    
+    query = select(DreamSnapshot).where(
+        DreamSnapshot.dream_id == dream_id,
+        DreamSnapshot.resolution == resolution
+    )
+    if start is not None:
+        query = query.where(DreamSnapshot.period_start >= start)
+    if end is not None:
+        query = query.where(DreamSnapshot.period_start <= end)
+    
+    # Newest `limit` periods, returned oldest first
+    snapshots = (await db.scalars(query.order_by(DreamSnapshot.period_start.desc()).limit(limit))).all()
+    points = [
+        ProgressPoint(
+            period_start=snapshot.period_start,
+            saved=round(snapshot.closing_saved, 2),
+            low=round(snapshot.low_saved, 2),
+            high=round(snapshot.high_saved, 2),
+            target_amount=snapshot.target_amount,
+            progress_percentage=round(
+                min(100.0, snapshot.closing_saved / snapshot.target_amount * 100), 1
+            ) if snapshot.target_amount > 0 else 0.0
+        )
+        for snapshot in reversed(snapshots)
+    ]
+    
+    return DreamProgressResponse(dream_id=dream_id, resolution=resolution, points=points)
+
+@router.put("/{dream_id}/progress/{day}", response_model=ProgressCheckInResponse)
+async def check_in_progress(
+    dream_id: int,
+    day: date,
+    check_in: ProgressCheckIn,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Record what was put towards a dream on a day.
+
+    Checking in again for the same day replaces its amount; current_saved
+    moves by the difference, so retries don't double count. Returns the
+    dream's progress summary after the check-in.
+    """
+    today = date.today()
+    if day > today:
+        raise HTTPException(status_code=400, detail="Can't check in for a future day")
+
+    owned = await db.scalar(select(Dream.id).where(Dream.id == dream_id, Dream.user_id == user.id))
+
+    if not owned:
+        raise HTTPException(status_code=404, detail="Dream not found")
+
+    recorded = await record_progress(db, user.id, dream_id, day, check_in.amount)
+    await record_snapshots(db, [(dream_id, recorded.current_saved, recorded.target_amount)])
+    summary = progress_summary(
+        recorded.state, dream_id, recorded.target_amount, recorded.current_saved, recorded.target_date, today
+    )
+    await db.commit()
+    await response_cache.invalidate_dream(user.id, dream_id)
+
+    return ProgressCheckInResponse(
+        **summary, event_date=day, amount=check_in.amount, previous_amount=recorded.previous_amount
+    )
+
+@router.get("/{dream_id}/progress/summary", response_model=ProgressSummary)
+async def get_progress_summary(
+    dream_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Get a dream's check-in streak, savings pace and projected completion.
+
+    Everything is read from the incrementally maintained progress state -
+    one row - so the cost doesn't grow with the number of check-ins.
+    """
+    row = (await db.execute(
+        select(Dream.target_amount, Dream.current_saved, Dream.target_date, DreamProgress)
+        .outerjoin(DreamProgress, DreamProgress.dream_id == Dream.id)
+        .where(Dream.id == dream_id, Dream.user_id == user.id)
+    )).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Dream not found")
+
+    target_amount, current_saved, target_date, state = row
+    return ProgressSummary(**progress_summary(state, dream_id, target_amount, current_saved, target_date))
+
+@router.post("/{dream_id}/simulate", response_model=SimulationResponse)
+async def simulate_dream(
+    dream_id: int,
+    simulation: Optional[SimulationRequest] = None,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Run a Monte Carlo simulation of reaching a dream by its target date.
+    
+    Instead of a single "you need $X/day" answer, this shows how likely the
+    plan is to work once market swings and life surprises are thrown in.
+    Pass the returned seed back in to reproduce a result exactly. Identical
+    requests arriving while one is running share its result (and seed).
+    """
+    simulation = simulation or SimulationRequest()
+    # The dream's cache key carries its owner's generation, so a run that loaded the
+    # dream before an update isn't shared with requests made after it
+    key = fingerprint(await response_cache.dream_key(user.id, dream_id), simulation.dict())
+    return await simulation_flights.do(key, lambda: _simulate(user.id, dream_id, simulation))
+
+async def _simulate(user_id: int, dream_id: int, simulation: SimulationRequest) -> SimulationResponse:
+    """Load a dream and simulate it (coalesced, so it opens its own session)"""
+    # Everything needed is loaded up front - the connection goes back before the simulation runs
+    async with AsyncSessionLocal() as db:
+        dream = await db.scalar(select(Dream).where(Dream.id == dream_id, Dream.user_id == user_id))
+    
+    if not dream:
+        raise HTTPException(status_code=404, detail="Dream not found")
+    
+    days_remaining = dream.days_remaining
+    if days_remaining <= 0:
+        raise HTTPException(status_code=400, detail="Target date must be in the future")
+    
+    monthly_contribution = simulation.monthly_contribution
+    if monthly_contribution is None:
+        monthly_contribution = dream.monthly_amount
+    
+    # Runs on the compute pool so big simulations don't block other requests
+    result = await offload(
+        run_dream_simulation,
+        target_amount=dream.target_amount,
+        current_saved=dream.current_saved or 0.0,
+        months=math.ceil(days_remaining / 30),  # 30-day months, matching monthly_amount
+        monthly_contribution=monthly_contribution,
+        scenarios=simulation.scenarios,
+        seed=simulation.seed,
+        expected_annual_return=simulation.expected_annual_return,
+        annual_volatility=simulation.annual_volatility,
+        include_life_events=simulation.include_life_events
+    )
+    
+    return SimulationResponse(
+        dream_id=dream.id,
+        target_amount=dream.target_amount,
+        current_saved=dream.current_saved or 0.0,
+        **result
+    )
+
 @router.post("/calculate", response_model=CalculationResponse)
 async def calculate_dream_amounts(calculation: CalculationRequest):
     """
@@ -171,23 +487,25 @@ async def calculate_dream_amounts(calculation: CalculationRequest):
     if days_remaining <= 0:
         raise HTTPException(status_code=400, detail="Target date must be in the future")
     
-    # Calculate amounts needed
+    # Calculate amounts needed (compound interest on savings included)
     amount_remaining = calculation.target_amount - calculation.current_saved
-    daily_amount = amount_remaining / days_remaining if days_remaining > 0 else 0
-    weekly_amount = daily_amount * 7
-    monthly_amount = daily_amount * 30
+    daily_amount, weekly_amount, monthly_amount = (
+        required_contribution(
+            calculation.target_amount,
+            calculation.current_saved,
+            days_remaining,
+            frequency,
+            calculation.annual_rate
+        )
+        for frequency in ("daily", "weekly", "monthly")
+    )
     
     # Generate relatable comparisons
-    coffee_price = 5.50
-    lunch_price = 12.00
-    streaming_price = 12.99
-    movie_price = 15.00
-    
     comparisons = {
-        "coffees_per_day": round(daily_amount / coffee_price, 1),
-        "lunches_per_week": round(weekly_amount / lunch_price, 1),
-        "streaming_services": round(monthly_amount / streaming_price, 1),
-        "movie_tickets": round(daily_amount / movie_price, 1)
+        "coffees_per_day": round(daily_amount / COFFEE_PRICE, 1),
+        "lunches_per_week": round(weekly_amount / LUNCH_PRICE, 1),
+        "streaming_services": round(monthly_amount / STREAMING_PRICE, 1),
+        "movie_tickets": round(daily_amount / MOVIE_PRICE, 1)
     }
     
     # Create motivational message
@@ -213,36 +531,105 @@ async def calculate_dream_amounts(calculation: CalculationRequest):
         monthly_amount=round(monthly_amount, 2),
         comparisons=comparisons,
         motivation=motivation,
-        is_achievable=daily_amount <= 100
+        is_achievable=daily_amount <= ACHIEVABLE_DAILY_LIMIT
     )
 
-def _build_dream_response(dream: Dream) -> DreamResponse:
+@router.post("/calculate/batch")
+async def calculate_dream_amounts_batch(
+    batch: BatchCalculationRequest,
+    format: ListFormat = Query(ListFormat.columnar, description="columnar (streamed), msgpack (same columns) or json (one object per goal)")
+):
+    """
+    Calculate daily/weekly/monthly amounts for many goals in one request.
+    
+    Powers the comparison and what-if screens that would otherwise fire
+    dozens of /calculate calls. Input and output are columnar - one list per
+    field, aligned by position - and the response is streamed column by column.
+    Rows whose target date isn't in the future come back with valid=false.
+    """
+    with telemetry.calc_timer():
+        columns = calculate_batch(
+            batch.target_amount,
+            [target_date.date() for target_date in batch.target_date],
+            batch.current_saved,
+            annual_rate=batch.annual_rate
+        )
+    
+    count = len(batch.target_amount)
+    if format == ListFormat.columnar:
+        return StreamingResponse(_stream_columns(count, columns), media_type="application/json")
+    
+    lists = {name: values.tolist() for name, values in columns.items()}
+    if format == ListFormat.msgpack:
+        content = {"count": count, "columns": lists}
+    else:
+        content = [dict(zip(lists, values)) for values in zip(*lists.values())]
+    try:
+        body, media_type = encode(content, format)
+    except FormatUnavailable as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    return Response(content=body, media_type=media_type)
+
+def _build_dream_response(dream: Dream) -> dict:
     """
-    Helper function to build a complete DreamResponse with calculated fields.
+    Helper function to build a complete dream response with calculated fields.
     
     This is where we add all the magic that makes big dreams feel achievable.
+    Returns a plain dict in DreamResponse's shape: every value comes from the
+    database or the metrics memo, so it's encoded directly instead of being
+    validated into a model and then validated again by FastAPI.
     """
-    return DreamResponse(
-        id=dream.id,
-        user_id=dream.user_id,
-        title=dream.title,
-        description=dream.description,
-        category=dream.category,
-        target_amount=dream.target_amount,
-        target_date=dream.target_date,
-        current_saved=dream.current_saved,
-        image_url=dream.image_url,
-        status=dream.status,
-        created_at=dream.created_at,
-        updated_at=dream.updated_at,
+    metrics = dream.metrics  # One memoized pass for every derived field
+    return {
+        "title": dream.title,
+        "description": dream.description,
+        "category": dream.category,
+        "target_amount": float(dream.target_amount),
+        "target_date": dream.target_date,
+        "image_url": dream.image_url,
+        "id": dream.id,
+        "user_id": dream.user_id,
+        "current_saved": float(dream.current_saved or 0.0),
+        "status": dream.status,
+        "created_at": dream.created_at,
+        "updated_at": dream.updated_at,
         
         # Calculated fields - the magic that makes dreams achievable
-        days_remaining=dream.days_remaining,
-        amount_remaining=dream.amount_remaining,
-        daily_amount=dream.daily_amount,
-        weekly_amount=dream.weekly_amount,
-        monthly_amount=dream.monthly_amount,
-        progress_percentage=dream.progress_percentage,
-        is_achievable=dream.is_achievable,
-        comparisons=dream.get_comparisons()
-    )
+        "days_remaining": metrics.days_remaining,
+        "amount_remaining": float(metrics.amount_remaining),
+        "daily_amount": metrics.daily_amount,
+        "weekly_amount": metrics.weekly_amount,
+        "monthly_amount": metrics.monthly_amount,
+        "progress_percentage": float(metrics.progress_percentage),
+        "is_achievable": metrics.is_achievable,
+        "comparisons": metrics.comparisons()
+    }
+
+def _summary_row(row) -> dict:
+    """DreamSummary-shaped dict from a SUMMARY_COLUMNS row"""
+    # Positional unpacking - much cheaper than attribute access on a Row
+    dream_id, title, category, target_amount, target_date, current_saved, status = row[:7]
+    metrics = dream_metrics.lookup(dream_id, target_amount, current_saved, target_date)
+    return {
+        "id": dream_id,
+        "title": title,
+        "category": category.value,
+        "target_amount": float(target_amount),
+        "target_date": target_date.isoformat(),
+        "daily_amount": metrics.daily_amount,
+        "progress_percentage": float(metrics.progress_percentage),
+        "status": status.value
+    }
+
+def _json_response(content, status_code: int = 200) -> Response:
+    """Encode an already-shaped payload without a response_model pass"""
+    return Response(content=dumps(content), status_code=status_code, media_type="application/json")
+
+def _stream_columns(count: int, columns: dict):
+    """Yield a columnar JSON document one column at a time"""
+    yield f'{{"count": {count}, "columns": {{'
+    for index, (name, values) in enumerate(columns.items()):
+        separator = ", " if index else ""
+        # Strict JSON: a non-finite value is a bug, not something to send as a bare Infinity
+        yield f'{separator}"{name}": {json.dumps(values.tolist(), allow_nan=False)}'
+    yield "}}"
@@ -0,0 +1,268 @@
+"""
+Bulk dream import/export endpoints
+
+Onboarding a partner's users means moving dreams by the million, not one
+create_dream call at a time. Imports are read as a stream, validated in
+batches and written with bulk inserts, one transaction per chunk. Exports
+stream rows from a server-side cursor. Memory stays flat either way,
+whatever the row count.
+"""
+
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.cache import response_cache
+from app.models.database import AsyncSessionLocal
+from app.models.dream import Dream
+from app.schemas.dream import DreamImport, ImportRowError, ImportSummary, TransferFormat
+from app.services.snapshots import record_snapshots
+
+router = APIRouter()
+
+# Rows validated and inserted per transaction
+IMPORT_BATCH_SIZE = 1000
+
+# Rows fetched per round-trip while exporting
+EXPORT_BATCH_SIZE = 1000
+
+# Failed rows reported back in detail (the count is always exact)
+MAX_REPORTED_ERRORS = 100
+
+EXPORT_COLUMNS = (
+    "id", "title", "description", "category", "target_amount", "current_saved",
+    "target_date", "image_url", "status", "created_at", "updated_at",
+)
+
+_batch_adapter = TypeAdapter(List[DreamImport])
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """
+    Decode the request body into lines without buffering the whole upload.
+
+    The decoder is incremental, so a multibyte character split across two
+    chunks is carried over rather than failing; bytes that aren't UTF-8 at
+    all raise UnicodeDecodeError. A leading byte order mark (Excel writes
+    one into UTF-8 CSVs) is dropped, so it doesn't end up in the first
+    header name.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)  # Raises on a truncated character at the end
+    if pending:
+        yield pending.rstrip("\r")
+
+async def _ndjson_rows(request: Request) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (line number, row, parse error) for each non-blank NDJSON line"""
+    line_number = 0
+    async for line in _lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, row, None
+
+async def _csv_rows(request: Request) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (line number, row, parse error) for each CSV record after the header.
+
+    Physical lines are grouped until their quotes balance, so quoted fields
+    containing newlines survive chunk boundaries. Empty cells are left out
+    so the field's default applies.
+    """
+    header = None
+    record_lines: List[str] = []
+    record_start = 0
+    line_number = 0
+
+    async for line in _lines(request):
+        line_number += 1
+        if not record_lines:
+            record_start = line_number
+        record_lines.append(line)
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue  # Inside a quoted field that continues on the next line
+
+        text = "\n".join(record_lines)
+        record_lines = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_start, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield record_start, {name: value for name, value in zip(header, values) if value != ""}, None
+
+    if record_lines:
+        yield record_start, None, "Unterminated quoted field"
+
+def _validate_batch(batch: List[Tuple[int, dict]]) -> Tuple[List[DreamImport], List[ImportRowError]]:
+    """
+    Validate a batch of rows against DreamImport.
+
+    The whole batch is validated in one call; only when it contains bad rows
+    do we fall back to row-by-row validation to separate good from bad.
+    """
+    try:
+        return _batch_adapter.validate_python([row for _, row in batch]), []
+    except ValidationError:
+        pass
+
+    valid, errors = [], []
+    for line_number, row in batch:
+        try:
+            valid.append(DreamImport.model_validate(row))
+        except ValidationError as e:
+            first = e.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            errors.append(ImportRowError(line=line_number, error=f"{field}: {first['msg']}" if field else first["msg"]))
+    return valid, errors
+
+@router.post("/import", response_model=ImportSummary)
+async def import_dreams(
+    request: Request,
+    format: Optional[TransferFormat] = Query(None, description="ndjson or csv (default: from Content-Type)"),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Bulk import dreams from an NDJSON or CSV upload.
+    
+    Send the file as the raw request body. Rows are validated in batches of
+    1,000 and each valid batch is committed with a single bulk insert, so a
+    bad row only skips itself - its line number and error are reported back.
+    All dreams are created for the current user.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = TransferFormat.csv if "csv" in content_type else TransferFormat.ndjson
+    rows = _csv_rows(request) if format == TransferFormat.csv else _ndjson_rows(request)
+
+    imported = 0
+    failed = 0
+    errors: List[ImportRowError] = []
+    batch: List[Tuple[int, dict]] = []
+
+    async with AsyncSessionLocal() as db:
+        async def flush():
+            nonlocal imported, failed
+            valid, batch_errors = _validate_batch(batch)
+            batch.clear()
+            failed += len(batch_errors)
+            errors.extend(batch_errors[:MAX_REPORTED_ERRORS - len(errors)])
+            if valid:
+                created = await db.execute(
+                    insert(Dream).returning(Dream.id, Dream.current_saved, Dream.target_amount),
+                    [{**dream.dict(), "user_id": user.id} for dream in valid]
+                )
+                # Imported progress becomes each dream's first chart point
+                await record_snapshots(db, created.all())
+                await db.commit()
+                imported += len(valid)
+
+        try:
+            async for line_number, row, parse_error in rows:
+                if parse_error:
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(ImportRowError(line=line_number, error=parse_error))
+                    continue
+                batch.append((line_number, row))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await flush()
+        except UnicodeDecodeError as e:
+            # Earlier batches are committed - say so, and drop the partial one
+            if imported:
+                await response_cache.invalidate_dream(user.id)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Request body is not valid UTF-8 ({e.reason}); "
+                       f"{imported} dreams from earlier lines were already imported"
+            )
+        if batch:
+            await flush()
+
+    if imported:
+        await response_cache.invalidate_dream(user.id)
+
+    errors.sort(key=lambda error: error.line)
+    return ImportSummary(imported=imported, failed=failed, errors=errors)
+
+def _export_value(value):
+    """Plain JSON/CSV value for a column (enums by value, datetimes as ISO)"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+async def _export_rows(user_id: int, format: TransferFormat) -> AsyncIterator[str]:
+    """Stream a user's dreams from a server-side cursor, one batch at a time"""
+    columns = [getattr(Dream, name) for name in EXPORT_COLUMNS]
+    statement = (
+        select(*columns)
+        .where(Dream.user_id == user_id)
+        .order_by(Dream.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if format == TransferFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+    # Own session: the stream outlives the request's dependencies
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement)
+        async for partition in result.partitions():
+            if format == TransferFormat.csv:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([_export_value(value) for value in row] for row in partition)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, map(_export_value, row)))) + "\n"
+                    for row in partition
+                )
+
+@router.get("/export")
+async def export_dreams(
+    format: TransferFormat = Query(TransferFormat.ndjson, description="ndjson or csv"),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Export all of the current user's dreams as NDJSON or CSV.
+    
+    The response is streamed straight from a database cursor, so exporting
+    a million dreams uses the same memory as exporting ten.
+    """
+    media_type = "text/csv" if format == TransferFormat.csv else "application/x-ndjson"
+    return StreamingResponse(
+        _export_rows(user.id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="dreams.{format.value}"'}
+    )
@@ -0,0 +1,33 @@
+"""
+Nudge API endpoints
+
+Nudges are written by the daily sweep (app.services.sweeps), so reading
+them is a single index lookup on (user, day).
+"""
+
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import CurrentUser, get_current_user
+from app.models.database import get_async_db
+from app.models.nudge import DreamNudge
+from app.schemas.nudge import NudgeResponse
+
+router = APIRouter()
+
+@router.get("/", response_model=List[NudgeResponse])
+async def list_nudges(
+    day: Optional[date] = Query(None, description="Day to show (defaults to today)"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Get the current user's nudges for a day"""
+    nudges = await db.scalars(
+        select(DreamNudge)
+        .where(DreamNudge.user_id == user.id, DreamNudge.nudge_date == (day or date.today()))
+        .order_by(DreamNudge.dream_id, DreamNudge.id)
+    )
+    return nudges.all()
@@ -0,0 +1,180 @@
+"""
+Projection API endpoints - someday life Monte Carlo projections
+
+The dashboard asks for the same projection on every load; results are
+cached by a hash of the inputs so an unchanged reload skips the simulation.
+Stored projections keep their per-year state so what-if edits only
+recompute the years after the change.
+"""
+
+import time
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.coalesce import singleflight
+from app.core.compute import offload
+from app.schemas.projection import (
+    ProjectionRequest,
+    ProjectionResponse,
+    ProjectionUpdate,
+    StoredProjectionResponse
+)
+from app.services.projection import (
+    projection_cache,
+    projection_key,
+    resolve_options,
+    run_someday_projection,
+    simulate_projection
+)
+from app.services.projection_store import ProjectionNotFound, ProjectionState, projection_store
+
+router = APIRouter()
+
+# Identical concurrent projections share one simulation (see app.core.coalesce)
+projection_flights = singleflight("someday_projection")
+
+@router.post("/someday", response_model=ProjectionResponse)
+async def project_someday(
+    request: ProjectionRequest,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Project the chance of reaching the someday life.
+
+    Returns the success rate, pessimistic/realistic/optimistic paths and
+    percentile bands over time, downsampled for charting. Projections only
+    depend on the request body, so identical requests share a cached result -
+    and identical requests arriving while it's computed share that run.
+    """
+    profile = request.profile.dict()
+    goals = request.goals.dict()
+    options = request.options.dict()
+
+    key = projection_key(profile, goals, options)
+    result = projection_cache.get(key)
+    if result is not None:
+        return ProjectionResponse(**result, cached=True)
+
+    result = await projection_flights.do(key, lambda: _project(key, profile, goals, options))
+    return ProjectionResponse(**result)
+
+async def _project(key: str, profile: dict, goals: dict, options: dict) -> dict:
+    """Run a someday projection and cache it"""
+    # Runs on the compute pool so big projections don't block other requests
+    result = await offload(
+        run_someday_projection,
+        profile,
+        goals,
+        simulations=options["simulations"],
+        years=options["years_to_project"],
+        include_life_events=options["include_life_events"],
+        seed=options["seed"],
+        max_points=options["max_points"]
+    )
+    projection_cache.put(key, result)
+    return result
+
+def _get_stored(projection_id: str, user: CurrentUser) -> ProjectionState:
+    try:
+        return projection_store.get(projection_id, user.id)
+    except ProjectionNotFound:
+        raise HTTPException(status_code=404, detail="Projection not found")
+
+@router.post("/sessions", response_model=StoredProjectionResponse, status_code=201)
+async def create_stored_projection(
+    request: ProjectionRequest,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Run a projection and keep it for what-if updates.
+
+    Use the returned projection_id with PATCH to change one input at a time.
+    """
+    profile = request.profile.dict()
+    goals = request.goals.dict()
+    options = request.options.dict()
+    simulations, years, seed = resolve_options(
+        profile,
+        goals,
+        options["simulations"],
+        options["years_to_project"],
+        options["include_life_events"],
+        options["seed"]
+    )
+
+    draws, paths = await offload(
+        simulate_projection,
+        profile["current_assets"],
+        profile["monthly_income"],
+        profile["monthly_expenses"],
+        years,
+        simulations,
+        seed,
+        profile["asset_allocation"],
+        options["include_life_events"]
+    )
+    state = ProjectionState(user.id, profile, goals, options, seed, draws, paths)
+    projection_id = projection_store.add(state)
+
+    return StoredProjectionResponse(**state.summary(), projection_id=projection_id, version=state.version)
+
+@router.get("/sessions/{projection_id}", response_model=StoredProjectionResponse)
+async def get_stored_projection(
+    projection_id: str,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Get a stored projection's current result"""
+    state = _get_stored(projection_id, user)
+    return StoredProjectionResponse(**state.summary(), projection_id=projection_id, version=state.version)
+
+@router.patch("/sessions/{projection_id}", response_model=StoredProjectionResponse)
+async def update_stored_projection(
+    projection_id: str,
+    update: ProjectionUpdate,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Apply what-if changes to a stored projection.
+
+    Only the years from the earliest change on are recomputed - a new
+    return for year 20 leaves years 1-19 untouched. Runs inline: an update
+    takes a few milliseconds, less than a round-trip to the compute pool.
+    """
+    state = _get_stored(projection_id, user)
+
+    started = time.perf_counter()
+    try:
+        # All or nothing: a change out of range leaves the projection untouched
+        state.apply_changes(
+            actual_return=(update.actual_return.year, update.actual_return.rate) if update.actual_return else None,
+            inflation=(update.inflation.rate, update.inflation.from_year) if update.inflation else None,
+            life_event=(update.life_event.event.value, update.life_event.month) if update.life_event else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if update.total_required is not None:
+        state.set_total_required(update.total_required)
+
+    recomputed_from_year = state.refresh()
+    result = state.summary()
+    compute_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    return StoredProjectionResponse(
+        **result,
+        projection_id=projection_id,
+        version=state.version,
+        recomputed_from_year=recomputed_from_year,
+        compute_ms=compute_ms
+    )
+
+@router.delete("/sessions/{projection_id}")
+async def delete_stored_projection(
+    projection_id: str,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Drop a stored projection"""
+    try:
+        projection_store.delete(projection_id, user.id)
+    except ProjectionNotFound:
+        raise HTTPException(status_code=404, detail="Projection not found")
+    return {"message": "Projection deleted"}
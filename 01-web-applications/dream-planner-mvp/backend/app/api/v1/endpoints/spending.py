@@ -0,0 +1,79 @@
+"""
+Spending intelligence API endpoints
+
+Purchases are folded into running per-category monthly aggregates as they
+are posted, so predictions and anomaly checks cost the same whether the
+user has a month of history or ten years.
+"""
+
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import CurrentUser, get_current_user
+from app.models.database import get_async_db
+from app.schemas.spending import (
+    SpendingIngest,
+    IngestSummary,
+    SpendingPredictions,
+    SpendingAnomalies,
+    Sensitivity
+)
+from app.services.spending import check_category, ingest_spending, load_profile, month_start, predict_category
+
+router = APIRouter()
+
+@router.post("/transactions", response_model=IngestSummary)
+async def ingest_transactions(
+    batch: SpendingIngest,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Record purchases - each touched category-month is one upsert"""
+    summary = await ingest_spending(
+        db, user.id, ((t.category, t.amount, t.date) for t in batch.transactions)
+    )
+    await db.commit()
+    return summary
+
+@router.get("/predictions", response_model=SpendingPredictions)
+async def get_predictions(
+    today: Optional[date] = Query(None, description="Reference day (defaults to today)"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Predict this month's spending per category.
+    
+    Rolling three-month average adjusted by a seasonal factor, with trend
+    and confidence - read from at most a year of monthly aggregates.
+    """
+    today = today or date.today()
+    profile = await load_profile(db, user.id, today)
+    predictions = [predict_category(category, data, today) for category, data in sorted(profile.items())]
+    predictions = [prediction for prediction in predictions if prediction["predicted_amount"] > 0]
+
+    total = sum(prediction["predicted_amount"] for prediction in predictions)
+    if profile:
+        summary = f"Based on your spending patterns, you typically spend ${round(total)} monthly across {len(profile)} categories."
+    else:
+        summary = "No spending data available for analysis"
+
+    return SpendingPredictions(month=month_start(today), predictions=predictions, total_predicted=total, summary=summary)
+
+@router.get("/anomalies", response_model=SpendingAnomalies)
+async def get_anomalies(
+    sensitivity: Sensitivity = Query(Sensitivity.medium),
+    include_normal: bool = Query(False, description="Also list categories within their normal range"),
+    today: Optional[date] = Query(None, description="Reference day (defaults to today)"),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Flag categories whose spending this month is unusually high or low"""
+    today = today or date.today()
+    profile = await load_profile(db, user.id, today)
+    checks = [check_category(category, data, today, sensitivity.value) for category, data in sorted(profile.items())]
+    if not include_normal:
+        checks = [check for check in checks if check["is_anomaly"]]
+    return SpendingAnomalies(month=month_start(today), sensitivity=sensitivity, anomalies=checks)
@@ -0,0 +1,155 @@
+"""
+Tax API endpoints
+
+Rates come from bracket schedules compiled once at import
+(app.services.tax), so pricing a thousand incomes is one vectorized call,
+and the vehicle comparison scores every dream against every savings
+vehicle in a single pass instead of a request per pair.
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.telemetry import telemetry
+from app.models.database import get_async_db
+from app.models.dream import Dream, DreamStatus
+from app.schemas.tax import (
+    MAX_RATE_INCOMES,
+    TaxRatesResponse,
+    VehicleComparisonRequest,
+    VehicleComparisonResponse
+)
+from app.services.metrics import dream_metrics
+from app.services.tax import (
+    STANDARD_DEDUCTIONS_2024,
+    FilingStatus,
+    TaxProfile,
+    after_tax_needs,
+    resolve_state,
+    retirement_rates,
+    tax_rates
+)
+
+router = APIRouter()
+
+@router.get("/rates", response_model=TaxRatesResponse)
+async def get_tax_rates(
+    income: List[float] = Query(..., description="Annual gross incomes (repeat the parameter for several)"),
+    state: str = Query("California", description="State of residence (full name)"),
+    filing_status: FilingStatus = Query(FilingStatus.single),
+    deductions: Optional[float] = Query(None, ge=0, description="Total deductions (defaults to the standard deduction)")
+):
+    """Federal and state tax, effective and marginal rates for each income"""
+    canonical = resolve_state(state)
+    if canonical is None:
+        raise HTTPException(status_code=400, detail=f"Unknown state: {state}")
+    if len(income) > MAX_RATE_INCOMES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_RATE_INCOMES} incomes per request")
+    if any(value < 0 for value in income):
+        raise HTTPException(status_code=400, detail="Incomes can't be negative")
+
+    with telemetry.calc_timer():
+        rates = tax_rates(income, canonical, filing_status, deductions)
+    columns = [column.tolist() for column in rates]
+    return TaxRatesResponse(
+        state=canonical,
+        filing_status=filing_status,
+        deductions=deductions if deductions is not None else STANDARD_DEDUCTIONS_2024[filing_status],
+        rates=[
+            {
+                "gross_income": gross,
+                "taxable_income": round(taxable, 2),
+                "federal_tax": round(federal, 2),
+                "state_tax": round(state_tax, 2),
+                "total_tax": round(total, 2),
+                "effective_rate": round(effective, 4),
+                "marginal_rate": round(marginal, 4)
+            }
+            for gross, taxable, federal, state_tax, total, effective, marginal in zip(income, *columns)
+        ]
+    )
+
+@router.post("/vehicles", response_model=VehicleComparisonResponse)
+async def compare_vehicles(
+    request: VehicleComparisonRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Compare savings vehicles for every dream at once.
+
+    For each active dream still needing money and each vehicle: the pre-tax
+    income to set aside per month, what goes into the account, the taxes
+    paid on the way in and out, and whether the annual limit allows it.
+    """
+    query = select(
+        Dream.id, Dream.title, Dream.target_amount, Dream.current_saved, Dream.target_date
+    ).where(Dream.user_id == user.id, Dream.status == DreamStatus.active)
+    if request.dream_ids:
+        query = query.where(Dream.id.in_(request.dream_ids))
+    rows = (await db.execute(query.order_by(Dream.id))).all()
+
+    dreams = []
+    for dream_id, title, target_amount, current_saved, target_date in rows:
+        metrics = dream_metrics.lookup(dream_id, target_amount, current_saved, target_date)
+        if metrics.days_remaining > 0 and metrics.amount_remaining > 0:
+            dreams.append((dream_id, title, metrics.amount_remaining, metrics.days_remaining / 365))
+
+    profile = TaxProfile(request.gross_income, request.state, request.filing_status, request.age, request.deductions)
+    with telemetry.calc_timer():
+        current = tax_rates(profile.gross_income, profile.state, profile.filing_status, profile.deductions)
+        retirement = retirement_rates(profile)
+        needs = after_tax_needs(
+            [amount for _, _, amount, _ in dreams],
+            [years for _, _, _, years in dreams],
+            profile,
+            request.vehicles,
+            request.annual_return
+        )
+
+    vehicles = needs.vehicles
+    comparisons = []
+    for (dream_id, title, amount, years), retirement_goal, rate, gross, best, incomes, contributions, taxes, fits in zip(
+        dreams,
+        needs.is_retirement_goal.tolist(),
+        needs.applicable_rate.tolist(),
+        needs.gross_needed.tolist(),
+        needs.best_vehicle.tolist(),
+        needs.monthly_income.tolist(),
+        needs.monthly_contribution.tolist(),
+        needs.taxes_paid.tolist(),
+        needs.within_limit.tolist()
+    ):
+        comparisons.append({
+            "dream_id": dream_id,
+            "title": title,
+            "amount_needed": round(amount, 2),
+            "years": round(years, 2),
+            "is_retirement_goal": retirement_goal,
+            "applicable_rate": round(rate, 4),
+            "gross_needed": round(gross, 2),
+            "best_vehicle": vehicles[best] if best >= 0 else None,
+            "options": [
+                {
+                    "vehicle": vehicle,
+                    "monthly_income": round(income, 2),
+                    "monthly_contribution": round(contribution, 2),
+                    "taxes_paid": round(tax, 2),
+                    "within_limit": fit
+                }
+                for vehicle, income, contribution, tax, fit in zip(vehicles, incomes, contributions, taxes, fits)
+            ]
+        })
+
+    return VehicleComparisonResponse(
+        state=profile.state,
+        filing_status=profile.filing_status,
+        effective_rate=round(float(current.effective_rate), 4),
+        marginal_rate=round(float(current.marginal_rate), 4),
+        retirement_effective_rate=round(float(retirement.effective_rate), 4),
+        dreams_skipped=len(rows) - len(dreams),
+        dreams=comparisons
+    )
@@ -0,0 +1 @@
+# Core infrastructure for Dream Planner
@@ -0,0 +1,78 @@
+"""
+Authenticated user context for Dream Planner
+
+Every dream belongs to a user, and every query is scoped to the caller.
+Clients send `Authorization: Bearer <token>` where the token is the user id
+and an expiry time signed with the server's AUTH_SECRET (see issue_token).
+Without a token the request runs as the default user unless AUTH_REQUIRED
+is on - and then the server won't start with the development secret.
+"""
+
+import base64
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.core.config import DEV_AUTH_SECRET, settings
+
+class CurrentUser:
+    """The user a request is acting for"""
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+    def __repr__(self):
+        return f"<CurrentUser(id={self.id})>"
+
+def _signature(payload: str) -> str:
+    digest = hmac.new(settings.auth_secret.encode(), payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+def check_auth_settings():
+    """Refuse to run with required auth but a secret anyone can sign tokens with"""
+    if settings.auth_required and settings.auth_secret in ("", DEV_AUTH_SECRET):
+        raise RuntimeError("AUTH_REQUIRED is on but AUTH_SECRET is empty or the development default - set a real secret")
+
+def issue_token(user_id: int, ttl: Optional[int] = None) -> str:
+    """Create a bearer token for a user, valid for ttl seconds (AUTH_TOKEN_TTL by default)"""
+    expires = int(time.time()) + (settings.auth_token_ttl if ttl is None else ttl)
+    payload = f"{user_id}.{expires}"
+    return f"{payload}.{_signature(payload)}"
+
+def verify_token(token: str) -> Optional[int]:
+    """Return the user id for a valid token, or None if it was tampered with or expired"""
+    payload, _, signature = token.rpartition(".")
+    user_id, _, expires = payload.partition(".")
+    if not (user_id.isdigit() and expires.isdigit()):
+        return None
+    if not hmac.compare_digest(signature, _signature(payload)) or int(expires) <= time.time():
+        return None
+    return int(user_id)
+
+async def get_current_user(authorization: Optional[str] = Header(None)) -> CurrentUser:
+    """
+    Current user dependency for FastAPI endpoints.
+    
+    Use alongside get_db: `user: CurrentUser = Depends(get_current_user)`.
+    """
+    if not authorization:
+        if settings.auth_required:
+            raise HTTPException(
+                status_code=401,
+                detail="Authentication required",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        return CurrentUser(settings.default_user_id)
+
+    scheme, _, token = authorization.partition(" ")
+    user_id = verify_token(token.strip()) if scheme.lower() == "bearer" else None
+    if user_id is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid authentication token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return CurrentUser(user_id)
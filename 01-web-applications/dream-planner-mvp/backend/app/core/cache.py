@@ -0,0 +1,226 @@
+"""
+Read-through response cache for Dream Planner
+
+Dashboards poll the same dream detail and list pages over and over while
+nothing changes. Finished responses are cached as encoded bodies with an
+ETag, so a repeat request skips the database and response building - and a
+client sending If-None-Match gets an empty 304.
+
+Keys include the user, the calendar day (derived amounts change at
+midnight) and a per-user generation token. Writes invalidate precisely: a
+dream's detail entry is deleted and the user's generation is replaced,
+which orphans every cached detail and list page for that user at once. A
+read that raced the write took its key before the write landed, so a stale
+body it stores afterwards goes under the old generation and is never served.
+With caching disabled the generation is still kept (as an in-process
+counter), because coalesced loads key on it: a load started before a write
+must not be shared with requests that arrive after it.
+
+The storage is a CacheBackend. MemoryCacheBackend (an LRU with TTL) is the
+default; anything with the same async get/set/delete methods - a shared
+cache server client, or a fake in development - can be swapped in with
+response_cache.use_backend(). The in-process backend is per worker, so with
+several workers a write only invalidates the worker that served it and
+other workers catch up within the TTL.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.serialization import JSON_MEDIA_TYPE
+
+class CacheBackend(ABC):
+    """Interface for response cache storage (an incomplete backend can't be constructed)"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """The stored value, or None when missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value; ttl None uses the backend's default, 0 never expires"""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Drop a key (missing keys are fine)"""
+
+    def stats(self) -> dict:
+        return {}
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int, default_ttl: Optional[float] = None):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+class CachedResponse:
+    """An encoded response body with its ETag and extra headers"""
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None, media_type: str = JSON_MEDIA_TYPE):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.headers = headers or {}
+        self.media_type = media_type
+
+    def to_response(self, request: Request) -> Response:
+        """200 with the cached body, or 304 when the client already has this version"""
+        headers = {**self.headers, "ETag": self.etag}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or self.etag in [
+            tag.strip() for tag in if_none_match.split(",")
+        ]):
+            response_cache.count_not_modified()
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type=self.media_type, headers=headers)
+
+class ResponseCache:
+    """Dream detail/list response cache with per-user invalidation"""
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()  # Counters are bumped from every request
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.not_modified = 0
+        self._local_generations: Dict[int, int] = {}  # Used while there is no backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def use_backend(self, backend: Optional[CacheBackend]):
+        """Swap the storage (None disables caching)"""
+        self.backend = backend
+
+    async def dream_key(self, user_id: int, dream_id: int) -> str:
+        """Key for one dream's detail: user, current generation, day and dream"""
+        generation = await self._generation(user_id)
+        return f"dream:{user_id}:{generation}:{dream_id}:{date.today().isoformat()}"
+
+    async def list_key(self, user_id: int, params: dict) -> str:
+        """Key for one list page: user, current generation, day and the exact query"""
+        generation = await self._generation(user_id)
+        query = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.blake2b(query.encode(), digest_size=12).hexdigest()
+        return f"dreams:{user_id}:{generation}:{date.today().isoformat()}:{digest}"
+
+    async def _generation(self, user_id: int) -> str:
+        if not self.enabled:
+            return str(self._local_generations.get(user_id, 0))
+        key = f"dreams-generation:{user_id}"
+        generation = await self.backend.get(key)
+        if generation is None:
+            # A fresh random token never matches entries cached under an evicted one
+            generation = uuid.uuid4().hex[:12]
+            await self.backend.set(key, generation, ttl=0)
+        return generation
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        cached = await self.backend.get(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    async def put(
+        self,
+        key: Optional[str],
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        media_type: str = JSON_MEDIA_TYPE,
+    ) -> CachedResponse:
+        """Store an encoded response body (only wraps it when caching is disabled)"""
+        cached = CachedResponse(body, headers, media_type)
+        if self.enabled and key is not None:
+            await self.backend.set(key, cached, ttl=self.ttl)
+        return cached
+
+    async def invalidate_dream(self, user_id: int, dream_id: Optional[int] = None):
+        """Drop a dream's detail entry (if given) and replace its owner's generation"""
+        if not self.enabled:
+            self._local_generations[user_id] = self._local_generations.get(user_id, 0) + 1
+            return
+        if dream_id is not None:
+            await self.backend.delete(await self.dream_key(user_id, dream_id))
+        await self.backend.set(f"dreams-generation:{user_id}", uuid.uuid4().hex[:12], ttl=0)
+        with self._lock:
+            self.invalidations += 1
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, invalidations, not_modified = self.hits, self.misses, self.invalidations, self.not_modified
+        total = hits + misses
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else None,
+            "invalidations": invalidations,
+            "not_modified": not_modified,
+            **(self.backend.stats() if self.backend is not None else {}),
+        }
+
+# Shared cache for the API process
+response_cache = ResponseCache(
+    MemoryCacheBackend(settings.response_cache_size) if settings.response_cache_enabled else None,
+    settings.response_cache_ttl
+)
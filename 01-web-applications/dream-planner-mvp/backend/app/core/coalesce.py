@@ -0,0 +1,116 @@
+"""
+Singleflight request coalescing
+
+When a shared dashboard loads, many clients ask for the same dream or the
+same simulation at the same moment. A SingleFlight group runs the first
+request for a key as a shared task; identical requests arriving while it
+is in flight await that task instead of starting their own, and everyone
+gets the same result (or the same exception). Once the task finishes the
+key is forgotten - this folds concurrent duplicates, it doesn't cache, so
+a result is never older than the computation that produced it.
+
+The shared task outlives any single caller: a client that disconnects
+doesn't cancel work others are waiting on, and the task is only cancelled
+when nobody is left waiting. Because of that, a coalesced computation
+must not use the caller's database session (the caller's dependency
+cleanup would close it) - open one inside the computation instead.
+
+Keys come from fingerprint(), which normalizes the request parts (key
+order, dates, enums) and hashes them. Groups are registered by name and
+their folded-duplicate counters are reported on /health and /metrics.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+def fingerprint(*parts) -> str:
+    """Stable hash of request parts (dicts in any key order, dates, enums)"""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+class _Flight:
+    """One in-flight computation and how many callers await it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution"""
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        # Counters for /health and /metrics
+        self.executed = 0   # Computations actually run
+        self.folded = 0     # Calls that joined one already in flight
+        self.failed = 0     # Computations that raised (every waiter got the exception)
+        self.abandoned = 0  # Computations cancelled because every waiter went away
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn() - or the identical call already in flight for key"""
+        if not self.enabled:
+            return await fn()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            # Runs in a copy of this caller's context, so its telemetry trace sees the work
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(functools.partial(self._finished, key, flight))
+            self.executed += 1
+        else:
+            self.folded += 1
+
+        flight.waiters += 1
+        try:
+            # Shielded: one caller going away mustn't cancel the others' result
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()  # Last one waiting - nobody needs the result
+                self.abandoned += 1
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finished(self, key: Hashable, flight: _Flight, task: asyncio.Task):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1  # Also marks the exception retrieved when no waiter is left
+
+    def stats(self) -> dict:
+        total = self.executed + self.folded
+        return {
+            "in_flight": len(self._flights),
+            "executed": self.executed,
+            "folded": self.folded,
+            "fold_rate": round(self.folded / total, 3) if total else None,
+            "failed": self.failed,
+            "abandoned": self.abandoned,
+        }
+
+_groups: Dict[str, SingleFlight] = {}
+
+def singleflight(name: str) -> SingleFlight:
+    """The process-wide coalescing group with this name (created on first use)"""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name, enabled=settings.coalescing_enabled)
+    return group
+
+def coalescing_stats() -> dict:
+    """Counters of every coalescing group, by name"""
+    return {name: group.stats() for name, group in sorted(_groups.items())}
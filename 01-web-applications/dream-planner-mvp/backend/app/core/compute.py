@@ -0,0 +1,163 @@
+"""
+Shared compute executor for CPU-bound work
+
+Request handlers run on a single event loop, so a 100k-scenario simulation
+executed inline would stall every other request. Heavy calculations are
+handed to a process pool instead, with a bounded queue so a burst of
+simulations gets a fast 503 instead of piling up, and a per-job timeout.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.telemetry import telemetry
+
+class ComputeQueueFull(Exception):
+    """Raised when the pool already has as many jobs as it is allowed to hold"""
+
+class ComputeTimeout(Exception):
+    """Raised when a job takes longer than its timeout"""
+
+def _timed(job):
+    """Run a job in the worker and return (result, seconds it ran) - excludes time spent queued"""
+    started = time.perf_counter()
+    result = job()
+    return result, time.perf_counter() - started
+
+class ComputeExecutor:
+    """
+    Process pool with admission control and timeouts.
+
+    At most `max_workers + max_queue_depth` jobs are accepted at once; anything
+    beyond that is rejected immediately. Jobs still waiting in the queue are
+    cancelled on timeout or when the caller goes away. A job that has already
+    started runs to completion in its worker, but its result is discarded - it
+    keeps its slot until then, since the worker is still busy with it.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int, job_timeout: float):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max(0, max_queue_depth)
+        self.job_timeout = job_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0  # Accepted jobs whose future isn't done yet
+        self._lock = threading.Lock()  # Futures finish on the pool's management thread
+
+        # Counters for /health
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.cancelled = 0
+
+    def start(self):
+        """Create the worker pool (idempotent)"""
+        if self._pool is None:
+            # Forking the server, whose driver and pool threads may hold locks, can
+            # deadlock a worker - start workers from a clean server process instead
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+            )
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    def shutdown(self):
+        """Stop the workers and drop anything still queued"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, fn, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Run fn(*args, **kwargs) in a worker process and await its result.
+
+        fn and its arguments must be picklable (module-level functions, plain data).
+        Only completed jobs add to the request's calculation time, and only the
+        time they spent running in the worker.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue_depth:
+                self.rejected += 1
+                raise ComputeQueueFull("Compute queue is full")
+            self._pending += 1
+
+        self.start()
+        try:
+            future = self._pool.submit(_timed, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # Released when the job is really done, not when the caller stops waiting for it
+        future.add_done_callback(self._release)
+        try:
+            # wait_for cancels the wrapped future on timeout, which un-queues it
+            result, seconds = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout if timeout is not None else self.job_timeout
+            )
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ComputeTimeout("Computation timed out")
+        except asyncio.CancelledError:
+            future.cancel()
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        telemetry.record_calc(seconds)
+        return result
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """Queue depth and saturation snapshot for monitoring"""
+        running = min(self._pending, self.max_workers)
+        return {
+            "workers": self.max_workers,
+            "running": running,
+            "queued": self._pending - running,
+            "queue_capacity": self.max_queue_depth,
+            "saturation": round(running / self.max_workers, 2),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled
+        }
+
+# Shared executor - started and stopped by the application lifecycle hooks
+compute_executor = ComputeExecutor(
+    max_workers=settings.compute_workers,
+    max_queue_depth=settings.compute_max_queue,
+    job_timeout=settings.compute_job_timeout
+)
+
+async def offload(fn, *args, **kwargs):
+    """
+    Run a CPU-heavy function on the shared pool from an endpoint.
+
+    Translates pool back-pressure into HTTP errors: 503 when the queue is full
+    (clients should retry shortly) and 504 when the job times out.
+    """
+    try:
+        return await compute_executor.run(fn, *args, **kwargs)
+    except ComputeQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many calculations in progress, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    except ComputeTimeout:
+        raise HTTPException(status_code=504, detail="Calculation took too long")
@@ -0,0 +1,202 @@
+"""
+In-process background job scheduler
+
+Time-based work (the daily metrics rollover, marking funded dreams as
+completed, generating nudges) runs here instead of on the request path.
+Jobs are sweeps: each call handles one chunk of rows after a cursor and
+commits it together with the job's saved state, so a sweep can be paused
+between chunks, yields the event loop to requests, and resumes where it
+left off after an error or a restart.
+
+Each job's next run gets random jitter so several workers (or several
+daily jobs) don't all hit the database at the same moment. Jobs run one at
+a time. With several API processes every process runs the scheduler; the
+sweeps are idempotent, so overlap costs work but not correctness.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.job import JobState
+
+logger = logging.getLogger(__name__)
+
+# A sweep step: (session, cursor, batch size) -> (next cursor or None when done, rows handled),
+# optionally followed by what the chunk changed, which goes to the job's on_commit
+SweepStep = Callable[[AsyncSession, Optional[int], int], Awaitable[tuple]]
+
+# Called with a chunk's changes once they are committed (e.g. to invalidate caches)
+CommitHook = Callable[[Any], Awaitable[None]]
+
+# Longest the scheduler sleeps before re-checking, so clock changes are noticed
+MAX_IDLE_SECONDS = 60.0
+
+def _now() -> datetime:
+    """Local time to the second - daily jobs follow the same calendar as date.today()"""
+    return datetime.now().replace(microsecond=0)
+
+def next_midnight(after: datetime) -> datetime:
+    """Start of the day after `after`"""
+    return datetime.combine(after.date() + timedelta(days=1), datetime.min.time())
+
+class Job:
+    """A named sweep and when to run it"""
+
+    def __init__(
+        self,
+        name: str,
+        step: SweepStep,
+        interval: Optional[float] = None,
+        daily: bool = False,
+        batch_size: Optional[int] = None,
+        jitter: Optional[float] = None,
+        on_commit: Optional[CommitHook] = None,
+    ):
+        if interval is None and not daily:
+            raise ValueError("A job needs an interval or daily=True")
+        self.name = name
+        self.step = step
+        self.interval = interval
+        self.daily = daily
+        self.batch_size = batch_size or settings.scheduler_batch_size
+        self.jitter = settings.scheduler_jitter if jitter is None else jitter
+        self.on_commit = on_commit
+
+    def next_run(self, after: datetime) -> datetime:
+        """When the job is due after a run finishing at `after`"""
+        base = next_midnight(after) if self.daily else after + timedelta(seconds=self.interval)
+        return base + timedelta(seconds=round(random.uniform(0, self.jitter)))
+
+class Scheduler:
+    """Runs registered jobs on their schedules in a background task"""
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._next_run: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.running: Optional[str] = None
+
+    def register(self, job: Job):
+        self.jobs[job.name] = job
+
+    async def _load_state(self):
+        """Pick up persisted schedules; new jobs are due after a little jitter"""
+        now = _now()
+        async with AsyncSessionLocal() as db:
+            for job in self.jobs.values():
+                state = await db.get(JobState, job.name)
+                if state is None:
+                    state = JobState(name=job.name, runs=0, failures=0, last_processed=0)
+                    state.next_run_at = now + timedelta(seconds=round(random.uniform(0, job.jitter)))
+                    db.add(state)
+                elif state.cursor is not None or state.next_run_at is None:
+                    state.next_run_at = now  # Finish an interrupted sweep first
+                self._next_run[job.name] = state.next_run_at
+            await db.commit()
+
+    async def run_job(self, name: str) -> int:
+        """
+        Run one job to the end of its sweep now.
+
+        Returns:
+            Rows handled by this run
+        """
+        job = self.jobs[name]
+        self.running = name
+        started = time.perf_counter()
+        processed = 0
+        try:
+            async with AsyncSessionLocal() as db:
+                state = await db.get(JobState, name) or JobState(name=name, runs=0, failures=0)
+                db.add(state)
+                state.last_started_at = _now()
+                state.last_status = "running"
+                await db.commit()
+
+                cursor = state.cursor
+                while True:
+                    try:
+                        cursor, handled, *changed = await job.step(db, cursor, job.batch_size)
+                    except Exception as e:
+                        await db.rollback()
+                        state = await db.get(JobState, name)
+                        state.last_status = "failed"
+                        state.last_error = f"{type(e).__name__}: {e}"[:2000]
+                        state.failures += 1
+                        # Retry soon; the cursor still points after the last good chunk
+                        retry_at = _now() + timedelta(seconds=min(job.interval or 300.0, 300.0))
+                        state.next_run_at = self._next_run[name] = retry_at
+                        await db.commit()
+                        logger.exception("Job %s failed", name)
+                        raise
+
+                    processed += handled
+                    state.cursor = cursor
+                    if cursor is None:
+                        finished = _now()
+                        state.last_finished_at = finished
+                        state.last_status = "ok"
+                        state.last_error = None
+                        state.last_processed = processed
+                        state.runs += 1
+                        state.next_run_at = self._next_run[name] = job.next_run(finished)
+                    # The chunk and the saved cursor commit together
+                    await db.commit()
+                    if changed and changed[0] and job.on_commit is not None:
+                        # Only now can readers see the chunk, so caches are dropped after the commit
+                        await job.on_commit(changed[0])
+                    if cursor is None:
+                        break
+                    # Let requests in between chunks
+                    await asyncio.sleep(settings.scheduler_chunk_pause)
+        finally:
+            self.running = None
+        logger.info("Job %s handled %d rows in %.0fms", name, processed, (time.perf_counter() - started) * 1000)
+        return processed
+
+    async def _loop(self):
+        await self._load_state()
+        while True:
+            now = _now()
+            for name in sorted(self.jobs, key=lambda name: self._next_run[name]):
+                if self._next_run[name] <= now:
+                    try:
+                        await self.run_job(name)
+                    except Exception:
+                        pass  # Already recorded and logged; the loop keeps going
+            soonest = min(self._next_run.values(), default=now + timedelta(seconds=MAX_IDLE_SECONDS))
+            wait = (soonest - _now()).total_seconds()
+            await asyncio.sleep(min(max(wait, 1.0), MAX_IDLE_SECONDS))
+
+    def start(self):
+        """Start the background task (call from inside the event loop)"""
+        if self._task is None and self.jobs:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def shutdown(self):
+        """Stop between chunks; an interrupted sweep resumes from its cursor next start"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "running": self.running,
+            "next_runs": {name: run.isoformat() for name, run in sorted(self._next_run.items())},
+        }
+
+# Shared scheduler - jobs are registered by app.services.sweeps
+scheduler = Scheduler()
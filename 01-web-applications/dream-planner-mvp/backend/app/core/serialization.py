@@ -0,0 +1,84 @@
+"""
+Response encoding for Dream Planner
+
+Hot endpoints build plain dicts and lists from trusted database values and
+encode them here directly, skipping the response_model validation pass
+FastAPI would otherwise run on top of the model that was just built.
+
+JSON goes through orjson when it is installed and the standard library
+otherwise. List and batch endpoints can also answer in a columnar layout
+(one array per field - repeated keys are written once) and, with the
+msgpack package installed, as MessagePack.
+"""
+
+import enum
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional binary format
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+class ListFormat(str, enum.Enum):
+    """Encodings offered by list and batch endpoints"""
+    json = "json"          # Array of objects
+    columnar = "columnar"  # {"count": n, "columns": {field: [values]}}
+    msgpack = "msgpack"    # Array of objects as MessagePack (needs the msgpack package)
+
+class FormatUnavailable(ValueError):
+    """Raised when a format's optional package isn't installed"""
+
+def _default(value):
+    """Encode what the standard encoders can't: enums, dates and NumPy values"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+# Reused encoder - json.dumps with options builds a new one on every call
+_json_encoder = json.JSONEncoder(default=_default, separators=(",", ":"), ensure_ascii=False)
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return _json_encoder.encode(content).encode()
+
+def to_columns(rows: List[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> dict:
+    """Turn a list of row dicts into the columnar layout"""
+    if fields is None:
+        fields = list(rows[0]) if rows else []
+    return {"count": len(rows), "columns": {field: [row[field] for row in rows] for field in fields}}
+
+def encode(content: Any, format: ListFormat = ListFormat.json, fields: Optional[Sequence[str]] = None) -> tuple:
+    """
+    Encode a response in the requested format.
+
+    Args:
+        content: For columnar, a list of row dicts; otherwise any JSON-able value
+        format: Requested encoding
+        fields: Column order for the columnar layout (defaults to the first row's keys)
+
+    Returns:
+        (body bytes, media type)
+    """
+    if format == ListFormat.columnar:
+        return dumps(to_columns(content, fields)), JSON_MEDIA_TYPE
+    if format == ListFormat.msgpack:
+        if msgpack is None:
+            raise FormatUnavailable("MessagePack output needs the msgpack package installed")
+        return msgpack.packb(content, default=_default), MSGPACK_MEDIA_TYPE
+    return dumps(content), JSON_MEDIA_TYPE
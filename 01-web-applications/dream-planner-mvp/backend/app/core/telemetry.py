@@ -0,0 +1,330 @@
+"""
+Request telemetry and Prometheus metrics
+
+TelemetryMiddleware times every HTTP request by route template (so
+/dreams/1 and /dreams/2 share a series) and tracks how many are in flight.
+While a request runs, a context variable holds its trace: the engine
+events in app.models.database add each SQL statement's count and time to
+it, and calculation code (offloaded jobs, inline batch math) adds its time.
+When the request finishes the trace folds into per-route counters, and a
+request slower than settings.slow_request_seconds is logged with the
+statements it ran.
+
+Everything is kept in process memory and rendered on demand in the
+Prometheus text exposition format by render(); statements run outside a
+request (background jobs, scripts) are counted under the "<background>"
+route.
+"""
+
+import bisect
+import logging
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from starlette.routing import Match
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, seconds (Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for paths no route matches, and for statements run outside a request
+UNMATCHED_ROUTE = "<unmatched>"
+BACKGROUND_ROUTE = "<background>"
+
+# (method, path) -> route template lookups remembered before the table is reset
+ROUTE_CACHE_SIZE = 4096
+
+# Characters of each statement kept in the slow-request log
+STATEMENT_PREVIEW_CHARS = 300
+
+METRIC_PREFIX = "dream_planner"
+
+class RequestTrace:
+    """Database and calculation work done on behalf of one request"""
+
+    __slots__ = ("queries", "db_seconds", "calc_seconds", "statements", "token")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.calc_seconds = 0.0
+        self.statements: List[Tuple[float, str]] = []  # (seconds, SQL), up to the configured cap
+        self.token = None  # Restores the previous trace when the request finishes
+
+class RouteStats:
+    """Counters for one (method, route template)"""
+
+    __slots__ = ("buckets", "count", "total_seconds", "in_flight", "statuses", "slow",
+                 "queries", "db_seconds", "calc_seconds")
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * (bucket_count + 1)  # Last slot counts requests above every bound
+        self.count = 0
+        self.total_seconds = 0.0
+        self.in_flight = 0
+        self.statuses: Dict[int, int] = {}
+        self.slow = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.calc_seconds = 0.0
+
+    def copy(self) -> "RouteStats":
+        clone = RouteStats.__new__(RouteStats)
+        for name in self.__slots__:
+            value = getattr(self, name)
+            setattr(clone, name, value.copy() if isinstance(value, (list, dict)) else value)
+        return clone
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+class Telemetry:
+    """
+    Per-route latency histograms, in-flight gauges and DB/calculation time.
+
+    Updates happen under a lock because the sync engine's events can fire
+    from threads other than the event loop's.
+    """
+
+    def __init__(self, enabled: bool, slow_request_seconds: float, max_statements: int,
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.slow_request_seconds = slow_request_seconds
+        self.max_statements = max(0, max_statements)
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+        self._route_names: Dict[Tuple[str, str], str] = {}
+        self.started = time.time()
+
+    def _stats(self, method: str, route: str) -> RouteStats:
+        stats = self._routes.get((method, route))
+        if stats is None:
+            stats = self._routes.setdefault((method, route), RouteStats(len(self.buckets)))
+        return stats
+
+    def route_for(self, scope) -> str:
+        """Route template a request will be dispatched to (cached per method and path)"""
+        key = (scope["method"], scope["path"])
+        route = self._route_names.get(key)
+        if route is not None:
+            return route
+
+        route, partial = None, None
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate.path
+                break
+            if match == Match.PARTIAL and partial is None:
+                partial = candidate.path  # Path matches, method doesn't - FastAPI answers 405
+        route = route or partial or UNMATCHED_ROUTE
+
+        if len(self._route_names) >= ROUTE_CACHE_SIZE:
+            self._route_names.clear()
+        self._route_names[key] = route
+        return route
+
+    def begin(self, method: str, route: str) -> RequestTrace:
+        """Count a request in flight and make a trace current for it"""
+        with self._lock:
+            self._stats(method, route).in_flight += 1
+        trace = RequestTrace()
+        trace.token = _current_trace.set(trace)
+        return trace
+
+    def finish(self, method: str, route: str, path: str, trace: RequestTrace, status: int, seconds: float):
+        """Fold a finished request's latency and trace into its route's counters"""
+        _current_trace.reset(trace.token)
+        slow = seconds >= self.slow_request_seconds
+        with self._lock:
+            stats = self._stats(method, route)
+            stats.in_flight -= 1
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.buckets[bisect.bisect_left(self.buckets, seconds)] += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.queries += trace.queries
+            stats.db_seconds += trace.db_seconds
+            stats.calc_seconds += trace.calc_seconds
+            stats.slow += slow
+        if slow:
+            self._log_slow(method, path, status, seconds, trace)
+
+    def _log_slow(self, method: str, path: str, status: int, seconds: float, trace: RequestTrace):
+        lines = [
+            f"  {statement_seconds * 1000:8.1f}ms  {' '.join(statement.split())[:STATEMENT_PREVIEW_CHARS]}"
+            for statement_seconds, statement in trace.statements
+        ]
+        if trace.queries > len(trace.statements):
+            lines.append(f"  ... {trace.queries - len(trace.statements)} more")
+        logger.warning(
+            "Slow request %s %s -> %d in %.0fms (%d queries, %.0fms db, %.0fms calc)%s",
+            method, path, status, seconds * 1000, trace.queries,
+            trace.db_seconds * 1000, trace.calc_seconds * 1000,
+            "".join("\n" + line for line in lines)
+        )
+
+    def record_query(self, statement: str, seconds: float):
+        """Engine event hook: one SQL statement finished"""
+        trace = _current_trace.get()
+        if trace is None:
+            with self._lock:
+                stats = self._stats("", BACKGROUND_ROUTE)
+                stats.queries += 1
+                stats.db_seconds += seconds
+            return
+        trace.queries += 1
+        trace.db_seconds += seconds
+        if len(trace.statements) < self.max_statements:
+            trace.statements.append((seconds, statement))
+
+    def record_calc(self, seconds: float):
+        """Add calculation time to the current request (summed across parallel jobs)"""
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.calc_seconds += seconds
+
+    @contextmanager
+    def calc_timer(self):
+        """Time an inline calculation block against the current request"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_calc(time.perf_counter() - started)
+
+    def render(self, gauges: Optional[dict] = None) -> str:
+        """
+        All metrics in the Prometheus text exposition format (version 0.0.4).
+
+        Args:
+            gauges: Nested component stats (as on /health); every numeric
+                leaf becomes a gauge named after its path
+        """
+        with self._lock:
+            routes = sorted((key, stats.copy()) for key, stats in self._routes.items())
+        requests = [(key, stats) for key, stats in routes if key[1] != BACKGROUND_ROUTE]
+
+        out = []
+
+        def family(name, kind, description):
+            out.append(f"# HELP {METRIC_PREFIX}_{name} {description}")
+            out.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+        def sample(name, value, **labels):
+            rendered = ",".join(f'{label}="{_escape(str(text))}"' for label, text in labels.items())
+            out.append(f"{METRIC_PREFIX}_{name}{{{rendered}}} {_number(value)}" if labels else f"{METRIC_PREFIX}_{name} {_number(value)}")
+
+        family("http_requests_total", "counter", "HTTP requests by route and status code")
+        for (method, route), stats in requests:
+            for status, count in sorted(stats.statuses.items()):
+                sample("http_requests_total", count, method=method, route=route, status=status)
+
+        family("http_request_duration_seconds", "histogram", "HTTP request latency by route")
+        for (method, route), stats in requests:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, stats.buckets):
+                cumulative += bucket
+                sample("http_request_duration_seconds_bucket", cumulative, method=method, route=route, le=bound)
+            sample("http_request_duration_seconds_bucket", stats.count, method=method, route=route, le="+Inf")
+            sample("http_request_duration_seconds_sum", stats.total_seconds, method=method, route=route)
+            sample("http_request_duration_seconds_count", stats.count, method=method, route=route)
+
+        family("http_requests_in_flight", "gauge", "HTTP requests being served by route")
+        for (method, route), stats in requests:
+            sample("http_requests_in_flight", stats.in_flight, method=method, route=route)
+
+        family("http_slow_requests_total", "counter", f"HTTP requests slower than {self.slow_request_seconds:g}s")
+        for (method, route), stats in requests:
+            sample("http_slow_requests_total", stats.slow, method=method, route=route)
+
+        family("db_queries_total", "counter", "SQL statements executed by route")
+        for (method, route), stats in routes:
+            sample("db_queries_total", stats.queries, method=method, route=route)
+
+        family("db_query_seconds_total", "counter", "Time spent executing SQL by route")
+        for (method, route), stats in routes:
+            sample("db_query_seconds_total", stats.db_seconds, method=method, route=route)
+
+        family("calc_seconds_total", "counter", "Time spent in calculations by route (parallel jobs summed)")
+        for (method, route), stats in requests:
+            sample("calc_seconds_total", stats.calc_seconds, method=method, route=route)
+
+        family("uptime_seconds", "gauge", "Seconds since the metrics registry was created")
+        sample("uptime_seconds", time.time() - self.started)
+
+        for name, value in _flatten(gauges or {}):
+            family(name, "gauge", name.replace("_", " "))
+            sample(name, value)
+
+        return "\n".join(out) + "\n"
+
+class TelemetryMiddleware:
+    """
+    Pure ASGI middleware (no per-request task like BaseHTTPMiddleware) that
+    feeds the shared Telemetry registry.
+    """
+
+    def __init__(self, app, registry: Optional["Telemetry"] = None):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        registry = self.registry or telemetry
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = registry.route_for(scope)
+        status = 500  # Reported if the app raises before starting a response
+        started = time.perf_counter()
+        trace = registry.begin(method, route)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.finish(method, route, scope["path"], trace, status, time.perf_counter() - started)
+
+_METRIC_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+def _flatten(stats: dict, prefix: str = ""):
+    """(metric name, value) for every numeric leaf of nested stats"""
+    for key, value in stats.items():
+        name = f"{prefix}_{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            yield from _flatten(value, name)
+        elif isinstance(value, (int, float)):
+            yield _METRIC_NAME.sub("_", name), value
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _number(value) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(value)  # repr of a float (including nan) is valid exposition syntax
+
+# Shared registry - the middleware, engine events and /metrics all use this one
+telemetry = Telemetry(
+    enabled=settings.telemetry_enabled,
+    slow_request_seconds=settings.slow_request_seconds,
+    max_statements=settings.slow_request_max_queries
+)
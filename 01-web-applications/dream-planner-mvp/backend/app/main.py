@@ -5,14 +5,30 @@ This is the main entry point for the Dream Planner MVP backend.
 The app transforms intimidating retirement goals into achievable daily habits.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 import math
 
 # Import database and API routes
-from app.models.database import create_tables
-from app.api.v1.endpoints import dreams
+from app.models.database import create_tables, pool_stats
+from app.core.auth import check_auth_settings
+from app.core.cache import response_cache
+from app.core.coalesce import coalescing_stats
+from app.core.compute import compute_executor
+from app.core.scheduler import scheduler
+from app.core.telemetry import TelemetryMiddleware, telemetry
+from app.core.config import settings
+from app.services.calculations import COFFEE_PRICE, LUNCH_PRICE, STREAMING_PRICE
+from app.services.finance import required_contribution
+from app.services.metrics import dream_metrics
+from app.services.sweeps import register_jobs
+from app.services.projection import projection_cache
+from app.services.projection_store import projection_store
+from app.api.v1.endpoints import buckets, dreams, dreams_bulk, nudges, projections, spending, taxes
 
 # Create FastAPI application
 app = FastAPI(
@@ -30,16 +46,55 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor for dream lists
 )
 
-# Include API routes
+# Per-route latency, in-flight, DB and calculation metrics (added last, so it times everything)
+app.add_middleware(TelemetryMiddleware)
+
+def _json_safe(value):
+    """Non-finite floats as strings ("inf", "nan") - strict JSON has no literal for them"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """
+    FastAPI's 422, except that a rejected Infinity or NaN echoed back in the
+    error's input can't turn it into a 500 (the parser accepts those literals)
+    """
+    return JSONResponse(status_code=422, content={"detail": _json_safe(jsonable_encoder(exc.errors()))})
+
+# Include API routes (bulk routes first so /import and /export aren't read as dream ids)
+app.include_router(dreams_bulk.router, prefix="/api/v1/dreams", tags=["dreams"])
 app.include_router(dreams.router, prefix="/api/v1/dreams", tags=["dreams"])
+app.include_router(projections.router, prefix="/api/v1/projections", tags=["projections"])
+app.include_router(buckets.router, prefix="/api/v1/buckets", tags=["buckets"])
+app.include_router(nudges.router, prefix="/api/v1/nudges", tags=["nudges"])
+app.include_router(spending.router, prefix="/api/v1/spending", tags=["spending"])
+app.include_router(taxes.router, prefix="/api/v1/taxes", tags=["taxes"])
 
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on application startup"""
-    create_tables()
+    """Initialize database tables, the compute pool and background jobs"""
+    check_auth_settings()
+    await create_tables()
+    compute_executor.start()
+    if settings.scheduler_enabled:
+        register_jobs(scheduler)
+        scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop compute workers and background tasks so the process exits cleanly"""
+    compute_executor.shutdown()
+    await scheduler.shutdown()
 
 @app.get("/")
 async def root():
@@ -51,15 +106,43 @@ async def root():
         "version": "1.0.0"
     }
 
+def _component_stats() -> dict:
+    """Stats of the in-process caches, pools and jobs"""
+    return {
+        "compute": compute_executor.stats(),
+        "projection_cache": projection_cache.stats(),
+        "projection_store": projection_store.stats(),
+        "response_cache": response_cache.stats(),
+        "metrics": dream_metrics.stats(),
+        "scheduler": scheduler.stats(),
+        "coalescing": coalescing_stats(),
+        "database": pool_stats()
+    }
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "service": "dream-planner-api"
+        "service": "dream-planner-api",
+        **_component_stats()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Request, database and calculation metrics in the Prometheus text format.
+
+    Per-route latency histograms, in-flight requests, status counts, SQL
+    statement counts and time, calculation time, plus every numeric field
+    of /health's component stats as a gauge.
+    """
+    return PlainTextResponse(
+        telemetry.render(_component_stats()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @app.post("/calculate")
 async def calculate_dream(target_amount: float, target_date: str):
     """
@@ -86,32 +169,17 @@ async def calculate_dream(target_amount: float, target_date: str):
                 "days_remaining": days_remaining
             }
         
-        # Calculate amounts (assuming 5% annual interest)
-        annual_rate = 0.05
-        daily_rate = annual_rate / 365
-        
-        # Future value calculation: FV = PV * (1 + r)^n
-        # We need: PV = FV / (1 + r)^n, then divide by days for daily amount
-        if daily_rate > 0:
-            # Compound interest calculation
-            present_value_needed = target_amount / ((1 + daily_rate) ** days_remaining)
-            daily_amount = present_value_needed / days_remaining
-        else:
-            # Simple division if no interest
-            daily_amount = target_amount / days_remaining
-        
-        weekly_amount = daily_amount * 7
-        monthly_amount = daily_amount * 30
-        
-        # Generate relatable comparisons
-        coffee_price = 5.50  # Average coffee price
-        streaming_price = 15.99  # Netflix-like service
-        lunch_price = 12.00  # Average lunch
+        # Calculate amounts with compound interest on savings (shared finance engine)
+        annual_rate = settings.savings_annual_rate
+        daily_amount = required_contribution(target_amount, 0.0, days_remaining, "daily")
+        weekly_amount = required_contribution(target_amount, 0.0, days_remaining, "weekly")
+        monthly_amount = required_contribution(target_amount, 0.0, days_remaining, "monthly")
         
+        # Generate relatable comparisons (same prices as the batch calculator)
         comparisons = {
-            "coffees_per_day": round(daily_amount / coffee_price, 1),
-            "streaming_services": round(monthly_amount / streaming_price, 1),
-            "lunches_per_week": round(weekly_amount / lunch_price, 1)
+            "coffees_per_day": round(daily_amount / COFFEE_PRICE, 1),
+            "streaming_services": round(monthly_amount / STREAMING_PRICE, 1),
+            "lunches_per_week": round(weekly_amount / LUNCH_PRICE, 1)
         }
         
         # Create motivational message
@@ -131,7 +199,7 @@ async def calculate_dream(target_amount: float, target_date: str):
             "monthly_amount": round(monthly_amount, 2),
             "comparisons": comparisons,
             "motivation": motivation,
-            "calculation_note": "Includes 5% annual compound interest"
+            "calculation_note": f"Includes {annual_rate * 100:g}% annual compound interest"
         }
         
     except ValueError as e:
@@ -0,0 +1,101 @@
+"""
+Bucket ledger models for Dream Planner
+
+Money lives in three buckets - Foundation (long-term security), Dream
+(goals) and Life (everyday cushion). Every movement is recorded in an
+append-only ledger: one transaction row, plus one entry per bucket it
+touches carrying the bucket's balance afterwards. Current balances are
+materialized in bucket_balances and updated in the same database
+transaction, so reading them never re-scans history.
+"""
+
+import enum
+from sqlalchemy import Column, Integer, String, Float, Text, Enum, Index, ForeignKey, event
+from app.models.database import Base
+from app.models.dream import Timestamp
+
+class Bucket(str, enum.Enum):
+    """The three savings buckets"""
+    foundation = "foundation"  # Retirement and long-term security
+    dream = "dream"            # Saving towards dreams
+    life = "life"              # Emergencies and everyday flexibility
+
+class TransactionType(str, enum.Enum):
+    """Kinds of money movement"""
+    contribution = "contribution"  # New money into a bucket
+    withdrawal = "withdrawal"      # Money spent out of a bucket
+    transfer = "transfer"          # Permanent move between buckets
+    borrow = "borrow"              # Temporary move, to be repaid
+    repay = "repay"                # Paying a borrow back
+    adjustment = "adjustment"      # Correction - the ledger is never edited in place
+    emergency = "emergency"        # Urgent withdrawal
+
+class ReasonCategory(str, enum.Enum):
+    """Why money moved, for reporting"""
+    emergency = "emergency"
+    opportunity = "opportunity"
+    rebalancing = "rebalancing"
+    milestone = "milestone"
+    repair = "repair"
+    medical = "medical"
+    education = "education"
+    family = "family"
+    other = "other"
+
+class BucketTransaction(Base):
+    """A single money movement - never updated or deleted"""
+    __tablename__ = "bucket_transactions"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    type = Column(Enum(TransactionType), nullable=False)
+    amount = Column(Float, nullable=False)               # Always positive; direction comes from the buckets
+    from_bucket = Column(Enum(Bucket))                   # None for contributions
+    to_bucket = Column(Enum(Bucket))                     # None for withdrawals
+    reason = Column(String(500), nullable=False)
+    category = Column(Enum(ReasonCategory), nullable=False, default=ReasonCategory.other)
+    notes = Column(Text)
+    created_at = Column(Timestamp, nullable=False)
+
+    # Statistics read a user's transactions by time range
+    __table_args__ = (
+        Index("ix_bucket_transactions_user_created_id", user_id, created_at, id),
+    )
+
+class BucketEntry(Base):
+    """One leg of a transaction against a single bucket - never updated or deleted"""
+    __tablename__ = "bucket_entries"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    transaction_id = Column(Integer, ForeignKey("bucket_transactions.id"), nullable=False)
+    bucket = Column(Enum(Bucket), nullable=False)
+    amount = Column(Float, nullable=False)         # Signed: negative when money leaves the bucket
+    balance_after = Column(Float, nullable=False)  # Running balance - history needs no re-summing
+    created_at = Column(Timestamp, nullable=False)
+
+    # Bucket history is a range scan on (user, bucket, time), newest first
+    __table_args__ = (
+        Index("ix_bucket_entries_user_bucket_created_id", user_id, bucket, created_at, id),
+        Index("ix_bucket_entries_transaction_id", transaction_id),
+    )
+
+class BucketBalance(Base):
+    """Materialized current balance of one user's bucket"""
+    __tablename__ = "bucket_balances"
+
+    user_id = Column(Integer, primary_key=True)
+    bucket = Column(Enum(Bucket), primary_key=True)
+    balance = Column(Float, nullable=False, default=0.0)
+    total_in = Column(Float, nullable=False, default=0.0)
+    total_out = Column(Float, nullable=False, default=0.0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(Timestamp)
+
+def _reject_change(mapper, connection, target):
+    raise ValueError(f"{target.__tablename__} is append-only - record an adjustment instead")
+
+# Guard the ledger against ORM edits; corrections are new transactions
+for _model in (BucketTransaction, BucketEntry):
+    event.listen(_model, "before_update", _reject_change)
+    event.listen(_model, "before_delete", _reject_change)
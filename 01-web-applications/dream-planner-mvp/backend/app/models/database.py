@@ -1,31 +1,222 @@
 """
 Database configuration and session management for Dream Planner
 
-Sets up SQLite database with SQLAlchemy for the MVP demo.
-In production, this would be PostgreSQL or similar.
+Engines are built from settings.database_url:
+- SQLite (default, local development): WAL journal so readers don't block the
+  writer, a busy timeout instead of instant "database is locked" errors
+- PostgreSQL (production): pooled connections with pre-ping and recycling
+
+Two engines share that configuration: an async one (aiosqlite/asyncpg) used
+by the API endpoints so queries never block the event loop, and a sync one
+for startup, scripts and benchmarks. Pool checkout wait time and
+utilization are tracked for both, and every statement's time is added to
+the request telemetry.
 """
 
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from app.core.config import settings
+from app.core.telemetry import telemetry
+from app.models.sql_functions import register_sqlite_functions
 
-# Ensure database directory exists
-database_dir = "/Volumes/Extreme Pro/Programming/Python/Portfolio-Projects/01-web-applications/dream-planner-mvp/backend/database"
-os.makedirs(database_dir, exist_ok=True)
+class PoolMetrics:
+    """Connection pool counters - how long requests wait and how busy the pool is"""
 
-# SQLite database URL for MVP
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{database_dir}/dream_planner.db"
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
 
-# Create engine with SQLite-specific configurations
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLite specific - allows multiple threads
-    echo=False  # Set to True for SQL query debugging
-)
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_checkout(self):
+        with self._lock:
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def record_checkin(self):
+        with self._lock:
+            self.checked_out -= 1
+
+class _TimedCheckout:
+    """
+    Pool mixin that times each checkout through the public Pool.connect().
+
+    The wait covers queueing for a free connection plus opening a new one
+    when the pool grows - what a request actually waits for. Pool timeouts
+    are counted separately.
+    """
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    metrics = pool_metrics
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+# Async drivers for each sync URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+def _async_url(url: str) -> str:
+    """Same database, async driver (sqlite -> aiosqlite, postgresql -> asyncpg)"""
+    database_url = make_url(url)
+    driver = ASYNC_DRIVERS.get(database_url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {database_url.get_backend_name()}")
+    return database_url.set(drivername=f"{database_url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+def _build_engine(url: str, is_async: bool = False):
+    """Create an engine with pooling and dialect tuning for the given URL"""
+    database_url = make_url(url)
+    factory = create_async_engine if is_async else create_engine
+    pool_class = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+
+    if database_url.get_backend_name() == "sqlite":
+        database = database_url.database
+        if not database or database == ":memory:":
+            # One shared in-memory database per engine
+            return factory(
+                url,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+                echo=settings.db_echo
+            )
+
+        # Ensure database directory exists
+        os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+        return factory(
+            url,
+            connect_args={
+                "check_same_thread": False,  # Pooled connections move between threads
+                "timeout": settings.sqlite_busy_timeout_ms / 1000
+            },
+            poolclass=pool_class,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            echo=settings.db_echo
+        )
 
-# Session factory for database operations
+    # PostgreSQL and other server databases
+    return factory(
+        url,
+        poolclass=pool_class,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,  # Avoid connections killed by idle timeouts
+        pool_pre_ping=True,                     # Transparently replace dead connections
+        echo=settings.db_echo
+    )
+
+def _configure_connection(dbapi_connection):
+    """Per-connection setup for SQLite: pragmas and SQL functions for derived metrics"""
+    register_sqlite_functions(dbapi_connection)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")       # Readers and a writer run concurrently
+    cursor.execute("PRAGMA synchronous=NORMAL")     # Safe with WAL, far fewer fsyncs
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._telemetry_started = time.perf_counter()
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_telemetry_started", None)
+    if started is not None:
+        telemetry.record_query(statement, time.perf_counter() - started)
+
+def _instrument(sync_engine, metrics: PoolMetrics):
+    """Attach connection setup, checkout/checkin tracking and query timing to an engine"""
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", lambda dbapi_connection, record: _configure_connection(dbapi_connection))
+    event.listen(sync_engine, "checkout", lambda *args: metrics.record_checkout())
+    event.listen(sync_engine, "checkin", lambda *args: metrics.record_checkin())
+    if telemetry.enabled:
+        # Statement count and time go to the current request's trace (app.core.telemetry)
+        event.listen(sync_engine, "before_cursor_execute", _query_started)
+        event.listen(sync_engine, "after_cursor_execute", _query_finished)
+
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+engine = _build_engine(SQLALCHEMY_DATABASE_URL)
+async_engine = _build_engine(_async_url(SQLALCHEMY_DATABASE_URL), is_async=True)
+
+_instrument(engine, pool_metrics)
+_instrument(async_engine.sync_engine, async_pool_metrics)
+
+def _engine_stats(sync_engine, metrics: PoolMetrics) -> dict:
+    pool = sync_engine.pool
+    capacity = None
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(0, settings.db_max_overflow)
+    return {
+        "checked_out": metrics.checked_out,
+        "peak_checked_out": metrics.peak_checked_out,
+        "capacity": capacity,
+        "utilization": round(metrics.checked_out / capacity, 2) if capacity else None,
+        "checkouts": metrics.checkouts,
+        "checkout_timeouts": metrics.timeouts,
+        "avg_checkout_wait_ms": round(
+            metrics.total_wait_seconds / metrics.checkouts * 1000, 3
+        ) if metrics.checkouts else 0.0,
+        "max_checkout_wait_ms": round(metrics.max_wait_seconds * 1000, 3)
+    }
+
+def pool_stats() -> dict:
+    """Snapshot of connection pool usage for /health and metrics"""
+    return {
+        "backend": engine.dialect.name,
+        "async": _engine_stats(async_engine.sync_engine, async_pool_metrics),
+        "sync": _engine_stats(engine, pool_metrics)
+    }
+
+# Session factories for database operations
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # Objects stay readable after commit without another round-trip
+)
 
 # Base class for all ORM models
 Base = declarative_base()
@@ -43,10 +234,23 @@ def get_db():
     finally:
         db.close()
 
-def create_tables():
+async def get_async_db():
+    """
+    Async database dependency for FastAPI endpoints.
+    
+    Yields an AsyncSession - await every execute/commit so the event loop
+    keeps serving other requests while the database works.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def create_tables():
     """
     Create all database tables.
     Call this once during application startup.
+    
+    Runs on the async engine the API uses (for in-memory SQLite the two
+    engines are separate databases; scripts create their own tables).
     """
-    Base.metadata.create_all(bind=engine)
-
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -6,10 +6,26 @@ The core insight: large goals become achievable when broken into daily amounts.
 """
 
 import enum
-from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Enum, Index, case
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
+from app.core.config import settings
 from app.models.database import Base
+from app.models.sql_functions import days_until
+from app.services.calculations import ACHIEVABLE_DAILY_LIMIT
+from app.services.finance import PERIODS_PER_YEAR
+from app.services.metrics import DreamMetrics, dream_metrics
+
+# Server-set timestamps in SQLite are CURRENT_TIMESTAMP text ("YYYY-MM-DD HH:MM:SS").
+# Binding datetimes in that same format keeps comparisons against them (keyset
+# cursors) exact instead of tripping over a ".000000" suffix.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite"
+)
 
 class DreamStatus(str, enum.Enum):
     """Status of a dream/goal"""
@@ -39,7 +55,7 @@ class Dream(Base):
     
     # Primary fields
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, default=1)  # MVP simplification - single user
+    user_id = Column(Integer, nullable=False)  # Owner - every query is scoped by this
     title = Column(String(200), nullable=False, index=True)
     description = Column(Text)
     category = Column(Enum(DreamCategory), default=DreamCategory.lifestyle)
@@ -54,80 +70,120 @@ class Dream(Base):
     status = Column(Enum(DreamStatus), default=DreamStatus.active)
     
     # Timestamps
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
+    
+    # Indexes mirror the list query shapes: always scoped to one user, optional
+    # status/category filter, then (sort key, id) for keyset pagination.
+    # Leading with user_id keeps per-user cost flat however many users exist.
+    __table_args__ = (
+        Index("ix_dreams_user_created_id", user_id, created_at, id),
+        Index("ix_dreams_user_status_created_id", user_id, status, created_at, id),
+        Index("ix_dreams_user_category_created_id", user_id, category, created_at, id),
+        Index("ix_dreams_user_target_date_id", user_id, target_date, id),
+        # Expression index so sort=progress is an index scan, not a full sort
+        Index("ix_dreams_user_progress_ratio", user_id, current_saved / target_amount, id),
+    )
+    
+    # Derived metrics are hybrid properties: memoized Python on an instance
+    # (see app.services.metrics), SQL expressions on the class so list
+    # queries can filter/sort in the database
     
     @property
+    def metrics(self) -> DreamMetrics:
+        """All derived metrics for today, memoized per dream version and day"""
+        return dream_metrics.get(self)
+    
+    @hybrid_property
     def days_remaining(self) -> int:
         """Calculate days remaining until target date"""
-        if isinstance(self.target_date, datetime):
-            target = self.target_date.date()
-        else:
-            target = self.target_date
-            
-        today = date.today()
-        delta = target - today
-        return max(0, delta.days)
+        return self.metrics.days_remaining
     
-    @property
+    @days_remaining.expression
+    def days_remaining(cls):
+        days = days_until(cls.target_date)
+        return case((days > 0, days), else_=0)
+    
+    @hybrid_property
     def amount_remaining(self) -> float:
         """Calculate amount still needed to reach goal"""
-        return max(0, self.target_amount - self.current_saved)
+        return self.metrics.amount_remaining
     
-    @property
+    @amount_remaining.expression
+    def amount_remaining(cls):
+        remaining = cls.target_amount - func.coalesce(cls.current_saved, 0.0)
+        return case((remaining > 0, remaining), else_=0.0)
+    
+    @hybrid_property
     def daily_amount(self) -> float:
         """
         Calculate daily amount needed to reach goal.
         This is the CORE INSIGHT of the app!
-        """
-        days = self.days_remaining
-        if days <= 0:
-            return 0.0
         
-        # Simple calculation for MVP - no compound interest yet
-        return self.amount_remaining / days
+        Includes compound interest on savings at the configured rate.
+        """
+        return self.metrics.daily_amount
+    
+    @daily_amount.expression
+    def daily_amount(cls):
+        # Same annuity formula as app.services.finance, written as SQL
+        days = days_until(cls.target_date)
+        saved = func.coalesce(cls.current_saved, 0.0)
+        rate = settings.savings_annual_rate / PERIODS_PER_YEAR["daily"]
+        if rate == 0:
+            payment = (cls.target_amount - saved) / days
+        else:
+            growth = func.power(1.0 + rate, days)
+            payment = (cls.target_amount - saved * growth) * rate / (growth - 1.0)
+        return case((days <= 0, 0.0), (payment < 0, 0.0), else_=payment)
     
     @property
     def weekly_amount(self) -> float:
-        """Weekly savings needed"""
-        return self.daily_amount * 7
+        """Weekly savings needed when saving once a week"""
+        return self.metrics.weekly_amount
     
     @property
     def monthly_amount(self) -> float:
-        """Monthly savings needed (30-day month)"""
-        return self.daily_amount * 30
+        """Monthly savings needed when saving once a month (30-day month)"""
+        return self.metrics.monthly_amount
     
-    @property
+    @hybrid_property
     def progress_percentage(self) -> float:
         """Progress towards goal as percentage"""
-        if self.target_amount <= 0:
-            return 0.0
-        return min(100.0, (self.current_saved / self.target_amount) * 100)
+        return self.metrics.progress_percentage
     
-    @property
+    @progress_percentage.expression
+    def progress_percentage(cls):
+        return case(
+            (cls.target_amount <= 0, 0.0),
+            (cls.current_saved >= cls.target_amount, 100.0),
+            else_=func.coalesce(cls.current_saved, 0.0) / cls.target_amount * 100
+        )
+    
+    @hybrid_property
+    def progress_ratio(self) -> float:
+        """Saved / target, uncapped - the indexed sort key behind progress_percentage"""
+        return self.current_saved / self.target_amount
+    
+    @progress_ratio.expression
+    def progress_ratio(cls):
+        return cls.current_saved / cls.target_amount
+    
+    @hybrid_property
     def is_achievable(self) -> bool:
         """Whether the daily amount is realistic (under $100/day)"""
-        return self.daily_amount <= 100.0
+        return self.metrics.is_achievable
+    
+    @is_achievable.expression
+    def is_achievable(cls):
+        return cls.daily_amount <= ACHIEVABLE_DAILY_LIMIT
     
     def get_comparisons(self) -> dict:
         """
         Generate relatable comparisons for the daily amount.
         This makes big dreams feel achievable!
         """
-        daily = self.daily_amount
-        
-        # Common expense comparisons
-        coffee_price = 5.50
-        lunch_price = 12.00
-        movie_price = 15.00
-        streaming_price = 12.99
-        
-        return {
-            "coffees": round(daily / coffee_price, 1),
-            "lunches_per_week": round(self.weekly_amount / lunch_price, 1),
-            "movie_tickets": round(daily / movie_price, 1),
-            "streaming_services": round(self.monthly_amount / streaming_price, 1)
-        }
+        return self.metrics.comparisons()
     
     def __repr__(self):
         return f"<Dream(id={self.id}, title='{self.title}', target=${self.target_amount}, daily=${self.daily_amount:.2f})>"
@@ -0,0 +1,27 @@
+"""
+Background job state for Dream Planner
+
+One row per scheduled job. The scheduler commits each processed chunk
+together with the job's cursor, so a sweep interrupted by a restart or an
+error resumes after the last committed chunk instead of starting over, and
+next_run_at survives restarts so a daily job doesn't re-run on every boot.
+"""
+
+from sqlalchemy import Column, Integer, String, Text
+from app.models.database import Base
+from app.models.dream import Timestamp
+
+class JobState(Base):
+    """Progress and schedule of one background job"""
+    __tablename__ = "job_states"
+
+    name = Column(String(100), primary_key=True)
+    cursor = Column(Integer)             # Last dream id processed by an unfinished sweep
+    next_run_at = Column(Timestamp)      # Local time the job is due next
+    last_started_at = Column(Timestamp)
+    last_finished_at = Column(Timestamp)
+    last_status = Column(String(20))     # "running", "ok" or "failed"
+    last_error = Column(Text)
+    last_processed = Column(Integer, nullable=False, default=0)  # Rows handled by the latest run
+    runs = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,40 @@
+"""
+Dream nudges for Dream Planner
+
+Short, dream-specific encouragement generated once a day by a background
+sweep, so showing them is an indexed lookup of the user's nudges for today.
+"""
+
+import enum
+from sqlalchemy import Column, Integer, String, Date, Enum, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.models.database import Base
+from app.models.dream import Timestamp
+
+class NudgeKind(str, enum.Enum):
+    """Why a nudge was generated"""
+    on_track = "on_track"            # Small reminder of the daily amount
+    behind_pace = "behind_pace"      # Progress trails the time elapsed
+    deadline_near = "deadline_near"  # Target date within 30 days
+    stretch = "stretch"              # Daily amount above the achievable limit
+    completed = "completed"          # Dream just got fully funded
+
+class DreamNudge(Base):
+    """One nudge for one dream on one day"""
+    __tablename__ = "dream_nudges"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    dream_id = Column(Integer, ForeignKey("dreams.id", ondelete="CASCADE"), nullable=False)
+    nudge_date = Column(Date, nullable=False)
+    kind = Column(Enum(NudgeKind), nullable=False)
+    message = Column(String(300), nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+
+    __table_args__ = (
+        # The read path: one user's nudges for a day
+        Index("ix_dream_nudges_user_date", user_id, nudge_date),
+        # One nudge per dream per day: re-running a sweep is harmless, and a later
+        # sweep's nudge (a dream completed mid-day) replaces the earlier one
+        Index("ux_dream_nudges_dream_date", dream_id, nudge_date, unique=True),
+    )
@@ -0,0 +1,52 @@
+"""
+Daily progress check-ins for Dream Planner
+
+A check-in records how much was put towards a dream on a given day - at
+most one per dream per day; checking in again replaces that day's amount.
+Alongside the events, dream_progress keeps each dream's running state:
+current and longest streak, first/last check-in day, totals, and a
+time-decayed sum of amounts that the savings-rate estimate is read from.
+The state is updated in the same transaction as each event, so streaks and
+projections are a single primary-key read however long the history.
+"""
+
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.models.database import Base
+from app.models.dream import Timestamp
+
+class ProgressEvent(Base):
+    """Amount saved towards one dream on one day"""
+    __tablename__ = "dream_progress_events"
+
+    dream_id = Column(Integer, ForeignKey("dreams.id", ondelete="CASCADE"), primary_key=True)
+    event_date = Column(Date, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    amount = Column(Float, nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+
+class DreamProgress(Base):
+    """Incrementally maintained streak and savings-rate state of one dream"""
+    __tablename__ = "dream_progress"
+
+    dream_id = Column(Integer, ForeignKey("dreams.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, nullable=False)
+
+    first_date = Column(Date)                  # Earliest check-in
+    last_date = Column(Date)                   # Latest check-in
+    current_streak = Column(Integer, nullable=False, default=0)  # Consecutive days ending at last_date
+    longest_streak = Column(Integer, nullable=False, default=0)
+    total_days = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+
+    # Savings-rate estimator: sum of amounts, each decayed by exp(-age / window), as of rate_date
+    rate_mass = Column(Float, nullable=False, default=0.0)
+    rate_date = Column(Date)
+
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+
+    # Streak overviews list a user's dreams
+    __table_args__ = (
+        Index("ix_dream_progress_user", user_id),
+    )
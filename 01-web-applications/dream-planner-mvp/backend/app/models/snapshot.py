@@ -0,0 +1,35 @@
+"""
+Dream progress snapshots for Dream Planner
+
+A dream row only knows its latest current_saved. Snapshots keep the
+history as a narrow table of pre-aggregated points: one row per dream per
+day, week and month, holding the opening, closing, lowest and highest
+saved amount in that period. Every savings change upserts all three, so a
+chart at any resolution is a primary-key range read.
+"""
+
+import enum
+from sqlalchemy import Column, Integer, Float, Date, Enum, ForeignKey
+from app.models.database import Base
+
+class SnapshotResolution(str, enum.Enum):
+    """Period length of a snapshot point"""
+    day = "day"
+    week = "week"    # Weeks start on Monday
+    month = "month"
+
+class DreamSnapshot(Base):
+    """Savings progress of one dream over one period"""
+    __tablename__ = "dream_snapshots"
+
+    # Primary key order is the chart query: one dream, one resolution, a date range
+    dream_id = Column(Integer, ForeignKey("dreams.id", ondelete="CASCADE"), primary_key=True)
+    resolution = Column(Enum(SnapshotResolution), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+
+    opening_saved = Column(Float, nullable=False)  # First recorded amount in the period
+    closing_saved = Column(Float, nullable=False)  # Latest recorded amount
+    low_saved = Column(Float, nullable=False)
+    high_saved = Column(Float, nullable=False)
+    target_amount = Column(Float, nullable=False)  # Target as of the latest update
+    updates = Column(Integer, nullable=False, default=1)
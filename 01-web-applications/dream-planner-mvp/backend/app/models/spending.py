@@ -0,0 +1,47 @@
+"""
+Spending aggregates for Dream Planner
+
+Spending is ingested straight into running aggregates instead of being
+kept row by row. spending_monthly holds, per user, category and month, the
+transaction count, total, mean, min/max and the sum of squared deviations
+(so variance is m2 / count), merged in place as new transactions arrive.
+spending_seasonal folds month totals by calendar month across years, which
+is what seasonal factors are computed from.
+
+Predictions and anomaly checks read at most a year of monthly rows and
+twelve seasonal rows per category - never the transaction history.
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Date, Index
+from app.models.database import Base
+
+class SpendingMonth(Base):
+    """Running statistics of one category's transactions in one month"""
+    __tablename__ = "spending_monthly"
+
+    user_id = Column(Integer, primary_key=True)
+    category = Column(String(50), primary_key=True)  # Lowercased
+    month = Column(Date, primary_key=True)           # First day of the month
+
+    count = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    mean = Column(Float, nullable=False)        # Mean transaction amount
+    m2 = Column(Float, nullable=False)          # Sum of squared deviations from the mean
+    min_amount = Column(Float, nullable=False)
+    max_amount = Column(Float, nullable=False)
+
+    # Predictions read one user's recent months across every category
+    __table_args__ = (
+        Index("ix_spending_monthly_user_month", user_id, month),
+    )
+
+class SpendingSeason(Base):
+    """One category's month totals folded by calendar month"""
+    __tablename__ = "spending_seasonal"
+
+    user_id = Column(Integer, primary_key=True)
+    category = Column(String(50), primary_key=True)
+    month_of_year = Column(Integer, primary_key=True)  # 1-12
+
+    total = Column(Float, nullable=False)   # Sum of that calendar month's totals over the years
+    months = Column(Integer, nullable=False)  # How many years contributed a month with spending
@@ -0,0 +1,79 @@
+"""
+Portable SQL building blocks for derived dream metrics
+
+Lets the Dream model express "days until target date" and compound growth
+as SQL, so filtering and sorting on derived metrics (and grouping reports by
+month) happens in the database instead of loading every row into Python. Each construct compiles to the
+right syntax for SQLite (local mode) and PostgreSQL.
+"""
+
+import math
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+class days_until(FunctionElement):
+    """Whole calendar days from today until a date/datetime column (negative if past)"""
+    type = Integer()
+    inherit_cache = True
+    name = "days_until"
+
+@compiles(days_until, "sqlite")
+def _days_until_sqlite(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    # 'localtime' matches date.today() used by the Python properties
+    return (
+        f"CAST(julianday(date({column})) - julianday(date('now', 'localtime')) AS INTEGER)"
+    )
+
+@compiles(days_until, "postgresql")
+def _days_until_postgresql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"(CAST({column} AS DATE) - CURRENT_DATE)"
+
+def dialect_insert(bind):
+    """insert() with ON CONFLICT support (on_conflict_do_nothing/do_update) for the bind's dialect"""
+    return postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+
+def _safe_power(base, exponent):
+    """power() for SQLite builds compiled without math functions"""
+    if base is None or exponent is None:
+        return None
+    try:
+        return math.pow(base, exponent)
+    except (OverflowError, ValueError):
+        return None
+
+def register_sqlite_functions(dbapi_connection):
+    """Install the SQL functions SQLite lacks on a fresh connection"""
+    dbapi_connection.create_function("power", 2, _safe_power, deterministic=True)
+
+class year_month(FunctionElement):
+    """'YYYY-MM' for a date/datetime column - a GROUP BY key for monthly activity"""
+    type = String()
+    inherit_cache = True
+    name = "year_month"
+
+@compiles(year_month, "sqlite")
+def _year_month_sqlite(element, compiler, **kw):
+    return f"strftime('%Y-%m', {compiler.process(element.clauses, **kw)})"
+
+@compiles(year_month, "postgresql")
+def _year_month_postgresql(element, compiler, **kw):
+    return f"to_char({compiler.process(element.clauses, **kw)}, 'YYYY-MM')"
+
+class round_cents(FunctionElement):
+    """A money expression rounded to cents, so balances compare exactly against cent amounts"""
+    type = Float()
+    inherit_cache = True
+    name = "round_cents"
+
+@compiles(round_cents, "sqlite")
+def _round_cents_sqlite(element, compiler, **kw):
+    return f"round({compiler.process(element.clauses, **kw)}, 2)"
+
+@compiles(round_cents, "postgresql")
+def _round_cents_postgresql(element, compiler, **kw):
+    # round(double precision, int) doesn't exist - round as numeric and come back
+    return f"CAST(round(CAST({compiler.process(element.clauses, **kw)} AS numeric), 2) AS double precision)"
@@ -0,0 +1,210 @@
+"""
+Pydantic schemas for bucket ledger endpoints
+
+Transactions move money into, out of, or between the Foundation, Dream
+and Life buckets; responses expose balances, history and statistics.
+"""
+
+from pydantic import BaseModel, Field, validator
+from datetime import datetime
+from typing import Optional, Dict, List
+from app.models.bucket import Bucket, TransactionType, ReasonCategory
+
+# Which legs each transaction type needs: (from_bucket, to_bucket).
+# None means either shape is fine as long as at least one bucket is given.
+TRANSACTION_LEGS = {
+    TransactionType.contribution: (False, True),
+    TransactionType.withdrawal: (True, False),
+    TransactionType.emergency: (True, False),
+    TransactionType.transfer: (True, True),
+    TransactionType.borrow: (True, True),
+    TransactionType.repay: (True, True),
+    TransactionType.adjustment: None,
+}
+
+class BucketTransactionCreate(BaseModel):
+    """Schema for recording a bucket transaction"""
+    type: TransactionType
+    amount: float = Field(..., gt=0, description="Amount moved (always positive)")
+    from_bucket: Optional[Bucket] = Field(None, description="Bucket the money leaves")
+    to_bucket: Optional[Bucket] = Field(None, description="Bucket the money enters")
+    reason: str = Field(..., min_length=1, max_length=500, description="Why the money moved")
+    category: ReasonCategory = Field(default=ReasonCategory.other)
+    notes: Optional[str] = Field(None, max_length=1000)
+
+    @validator('amount')
+    def validate_amount(cls, v):
+        """Ensure the amount is reasonable"""
+        if v > 10_000_000:
+            raise ValueError('Amount too large for this demo')
+        return round(v, 2)  # Round to cents
+
+    @validator('reason')
+    def validate_reason(cls, v):
+        if not v.strip():
+            raise ValueError('Reason is required')
+        return v.strip()
+
+    @validator('to_bucket', always=True)
+    def validate_buckets(cls, v, values):
+        """Ensure the buckets fit the transaction type"""
+        from_bucket = values.get('from_bucket')
+        transaction_type = values.get('type')
+        if from_bucket is None and v is None:
+            raise ValueError('At least one of from_bucket and to_bucket is required')
+        if from_bucket is not None and from_bucket == v:
+            raise ValueError('from_bucket and to_bucket must differ')
+        legs = TRANSACTION_LEGS.get(transaction_type)
+        if legs is not None:
+            needs_from, needs_to = legs
+            if needs_from != (from_bucket is not None) or needs_to != (v is not None):
+                shape = " and ".join(
+                    name for name, needed in (("from_bucket", needs_from), ("to_bucket", needs_to)) if needed
+                )
+                raise ValueError(f'A {transaction_type.value} takes exactly {shape}')
+        return v
+
+class BucketTransactionResponse(BaseModel):
+    """Schema for a recorded transaction"""
+    id: int
+    type: TransactionType
+    amount: float
+    from_bucket: Optional[Bucket] = None
+    to_bucket: Optional[Bucket] = None
+    reason: str
+    category: ReasonCategory
+    notes: Optional[str] = None
+    created_at: datetime
+    balances_after: Dict[str, float] = Field(description="Balances of the buckets this transaction touched")
+
+    class Config:
+        from_attributes = True
+
+class BucketBalanceResponse(BaseModel):
+    """Materialized balance of one bucket"""
+    bucket: Bucket
+    balance: float
+    total_in: float
+    total_out: float
+    entry_count: int
+    updated_at: Optional[datetime] = None
+
+class BucketBalancesResponse(BaseModel):
+    """Current balances of all three buckets"""
+    balances: List[BucketBalanceResponse]
+    total: float
+
+class BucketHistoryEntry(BaseModel):
+    """One bucket's side of a transaction"""
+    entry_id: int
+    transaction_id: int
+    type: TransactionType
+    category: ReasonCategory
+    reason: str
+    amount: float = Field(description="Signed: negative when money left the bucket")
+    balance_after: float
+    counterparty: Optional[Bucket] = Field(None, description="The other bucket in a transfer, if any")
+    created_at: datetime
+
+class TransactionGroup(BaseModel):
+    """Count and total of a group of transactions"""
+    count: int
+    amount: float
+
+class BucketActivity(BaseModel):
+    """Money in and out of one bucket"""
+    inflow: float
+    outflow: float
+    transactions: int
+
+class BucketStatistics(BaseModel):
+    """Transaction statistics for a time range"""
+    total_transactions: int
+    by_type: Dict[str, TransactionGroup]
+    by_category: Dict[str, TransactionGroup]
+    monthly_activity: Dict[str, int] = Field(description="Transactions per YYYY-MM")
+    bucket_activity: Dict[str, BucketActivity]
+    current_balances: Dict[str, float]
+
+# Most dreams an optimization request can name explicitly
+MAX_OPTIMIZE_DREAMS = 500
+
+class AllocationRequest(BaseModel):
+    """Schema for a bucket allocation sweep"""
+    available_monthly: float = Field(..., gt=0, le=10_000_000, description="Money to split each month")
+    monthly_expenses: float = Field(default=0.0, ge=0, description="Essential monthly spending the emergency fund covers")
+    emergency_fund_months: float = Field(default=4.0, ge=0, le=24, description="Months of expenses the Life bucket should hold")
+    horizon_years: int = Field(default=30, ge=1, le=60, description="Years the Foundation bucket grows for")
+    foundation_return: float = Field(default=0.07, ge=-0.5, le=0.5, description="Expected annual return on Foundation")
+    step: float = Field(default=0.05, ge=0.01, le=0.25, description="Grid resolution as a share (0.01 = 1% steps)")
+    min_shares: Dict[Bucket, float] = Field(default_factory=dict, description="Lowest share allowed per bucket")
+    max_shares: Dict[Bucket, float] = Field(default_factory=dict, description="Highest share allowed per bucket")
+    dream_ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_OPTIMIZE_DREAMS, description="Active dreams to score (defaults to all of them); an unknown id is a 404")
+
+    @validator('step')
+    def validate_step(cls, v):
+        """The grid has to land exactly on 100%"""
+        units = 1.0 / v
+        if abs(units - round(units)) > 1e-6:
+            raise ValueError('step must divide 1 evenly (e.g. 0.01, 0.02, 0.05, 0.1)')
+        return 1.0 / round(units)
+
+    @validator('min_shares', 'max_shares')
+    def validate_shares(cls, v):
+        for bucket, share in v.items():
+            if not 0 <= share <= 1:
+                raise ValueError(f'{bucket.value} share must be between 0 and 1')
+        return v
+
+    @validator('max_shares', always=True)
+    def validate_bounds(cls, v, values):
+        """Ensure at least one split can satisfy the bounds"""
+        min_shares = values.get('min_shares') or {}
+        for bucket in Bucket:
+            if min_shares.get(bucket, 0.0) > v.get(bucket, 1.0):
+                raise ValueError(f'{bucket.value} minimum share is above its maximum')
+        if sum(min_shares.values()) > 1 + 1e-9:
+            raise ValueError('Minimum shares add up to more than 100%')
+        if sum(v.get(bucket, 1.0) for bucket in Bucket) < 1 - 1e-9:
+            raise ValueError('Maximum shares add up to less than 100%')
+        return v
+
+class AllocationPoint(BaseModel):
+    """One split and how it scores"""
+    foundation_share: float
+    dream_share: float
+    life_share: float
+    foundation_monthly: float
+    dream_monthly: float
+    life_monthly: float
+    foundation_value: float = Field(description="Foundation balance at the end of the horizon")
+    months_late: Optional[float] = Field(None, description="Months past target dates, summed over dreams (null: some dream is never funded)")
+    dreams_on_time: int
+    months_to_all_dreams: Optional[float] = Field(None, description="Months until every dream is funded (null: never)")
+    emergency_months: Optional[float] = Field(None, description="Months until the emergency fund is full (null: never)")
+
+class StrategyPoint(AllocationPoint):
+    """A client-side strategy scored against the same grid"""
+    strategy: str
+    on_front: bool = Field(description="False when some split on the front beats it on every objective")
+
+class DreamTimeline(BaseModel):
+    """How one dream fares under the recommended split"""
+    dream_id: int
+    title: str
+    monthly_contribution: float
+    months_to_goal: Optional[float] = None
+    months_available: float
+    on_time: bool
+
+class AllocationResponse(BaseModel):
+    """Pareto front of bucket splits for the user's dreams"""
+    available_monthly: float
+    splits_evaluated: int
+    dreams_scored: int
+    dreams_skipped: int = Field(description="Active dreams left out: already funded or past their target date")
+    parallel_jobs: int = Field(description="Compute pool jobs the sweep was split into (0: scored inline)")
+    front: List[AllocationPoint] = Field(description="Non-dominated splits, highest Foundation share first")
+    recommended: AllocationPoint
+    recommended_dreams: List[DreamTimeline]
+    strategies: List[StrategyPoint]
@@ -5,10 +5,36 @@ These schemas handle request/response validation and serialization.
 They ensure type safety and generate OpenAPI documentation.
 """
 
+import enum
+import numpy as np
 from pydantic import BaseModel, Field, validator
-from datetime import datetime
-from typing import Optional, Dict
+from datetime import datetime, date
+from typing import Optional, Dict, List
 from app.models.dream import DreamStatus, DreamCategory
+from app.models.snapshot import SnapshotResolution
+from app.services.calculations import MAX_BATCH_ROWS
+from app.services.progress import ProgressStatus
+
+class DreamSort(str, enum.Enum):
+    """Sort keys for dream lists - all evaluated in the database"""
+    created = "created"            # Newest first
+    target_date = "target_date"    # Soonest first
+    target_amount = "target_amount"  # Smallest first
+    daily_amount = "daily_amount"  # Easiest first
+    progress = "progress"          # Furthest along first
+
+class SortOrder(str, enum.Enum):
+    """Sort direction (each sort key has a natural default)"""
+    asc = "asc"
+    desc = "desc"
+
+class TransferFormat(str, enum.Enum):
+    """File formats for bulk import/export"""
+    ndjson = "ndjson"  # One JSON object per line
+    csv = "csv"        # Header row, then one dream per row
+
+# Largest amount a dream can have ($10M limit for MVP)
+MAX_DREAM_AMOUNT = 10_000_000
 
 class DreamBase(BaseModel):
     """Base schema with common dream fields"""
@@ -24,7 +50,7 @@ class DreamBase(BaseModel):
         """Ensure target amount is reasonable"""
         if v <= 0:
             raise ValueError('Target amount must be positive')
-        if v > 10_000_000:  # $10M limit for MVP
+        if v > MAX_DREAM_AMOUNT:
             raise ValueError('Target amount too large for this demo')
         return round(v, 2)  # Round to cents
     
@@ -39,6 +65,27 @@ class DreamCreate(DreamBase):
     """Schema for creating a new dream"""
     pass
 
+class DreamImport(DreamCreate):
+    """Schema for one row of a bulk import - a new dream plus existing progress"""
+    current_saved: float = Field(default=0.0, ge=0, description="Amount already saved")
+    status: DreamStatus = Field(default=DreamStatus.active)
+
+    @validator('target_date')
+    def validate_target_date(cls, v):
+        """Any date: an export holds completed and archived dreams and ones past their date"""
+        return v
+
+class ImportRowError(BaseModel):
+    """A row that failed validation during import"""
+    line: int = Field(description="1-based line number in the upload (data rows for CSV start at 2)")
+    error: str
+
+class ImportSummary(BaseModel):
+    """Result of a bulk import"""
+    imported: int
+    failed: int
+    errors: List[ImportRowError] = Field(description="First failures, capped to keep the response small")
+
 class DreamUpdate(BaseModel):
     """Schema for updating an existing dream"""
     title: Optional[str] = Field(None, min_length=1, max_length=200)
@@ -109,6 +156,7 @@ class CalculationRequest(BaseModel):
     target_amount: float = Field(..., gt=0, description="Target amount")
     target_date: datetime = Field(..., description="Target date")
     current_saved: float = Field(default=0.0, ge=0, description="Amount already saved")
+    annual_rate: Optional[float] = Field(None, ge=0, le=0.25, description="Annual interest on savings (defaults to the app-wide rate)")
 
 class CalculationResponse(BaseModel):
     """Schema for calculation responses"""
@@ -124,3 +172,96 @@ class CalculationResponse(BaseModel):
     motivation: str
     is_achievable: bool
 
+
+class BatchCalculationRequest(BaseModel):
+    """
+    Schema for batch calculation requests.
+    
+    Columnar on purpose: one list per field instead of one object per row,
+    so thousands of goals validate and compute as arrays.
+    """
+    target_amount: List[float] = Field(..., min_length=1, max_length=MAX_BATCH_ROWS, description="Target amounts")
+    target_date: List[datetime] = Field(..., min_length=1, max_length=MAX_BATCH_ROWS, description="Target dates, one per amount")
+    current_saved: Optional[List[float]] = Field(None, max_length=MAX_BATCH_ROWS, description="Amounts already saved (default 0)")
+    annual_rate: Optional[float] = Field(None, ge=0, le=0.25, description="Annual interest on savings (defaults to the app-wide rate)")
+
+    @validator('target_amount')
+    def validate_target_amounts(cls, v):
+        """Same bounds as a single dream; the JSON parser lets Infinity and NaN through"""
+        amounts = np.asarray(v, dtype=np.float64)
+        if not np.isfinite(amounts).all():
+            raise ValueError('Target amounts must be finite numbers')
+        if (amounts <= 0).any():
+            raise ValueError('Target amounts must be positive')
+        if (amounts > MAX_DREAM_AMOUNT).any():
+            raise ValueError('Target amount too large for this demo')
+        return v
+
+    @validator('target_date')
+    def validate_target_dates(cls, v, values):
+        if 'target_amount' in values and len(v) != len(values['target_amount']):
+            raise ValueError('target_date must have one entry per target_amount')
+        return v
+
+    @validator('current_saved')
+    def validate_current_saved(cls, v, values):
+        if v is None:
+            return v
+        if 'target_amount' in values and len(v) != len(values['target_amount']):
+            raise ValueError('current_saved must have one entry per target_amount')
+        amounts = np.asarray(v, dtype=np.float64)
+        if not np.isfinite(amounts).all():
+            raise ValueError('Current saved amounts must be finite numbers')
+        if (amounts < 0).any():
+            raise ValueError('Current saved amounts cannot be negative')
+        if (amounts > MAX_DREAM_AMOUNT).any():
+            raise ValueError('Current saved amount too large for this demo')
+        return v
+
+class ProgressPoint(BaseModel):
+    """Savings progress over one chart period"""
+    period_start: date
+    saved: float = Field(description="Amount saved at the end of the period")
+    low: float
+    high: float
+    target_amount: float
+    progress_percentage: float
+
+class DreamProgressResponse(BaseModel):
+    """Progress chart series for a dream"""
+    dream_id: int
+    resolution: SnapshotResolution
+    points: List[ProgressPoint] = Field(description="Oldest first; periods without changes are omitted (the amount carries forward)")
+
+class ProgressCheckIn(BaseModel):
+    """Amount put towards a dream on one day (replaces that day's earlier check-in)"""
+    amount: float = Field(..., gt=0, le=10_000_000)
+
+class ProgressStreak(BaseModel):
+    """Check-in streak of a dream"""
+    current_streak: int = Field(description="Consecutive check-in days; kept until a whole day is missed")
+    longest_streak: int
+    last_progress_date: Optional[date] = None
+    is_active_today: bool
+    total_progress_days: int
+    average_amount: float = Field(description="Average amount per check-in day")
+
+class ProgressSummary(BaseModel):
+    """Streak, savings pace and projected completion of a dream"""
+    dream_id: int
+    status: ProgressStatus
+    current_saved: float
+    amount_remaining: float
+    progress_percentage: float
+    days_remaining: int
+    required_daily_rate: float = Field(description="Daily saving needed to finish by the target date")
+    actual_daily_rate: float = Field(description="Recent daily saving, estimated from check-ins")
+    projected_completion_date: Optional[date] = Field(None, description="Finish date at the current pace (null: no pace yet, or further than 100 years out)")
+    days_ahead_behind: int = Field(description="Days the projection beats the target date by (negative: late)")
+    streak: ProgressStreak
+
+class ProgressCheckInResponse(ProgressSummary):
+    """A recorded check-in and the dream's summary after it"""
+    event_date: date
+    amount: float
+    previous_amount: Optional[float] = Field(None, description="That day's amount before this check-in")
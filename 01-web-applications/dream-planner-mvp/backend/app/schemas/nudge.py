@@ -0,0 +1,18 @@
+"""
+Pydantic schemas for nudge endpoints
+"""
+
+from pydantic import BaseModel
+from datetime import date
+from app.models.nudge import NudgeKind
+
+class NudgeResponse(BaseModel):
+    """A nudge generated for one of the user's dreams"""
+    id: int
+    dream_id: int
+    nudge_date: date
+    kind: NudgeKind
+    message: str
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,128 @@
+"""
+Pydantic schemas for someday life projection endpoints
+
+Requests describe the household's finances and the someday goal; responses
+carry the success rate, scenario paths and chart-ready percentile bands.
+Stored projections take small what-if updates instead of a new request.
+"""
+
+import enum
+from pydantic import BaseModel, Field, validator
+from typing import Optional, Dict, List
+from app.services.projection import (
+    DEFAULT_SIMULATIONS,
+    MAX_SIMULATIONS,
+    MAX_YEARS,
+    DEFAULT_MAX_POINTS
+)
+
+class AssetAllocation(BaseModel):
+    """Portfolio split in percent"""
+    stocks: float = Field(default=70, ge=0, le=100)
+    bonds: float = Field(default=20, ge=0, le=100)
+    cash: float = Field(default=10, ge=0, le=100)
+
+    @validator("cash")
+    def allocation_adds_up(cls, v, values):
+        """Ensure the split covers the whole portfolio"""
+        total = v + values.get("stocks", 0) + values.get("bonds", 0)
+        if abs(total - 100) > 0.01:
+            raise ValueError("Asset allocation must add up to 100")
+        return v
+
+class FinancialProfile(BaseModel):
+    """Household finances the projection starts from"""
+    current_assets: float = Field(ge=0, description="Invested savings today")
+    monthly_income: float = Field(ge=0, description="Take-home income per month")
+    monthly_expenses: float = Field(ge=0, description="Spending per month")
+    asset_allocation: AssetAllocation = Field(default_factory=AssetAllocation)
+
+class SomedayGoals(BaseModel):
+    """What the someday life costs and when it should start"""
+    total_required: float = Field(gt=0, description="Assets needed for the someday life")
+    years_to_someday: int = Field(default=30, ge=1, le=MAX_YEARS)
+
+class ProjectionOptions(BaseModel):
+    """Knobs for the Monte Carlo run"""
+    simulations: int = Field(default=DEFAULT_SIMULATIONS, ge=100, le=MAX_SIMULATIONS, description="Number of simulated futures")
+    years_to_project: Optional[int] = Field(None, ge=1, le=MAX_YEARS, description="Defaults to years_to_someday")
+    include_life_events: bool = Field(default=True, description="Apply job loss, promotions and big expenses")
+    seed: Optional[int] = Field(None, ge=0, le=2**32 - 1, description="Random seed (defaults to one derived from the inputs)")
+    max_points: int = Field(default=DEFAULT_MAX_POINTS, ge=2, le=MAX_YEARS, description="Maximum points per chart series")
+
+class ProjectionRequest(BaseModel):
+    """Schema for someday projection requests"""
+    profile: FinancialProfile
+    goals: SomedayGoals
+    options: ProjectionOptions = Field(default_factory=ProjectionOptions)
+
+class ProjectionScenario(BaseModel):
+    """One representative future - the simulation ranked at `percentile`"""
+    percentile: int
+    final_assets: float
+    years_to_goal: int
+    total_contributions: float
+    investment_growth: float
+    path: List[float] = Field(description="Assets at each fan_chart year")
+
+class FanChart(BaseModel):
+    """Percentile bands of assets over time"""
+    years: List[int]
+    bands: Dict[str, List[float]]
+
+class ProjectionResponse(BaseModel):
+    """Schema for someday projection results"""
+    simulations: int
+    years_projected: int
+    seed: int = Field(description="Seed used - send it back to reproduce this result")
+    target_amount: float
+    current_amount: float
+    success_rate: float = Field(description="Percentage of simulations reaching the goal")
+    confidence_level: Dict[str, str]
+    final_asset_percentiles: Dict[str, float]
+    averages: Dict[str, float]
+    average_shortfall: float
+    risk_factors: List[str]
+    scenarios: Dict[str, ProjectionScenario]
+    fan_chart: FanChart
+    visualization: dict = Field(description="Chart data in the shape generateVisualizationData produces")
+    cached: bool = Field(default=False, description="Served from the projection cache")
+
+class StoredProjectionResponse(ProjectionResponse):
+    """A stored projection that accepts incremental updates"""
+    projection_id: str
+    version: int = Field(description="Bumped on every update")
+    recomputed_from_year: Optional[int] = Field(None, description="First year recomputed by the last update")
+    compute_ms: Optional[float] = Field(None, description="Time spent applying the last update")
+
+class LifeEventType(str, enum.Enum):
+    """Life events a what-if update can apply (see LIFE_EVENT_IMPACTS)"""
+    marriage = "marriage"
+    first_child = "first_child"
+    second_child = "second_child"
+    job_promotion = "job_promotion"
+    job_loss = "job_loss"
+    home_upgrade = "home_upgrade"
+    parent_care = "parent_care"
+
+class ActualReturn(BaseModel):
+    """The return the portfolio actually made in one projection year"""
+    year: int = Field(ge=1, le=MAX_YEARS)
+    rate: float = Field(ge=-0.5, le=0.5)
+
+class InflationChange(BaseModel):
+    """A new inflation outlook from a given year on"""
+    rate: float = Field(ge=-0.02, le=0.2)
+    from_year: int = Field(default=1, ge=1, le=MAX_YEARS)
+
+class LifeEventChange(BaseModel):
+    """A life event happening `month` months from now"""
+    event: LifeEventType
+    month: int = Field(ge=0, lt=MAX_YEARS * 12)
+
+class ProjectionUpdate(BaseModel):
+    """Schema for what-if updates - every field is optional, all given changes apply together"""
+    actual_return: Optional[ActualReturn] = None
+    inflation: Optional[InflationChange] = None
+    life_event: Optional[LifeEventChange] = None
+    total_required: Optional[float] = Field(None, gt=0)
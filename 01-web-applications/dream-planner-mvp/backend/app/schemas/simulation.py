@@ -0,0 +1,35 @@
+"""
+Pydantic schemas for dream simulation endpoints
+
+Requests tune the Monte Carlo run; responses summarize thousands of
+scenarios as a success rate and a handful of percentiles.
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, Dict
+from app.services.simulation import DEFAULT_SCENARIOS, MAX_SCENARIOS
+
+class SimulationRequest(BaseModel):
+    """Schema for Monte Carlo simulation requests"""
+    scenarios: int = Field(default=DEFAULT_SCENARIOS, ge=100, le=MAX_SCENARIOS, description="Number of simulated futures")
+    seed: Optional[int] = Field(None, ge=0, le=2**32 - 1, description="Random seed for a reproducible result")
+    monthly_contribution: Optional[float] = Field(None, ge=0, description="Planned monthly savings (defaults to the dream's monthly amount)")
+    expected_annual_return: float = Field(default=0.05, ge=-0.5, le=0.5, description="Mean annual return on savings")
+    annual_volatility: float = Field(default=0.10, ge=0, le=1, description="Annual standard deviation of returns")
+    include_life_events: bool = Field(default=True, description="Apply unexpected expenses, job loss and windfalls")
+
+class SimulationResponse(BaseModel):
+    """Schema for Monte Carlo simulation results"""
+    dream_id: int
+    target_amount: float
+    current_saved: float
+    scenarios: int
+    seed: int = Field(description="Seed used - send it back to reproduce this result")
+    months: int = Field(description="Months simulated until the target date")
+    monthly_contribution: float
+    success_rate: float = Field(description="Percentage of scenarios reaching the target")
+    final_balance_percentiles: Dict[str, float]
+    shortfall_percentiles: Dict[str, float] = Field(description="How far short the missed scenarios land")
+    surplus_percentiles: Dict[str, float] = Field(description="How far ahead the successful scenarios land")
+    average_shortfall: float
+    average_surplus: float
@@ -0,0 +1,86 @@
+"""
+Pydantic schemas for spending intelligence endpoints
+"""
+
+import enum
+from pydantic import BaseModel, Field, validator
+from datetime import date
+from typing import Dict, List, Optional
+
+# Largest batch of transactions accepted in one request
+MAX_INGEST_ROWS = 10_000
+
+class Sensitivity(str, enum.Enum):
+    """How readily spending changes are flagged"""
+    low = "low"        # Flag 50%+ changes
+    medium = "medium"  # Flag 30%+ changes
+    high = "high"      # Flag 20%+ changes
+
+class SpendingTransaction(BaseModel):
+    """One purchase"""
+    category: str = Field(..., min_length=1, max_length=50, description="Spending category, e.g. groceries")
+    amount: float = Field(..., gt=0, description="Amount spent")
+    date: date
+
+    @validator('category')
+    def normalize_category(cls, v):
+        """Categories are case-insensitive"""
+        v = v.strip().lower()
+        if not v:
+            raise ValueError('Category is required')
+        return v
+
+    @validator('amount')
+    def validate_amount(cls, v):
+        if v > 1_000_000:
+            raise ValueError('Amount too large for this demo')
+        return round(v, 2)
+
+class SpendingIngest(BaseModel):
+    """A batch of purchases to fold into the spending aggregates"""
+    transactions: List[SpendingTransaction] = Field(..., min_length=1, max_length=MAX_INGEST_ROWS)
+
+class IngestSummary(BaseModel):
+    """What an ingest touched"""
+    ingested: int
+    categories: int
+    months: int = Field(description="Category-months updated")
+
+class CategoryPrediction(BaseModel):
+    """Expected spending in a category this month"""
+    category: str
+    predicted_amount: float
+    confidence: str = Field(description="high, medium or low - from how steady recent months were")
+    trend: str = Field(description="increasing, decreasing or stable")
+    seasonal_factor: float
+    seasonal_learned: bool = Field(description="Factor learned from a year of your own history rather than a default pattern")
+    historical_average: float = Field(description="Average month over the last year")
+    data_points: int = Field(description="Months with spending in the last year")
+    average_transaction: float
+    transaction_stddev: float
+    insight: str
+
+class SpendingPredictions(BaseModel):
+    """Predictions for every category with recent spending"""
+    month: date
+    predictions: List[CategoryPrediction]
+    total_predicted: float
+    summary: str
+
+class CategoryAnomaly(BaseModel):
+    """This month's spending in a category against its usual level"""
+    category: str
+    is_anomaly: bool
+    severity: str = Field(description="none, minor, major or new_category")
+    message: str
+    recommendation: Optional[str] = None
+    current_spend: float = Field(description="Spent so far this month")
+    expected_spend: float = Field(description="Typical spending by this point in the month")
+    percentage_change: Optional[float] = None
+    threshold: Dict[str, float]
+
+class SpendingAnomalies(BaseModel):
+    """Anomaly checks for the current month"""
+    month: date
+    sensitivity: Sensitivity
+    anomalies: List[CategoryAnomaly]
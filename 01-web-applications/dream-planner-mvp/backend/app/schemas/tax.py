@@ -0,0 +1,85 @@
+"""
+Pydantic schemas for tax endpoints
+
+Rates for many incomes at once, and the dreams x savings vehicles
+comparison that the tax screen renders from a single request.
+"""
+
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+from app.services.tax import DEFAULT_ANNUAL_RETURN, DEFAULT_VEHICLES, FilingStatus, SavingsVehicle, resolve_state
+
+# Most incomes priced in one rates request
+MAX_RATE_INCOMES = 1_000
+
+# Most dreams an explicit comparison can name
+MAX_COMPARE_DREAMS = 500
+
+class TaxRateRow(BaseModel):
+    """Tax on one gross income"""
+    gross_income: float
+    taxable_income: float
+    federal_tax: float
+    state_tax: float
+    total_tax: float
+    effective_rate: float
+    marginal_rate: float = Field(description="Federal plus state rate on the next dollar")
+
+class TaxRatesResponse(BaseModel):
+    """Tax on each requested income"""
+    state: str
+    filing_status: FilingStatus
+    deductions: float
+    rates: List[TaxRateRow]
+
+class VehicleComparisonRequest(BaseModel):
+    """Schema for comparing savings vehicles across the user's dreams"""
+    gross_income: float = Field(default=75_000, ge=0, le=100_000_000, description="Annual gross income")
+    state: str = Field(default="California", description="State of residence (full name)")
+    filing_status: FilingStatus = Field(default=FilingStatus.single)
+    age: int = Field(default=35, ge=16, le=100)
+    deductions: Optional[float] = Field(None, ge=0, description="Total deductions (defaults to the standard deduction)")
+    vehicles: List[SavingsVehicle] = Field(default_factory=lambda: list(DEFAULT_VEHICLES), min_length=1, description="Vehicles to compare")
+    annual_return: float = Field(default=DEFAULT_ANNUAL_RETURN, ge=-0.5, le=0.5, description="Expected annual return inside the vehicles")
+    dream_ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_COMPARE_DREAMS, description="Dreams to compare (defaults to all active dreams)")
+
+    @validator('state')
+    def validate_state(cls, v):
+        state = resolve_state(v)
+        if state is None:
+            raise ValueError(f'Unknown state: {v}')
+        return state
+
+    @validator('vehicles')
+    def unique_vehicles(cls, v):
+        return list(dict.fromkeys(v))  # Keep the caller's order, drop repeats
+
+class VehicleOption(BaseModel):
+    """What a dream costs through one vehicle"""
+    vehicle: SavingsVehicle
+    monthly_income: float = Field(description="Pre-tax income set aside per month")
+    monthly_contribution: float = Field(description="Amount going into the account per month")
+    taxes_paid: float = Field(description="Income tax on contributions plus tax on withdrawal")
+    within_limit: bool = Field(description="Annual contributions fit the vehicle's limit")
+
+class DreamTaxComparison(BaseModel):
+    """One dream across every compared vehicle"""
+    dream_id: int
+    title: str
+    amount_needed: float = Field(description="After-tax amount still to save")
+    years: float
+    is_retirement_goal: bool
+    applicable_rate: float = Field(description="Tax rate on income earned for this goal")
+    gross_needed: float = Field(description="Pre-tax income needed without any tax-advantaged account")
+    best_vehicle: Optional[SavingsVehicle] = Field(None, description="Cheapest vehicle whose limit fits (null: none fits)")
+    options: List[VehicleOption]
+
+class VehicleComparisonResponse(BaseModel):
+    """Every dream x every vehicle, computed in one pass"""
+    state: str
+    filing_status: FilingStatus
+    effective_rate: float
+    marginal_rate: float
+    retirement_effective_rate: float
+    dreams_skipped: int = Field(description="Active dreams left out: already funded or past their target date")
+    dreams: List[DreamTaxComparison]
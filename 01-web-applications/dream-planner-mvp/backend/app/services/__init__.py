@@ -0,0 +1 @@
+# Calculation services for Dream Planner
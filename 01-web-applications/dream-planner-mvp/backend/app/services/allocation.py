@@ -0,0 +1,244 @@
+"""
+Bucket allocation optimizer
+
+Scores every split of the monthly savings between Foundation, Dream and
+Life on a grid (5% steps by default, down to 1%) in one vectorized pass and
+returns the Pareto front: the splits where no other split does at least as
+well on every objective and strictly better on one.
+
+Objectives, all computed per split:
+- foundation_value: the Foundation balance after the horizon at the
+  Foundation return (higher is better)
+- months_late: months past their target dates summed over the user's dreams
+  (lower is better). The Dream share is divided between dreams in
+  proportion to each dream's required monthly amount, so a Dream share
+  covering all of them finishes every dream on time.
+- emergency_months: months until the Life bucket covers the emergency fund
+  target (lower is better)
+
+Scoring is a (splits x dreams) array expression, chunked so memory stays
+flat. Large sweeps are split into pieces that run on the compute pool in
+parallel; each piece returns its own front and the fronts are merged, which
+gives the same answer because a globally non-dominated split is
+non-dominated within its piece.
+"""
+
+import bisect
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+from app.services.finance import periods_to_goal
+
+# Bucket order of every shares array: (foundation, dream, life)
+BUCKETS = ("foundation", "dream", "life")
+
+# The client-side strategies (frontend bucketAllocator.js), scored alongside the grid
+STRATEGY_SPLITS = {
+    "conservative": (0.60, 0.25, 0.15),
+    "balanced": (0.50, 0.35, 0.15),
+    "aggressive": (0.40, 0.45, 0.15),
+}
+
+# Upper bound on (splits x dreams) cells scored at once
+CHUNK_CELLS = 2_000_000
+
+# Fewest splits worth sending to a pool worker as one piece
+MIN_CHUNK_SPLITS = 256
+
+# Slack for float noise when checking a dream finishes by its target date
+ON_TIME_TOLERANCE = 1e-6
+
+class AllocationPlan(NamedTuple):
+    """Everything a split is scored against - plain data so it pickles to the compute pool"""
+    available_monthly: float
+    targets: np.ndarray          # Per dream
+    saved: np.ndarray            # Per dream
+    deadline_months: np.ndarray  # Per dream: days remaining / 30
+    weights: np.ndarray          # Per dream share of the Dream bucket (sums to 1, or all zero)
+    savings_rate: float          # Annual rate the dream savings earn
+    foundation_balance: float
+    foundation_return: float     # Annual
+    horizon_months: int
+    emergency_gap: float         # Emergency fund target minus the current Life balance
+
+class SplitScores(NamedTuple):
+    """Per-split results, aligned with the shares array they were computed for"""
+    shares: np.ndarray            # (n, 3)
+    foundation_value: np.ndarray
+    months_late: np.ndarray
+    emergency_months: np.ndarray  # inf when the Life share never closes the gap
+    dreams_on_time: np.ndarray
+    last_dream_months: np.ndarray  # Months until every dream is funded (inf if never)
+
+    def objectives(self) -> np.ndarray:
+        """(n, 3) array where lower is better on every column"""
+        return np.column_stack((-self.foundation_value, self.months_late, self.emergency_months))
+
+    def take(self, index) -> "SplitScores":
+        return SplitScores(*(field[index] for field in self))
+
+    @classmethod
+    def concat(cls, parts) -> "SplitScores":
+        return cls(*(np.concatenate(fields) for fields in zip(*parts)))
+
+def build_plan(
+    available_monthly: float,
+    dreams: list,
+    savings_rate: float,
+    foundation_balance: float,
+    foundation_return: float,
+    horizon_years: int,
+    emergency_gap: float,
+) -> AllocationPlan:
+    """
+    Assemble a plan from (target, saved, days remaining, required monthly
+    amount) per dream. The Dream bucket is shared in proportion to the
+    required monthly amounts.
+    """
+    if dreams:
+        targets, saved, days, required = (np.array(column, dtype=np.float64) for column in zip(*dreams))
+    else:
+        targets = saved = days = required = np.zeros(0)
+    total_required = required.sum()
+    weights = required / total_required if total_required > 0 else np.zeros_like(required)
+    return AllocationPlan(
+        available_monthly=float(available_monthly),
+        targets=targets,
+        saved=saved,
+        deadline_months=days / 30,  # 30-day months, matching monthly_amount
+        weights=weights,
+        savings_rate=float(savings_rate),
+        foundation_balance=float(foundation_balance),
+        foundation_return=float(foundation_return),
+        horizon_months=int(horizon_years) * 12,
+        emergency_gap=max(0.0, float(emergency_gap)),
+    )
+
+def split_grid(step: float, min_shares: Dict[str, float], max_shares: Dict[str, float]) -> np.ndarray:
+    """
+    Every (foundation, dream, life) split in multiples of `step` that sums to 1
+    and respects the per-bucket bounds.
+
+    Returns:
+        (n, 3) array of shares
+    """
+    units = int(round(1.0 / step))
+    foundation, dream = np.meshgrid(np.arange(units + 1), np.arange(units + 1), indexing="ij")
+    keep = foundation + dream <= units
+    foundation, dream = foundation[keep], dream[keep]
+    shares = np.column_stack((foundation, dream, units - foundation - dream)) / units
+
+    allowed = np.ones(len(shares), dtype=bool)
+    for column, bucket in enumerate(BUCKETS):
+        allowed &= shares[:, column] >= min_shares.get(bucket, 0.0) - 1e-9
+        allowed &= shares[:, column] <= max_shares.get(bucket, 1.0) + 1e-9
+    return shares[allowed]
+
+def score_splits(shares: np.ndarray, plan: AllocationPlan) -> SplitScores:
+    """Score splits against the plan, chunked over splits"""
+    monthly = shares * plan.available_monthly
+
+    # Foundation: current balance plus contributions compounded over the horizon
+    growth_rate = plan.foundation_return / 12
+    if growth_rate == 0:
+        foundation_value = plan.foundation_balance + monthly[:, 0] * plan.horizon_months
+    else:
+        growth = (1.0 + growth_rate) ** plan.horizon_months
+        foundation_value = plan.foundation_balance * growth + monthly[:, 0] * (growth - 1.0) / growth_rate
+
+    # Life: months to close the emergency fund gap
+    # (0/0 included: no Life money and no gap is masked out by the where)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emergency_months = np.where(plan.emergency_gap > 0, plan.emergency_gap / monthly[:, 2], 0.0)
+
+    # Dreams: time to goal per (split, dream), a chunk of splits at a time
+    count = len(shares)
+    months_late = np.zeros(count)
+    dreams_on_time = np.zeros(count, dtype=np.int64)
+    last_dream_months = np.zeros(count)
+    dream_count = len(plan.targets)
+    if dream_count:
+        rows = max(1, CHUNK_CELLS // dream_count)
+        for start in range(0, count, rows):
+            stop = min(start + rows, count)
+            contribution = monthly[start:stop, 1, None] * plan.weights
+            months = periods_to_goal(plan.targets, plan.saved, contribution, plan.savings_rate / 12)
+            late = months - plan.deadline_months
+            months_late[start:stop] = np.maximum(late, 0.0).sum(axis=1)
+            dreams_on_time[start:stop] = (late <= ON_TIME_TOLERANCE).sum(axis=1)
+            last_dream_months[start:stop] = months.max(axis=1)
+
+    return SplitScores(shares, foundation_value, months_late, emergency_months, dreams_on_time, last_dream_months)
+
+def pareto_mask(objectives: np.ndarray) -> np.ndarray:
+    """
+    Which rows of an (n, 3) objectives array (lower is better) no other row
+    dominates.
+
+    Rows are sorted lexicographically, so anything that dominates a row
+    comes before it; a row is then dominated exactly when an earlier row is
+    no worse on the last two objectives. Those earlier rows are kept as a
+    staircase (second objective ascending, third strictly descending), which
+    answers that with one bisect - O(n log n) rather than comparing every
+    pair. Identical rows are collapsed first and share the answer.
+    """
+    unique, inverse = np.unique(objectives, axis=0, return_inverse=True)
+    keep = np.zeros(len(unique), dtype=bool)
+    keys, values = [], []  # The staircase
+    # np.unique already returns rows in lexicographic order
+    for row, (_, second, third) in enumerate(unique.tolist()):
+        position = bisect.bisect_right(keys, second)
+        if position and values[position - 1] <= third:
+            continue
+        keep[row] = True
+        start = bisect.bisect_left(keys, second)
+        stop = start
+        while stop < len(keys) and values[stop] >= third:
+            stop += 1
+        keys[start:stop] = [second]
+        values[start:stop] = [third]
+    return keep[inverse.reshape(-1)]
+
+def dominated_by(objectives: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Which rows of `objectives` some row of `candidates` dominates (one broadcast comparison)"""
+    no_worse = (candidates[None, :, :] <= objectives[:, None, :]).all(axis=2)
+    better = (candidates[None, :, :] < objectives[:, None, :]).any(axis=2)
+    return (no_worse & better).any(axis=1)
+
+def sweep_front(shares: np.ndarray, plan: AllocationPlan) -> SplitScores:
+    """Score a set of splits and keep their Pareto front - one compute pool job"""
+    scores = score_splits(shares, plan)
+    return scores.take(pareto_mask(scores.objectives()))
+
+def merge_fronts(fronts) -> SplitScores:
+    """Combine fronts of disjoint pieces of the grid into the overall front"""
+    merged = SplitScores.concat(fronts)
+    return merged.take(pareto_mask(merged.objectives()))
+
+def recommend(front: SplitScores) -> int:
+    """
+    Index of the balanced choice on the front: the split closest to the
+    ideal point once each objective is scaled to 0..1 across the front.
+    Unreachable goals (inf) count as the worst value.
+    """
+    objectives = front.objectives()
+    finite = np.isfinite(objectives)
+    best = np.where(finite, objectives, np.inf).min(axis=0)
+    worst = np.where(finite, objectives, -np.inf).max(axis=0)
+    spread = worst - best
+    spread = np.where(np.isfinite(spread) & (spread > 0), spread, 1.0)
+    with np.errstate(invalid="ignore"):
+        scaled = np.where(finite, (objectives - best) / spread, 1.0)
+    return int(np.argmin(np.square(scaled).sum(axis=1)))
+
+def plan_chunks(split_count: int, dream_count: int, workers: int, parallel_cells: int) -> int:
+    """How many pool jobs a sweep is split into (1 means score inline)"""
+    cells = split_count * max(dream_count, 1)
+    if cells < parallel_cells:
+        return 1
+    return max(1, min(workers, split_count // MIN_CHUNK_SPLITS))
+
+def strategy_shares() -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Names and (n, 3) shares of the client-side strategies"""
+    return tuple(STRATEGY_SPLITS), np.array(list(STRATEGY_SPLITS.values()))
@@ -0,0 +1,83 @@
+"""
+Dream amount calculations shared by the calculate endpoints
+
+Holds the everyday prices behind the "that's just N coffees" comparisons and
+a columnar version of the daily/weekly/monthly breakdown that processes a
+whole batch of goals as NumPy array operations.
+"""
+
+from datetime import date
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.services.finance import required_contributions
+
+# Everyday prices used for relatable comparisons
+COFFEE_PRICE = 5.50
+LUNCH_PRICE = 12.00
+STREAMING_PRICE = 12.99
+MOVIE_PRICE = 15.00
+
+# Daily amounts above this feel unrealistic for most people
+ACHIEVABLE_DAILY_LIMIT = 100.0
+
+# Largest batch accepted in one request
+MAX_BATCH_ROWS = 10_000
+
+
+def calculate_batch(
+    target_amounts: Sequence[float],
+    target_dates: Sequence[date],
+    current_saved: Optional[Sequence[float]] = None,
+    today: Optional[date] = None,
+    annual_rate: Optional[float] = None,
+) -> dict:
+    """
+    Calculate savings amounts for many goals at once.
+
+    Same math as the single /calculate endpoint (see app.services.finance),
+    but every step is an array operation over the whole batch. Rows whose target date is not in the
+    future get valid=False and zero amounts instead of failing the batch.
+
+    Args:
+        target_amounts: Goal amounts
+        target_dates: Goal dates (same length as target_amounts)
+        current_saved: Amounts already saved (defaults to zero for every row)
+        today: Reference date (defaults to today)
+        annual_rate: Annual interest on savings (defaults to the configured rate)
+
+    Returns:
+        Dictionary of NumPy arrays, one per output column
+    """
+    targets = np.asarray(target_amounts, dtype=np.float64)
+    saved = (
+        np.zeros_like(targets)
+        if current_saved is None
+        else np.asarray(current_saved, dtype=np.float64)
+    )
+    dates = np.asarray(target_dates, dtype="datetime64[D]")
+    today = np.datetime64(today or date.today(), "D")
+
+    days_remaining = (dates - today).astype(np.int64)
+    valid = days_remaining > 0
+
+    amount_remaining = targets - saved
+    daily, weekly, monthly = (
+        required_contributions(targets, saved, days_remaining, frequency, annual_rate)
+        for frequency in ("daily", "weekly", "monthly")
+    )
+
+    return {
+        "valid": valid,
+        "days_remaining": days_remaining,
+        "amount_remaining": np.round(amount_remaining, 2),
+        "daily_amount": np.round(daily, 2),
+        "weekly_amount": np.round(weekly, 2),
+        "monthly_amount": np.round(monthly, 2),
+        "coffees_per_day": np.round(daily / COFFEE_PRICE, 1),
+        "lunches_per_week": np.round(weekly / LUNCH_PRICE, 1),
+        "streaming_services": np.round(monthly / STREAMING_PRICE, 1),
+        "movie_tickets": np.round(daily / MOVIE_PRICE, 1),
+        "is_achievable": valid & (daily <= ACHIEVABLE_DAILY_LIMIT),
+    }
@@ -0,0 +1,186 @@
+"""
+Compound-interest math for Dream Planner
+
+One place for the "how much do I need to save per day/week/month" formula,
+used by the Dream model and every calculate endpoint so they always agree.
+
+Savings are treated as an ordinary annuity: the current balance keeps growing
+at the periodic rate and a fixed contribution is added at the end of each
+period. Growth factors (1 + i)^n are read from precomputed tables cached per
+(rate, frequency, horizon) instead of being exponentiated for every dream.
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+# Contribution frequencies and how many happen per year
+PERIODS_PER_YEAR = {
+    "daily": 365,
+    "weekly": 52,
+    "monthly": 12,
+}
+
+# Days per contribution period (30-day months, matching the rest of the app)
+DAYS_PER_PERIOD = {
+    "daily": 1,
+    "weekly": 7,
+    "monthly": 30,
+}
+
+# Tables are built in blocks so dreams with similar horizons share one table
+TABLE_BLOCK = 1024
+
+# Horizons beyond this (about 100 years of days) fall back to direct exponentiation
+MAX_TABLE_PERIODS = 36_864
+
+
+@lru_cache(maxsize=32)
+def discount_table(annual_rate: float, frequency: str, horizon: int) -> np.ndarray:
+    """
+    Growth factors (1 + i)^k for k = 0..horizon at the periodic rate.
+
+    Cached per (rate, frequency, horizon); callers round horizon up to a
+    TABLE_BLOCK multiple so a handful of tables cover every dream.
+    """
+    periodic_rate = annual_rate / PERIODS_PER_YEAR[frequency]
+    table = np.power(1.0 + periodic_rate, np.arange(horizon + 1, dtype=np.float64))
+    table.flags.writeable = False  # Shared between callers
+    return table
+
+
+def _table_for(annual_rate: float, frequency: str, periods: int) -> Optional[np.ndarray]:
+    """Cached table covering `periods`, or None when the horizon is too long to tabulate"""
+    if periods > MAX_TABLE_PERIODS:
+        return None
+    horizon = -(-max(periods, 1) // TABLE_BLOCK) * TABLE_BLOCK
+    return discount_table(float(annual_rate), frequency, horizon)
+
+
+def periods_in(days: int, frequency: str) -> int:
+    """Whole contribution periods that fit in `days` (at least one while days remain)"""
+    if days <= 0:
+        return 0
+    return max(1, days // DAYS_PER_PERIOD[frequency])
+
+
+def growth_factor(annual_rate: float, frequency: str, periods: int) -> float:
+    """(1 + i)^periods, read from the cached table when possible"""
+    table = _table_for(annual_rate, frequency, periods)
+    if table is None:
+        return (1.0 + annual_rate / PERIODS_PER_YEAR[frequency]) ** periods
+    return float(table[periods])
+
+
+def future_value(present_value: float, annual_rate: float, days: int, frequency: str = "daily") -> float:
+    """What a balance grows to after `days` of compounding at the given frequency"""
+    return present_value * growth_factor(annual_rate, frequency, periods_in(days, frequency))
+
+
+def required_contribution(
+    target_amount: float,
+    current_saved: float,
+    days: int,
+    frequency: str = "daily",
+    annual_rate: Optional[float] = None,
+) -> float:
+    """
+    Contribution per period needed to reach target_amount in `days`.
+
+    Closed-form annuity payment: PMT = (FV - PV * g) * i / (g - 1) with
+    g = (1 + i)^n, or a plain split of the remaining amount when the rate is
+    zero. Returns 0.0 when there is no time left or the current balance will
+    grow past the target on its own.
+
+    Args:
+        target_amount: Goal amount (future value)
+        current_saved: Amount already saved (present value)
+        days: Days until the target date
+        frequency: "daily", "weekly" or "monthly"
+        annual_rate: Annual interest rate (defaults to the configured savings rate)
+
+    Returns:
+        Amount to save each period
+    """
+    periods = periods_in(days, frequency)
+    if periods <= 0:
+        return 0.0
+
+    rate = settings.savings_annual_rate if annual_rate is None else annual_rate
+    periodic_rate = rate / PERIODS_PER_YEAR[frequency]
+
+    if periodic_rate == 0:
+        return max(0.0, (target_amount - current_saved) / periods)
+
+    growth = growth_factor(rate, frequency, periods)
+    shortfall = target_amount - current_saved * growth
+    if shortfall <= 0:
+        return 0.0
+    return shortfall * periodic_rate / (growth - 1.0)
+
+
+def required_contributions(
+    target_amounts: np.ndarray,
+    current_saved: np.ndarray,
+    days: np.ndarray,
+    frequency: str = "daily",
+    annual_rate: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Vectorized required_contribution for whole arrays of goals.
+
+    Growth factors come from a single table lookup (fancy indexing), so a
+    batch of any size costs a few array operations.
+    """
+    target_amounts = np.asarray(target_amounts, dtype=np.float64)
+    current_saved = np.asarray(current_saved, dtype=np.float64)
+    days = np.asarray(days, dtype=np.int64)
+
+    periods = np.where(days > 0, np.maximum(1, days // DAYS_PER_PERIOD[frequency]), 0)
+    active = periods > 0
+    result = np.zeros_like(target_amounts)
+    if not active.any():
+        return result
+
+    rate = settings.savings_annual_rate if annual_rate is None else annual_rate
+    periodic_rate = rate / PERIODS_PER_YEAR[frequency]
+
+    if periodic_rate == 0:
+        np.divide(target_amounts - current_saved, periods, out=result, where=active)
+        return np.maximum(result, 0.0)
+
+    table = _table_for(rate, frequency, int(periods.max()))
+    if table is None:
+        growth = np.power(1.0 + periodic_rate, periods)
+    else:
+        growth = table[periods]
+
+    shortfall = target_amounts - current_saved * growth
+    np.divide(shortfall * periodic_rate, growth - 1.0, out=result, where=active)
+    return np.maximum(result, 0.0)
+
+
+def periods_to_goal(target_amount, current_saved, contribution, periodic_rate: float) -> np.ndarray:
+    """
+    Periods until a balance earning `periodic_rate` with a fixed contribution
+    per period reaches the target (inf when it never does, 0 once reached).
+
+    Inverts the annuity: (1 + i)^n = (T*i + c) / (S*i + c), or
+    n = (T - S) / c at a zero rate. Inputs broadcast against each other.
+    """
+    target_amount = np.asarray(target_amount, dtype=np.float64)
+    current_saved = np.asarray(current_saved, dtype=np.float64)
+    contribution = np.asarray(contribution, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if periodic_rate == 0:
+            periods = (target_amount - current_saved) / contribution
+        else:
+            periods = np.log(
+                (target_amount * periodic_rate + contribution) / (current_saved * periodic_rate + contribution)
+            ) / math.log1p(periodic_rate)
+    periods = np.where(np.isnan(periods), np.inf, periods)
+    return np.where(current_saved >= target_amount, 0.0, periods)
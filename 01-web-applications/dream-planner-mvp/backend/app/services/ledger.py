@@ -0,0 +1,199 @@
+"""
+Bucket ledger operations
+
+Recording a transaction touches three things inside one database
+transaction: the transaction row, one entry per bucket leg, and the
+materialized balance of each bucket involved. Balances are moved with a
+single UPDATE ... RETURNING per bucket, guarded by "balance >= amount" for
+outgoing legs, so concurrent writers can't overdraw a bucket and the
+running balance stored on each entry is exactly what the database holds.
+Amounts and balances are kept rounded to cents, so that guard is an exact
+comparison - emptying a bucket to the cent works, and one cent more fails.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bucket import Bucket, BucketBalance, BucketEntry, BucketTransaction, ReasonCategory, TransactionType
+from app.models.sql_functions import dialect_insert, round_cents, year_month
+
+class InsufficientFunds(ValueError):
+    """Raised when an outgoing leg would take a bucket below zero"""
+
+    def __init__(self, bucket: Bucket, available: float, requested: float):
+        self.bucket = bucket
+        self.available = available
+        self.requested = requested
+        super().__init__(
+            f"Insufficient funds in {bucket.value} bucket. "
+            f"Available: ${available:.2f}, Requested: ${requested:.2f}"
+        )
+
+def _utcnow() -> datetime:
+    """Naive UTC to the second, the same shape as server-set timestamps"""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+async def _ensure_balance_rows(db: AsyncSession, user_id: int, buckets: List[Bucket]):
+    """Create missing zero balances; a no-op once the user has used the buckets"""
+    await db.execute(
+        dialect_insert(db.bind)(BucketBalance)
+        .values([{"user_id": user_id, "bucket": bucket, "balance": 0.0} for bucket in buckets])
+        .on_conflict_do_nothing()
+    )
+
+async def _move_balance(db: AsyncSession, user_id: int, bucket: Bucket, delta: float, now: datetime) -> float:
+    """Apply a signed amount to a bucket's balance and return the new balance"""
+    stmt = (
+        update(BucketBalance)
+        .where(BucketBalance.user_id == user_id, BucketBalance.bucket == bucket)
+        .values(
+            balance=round_cents(BucketBalance.balance + delta),
+            total_in=round_cents(BucketBalance.total_in + max(delta, 0.0)),
+            total_out=round_cents(BucketBalance.total_out + max(-delta, 0.0)),
+            entry_count=BucketBalance.entry_count + 1,
+            updated_at=now
+        )
+        .returning(BucketBalance.balance)
+        .execution_options(synchronize_session=False)
+    )
+    if delta < 0:
+        stmt = stmt.where(BucketBalance.balance >= -delta)
+
+    new_balance = (await db.execute(stmt)).scalar_one_or_none()
+    if new_balance is None:
+        available = await db.scalar(
+            select(BucketBalance.balance).where(BucketBalance.user_id == user_id, BucketBalance.bucket == bucket)
+        )
+        raise InsufficientFunds(bucket, available or 0.0, -delta)
+    return new_balance
+
+async def record_transaction(
+    db: AsyncSession,
+    user_id: int,
+    type: TransactionType,
+    amount: float,
+    from_bucket: Optional[Bucket],
+    to_bucket: Optional[Bucket],
+    reason: str,
+    category: ReasonCategory = ReasonCategory.other,
+    notes: Optional[str] = None,
+) -> tuple:
+    """
+    Append a transaction and move the bucket balances it affects.
+
+    Doesn't commit - the caller commits (or rolls back on InsufficientFunds)
+    so the transaction, its entries and the balances land together.
+
+    Returns:
+        (BucketTransaction, list of BucketEntry)
+    """
+    now = _utcnow()
+    amount = round(amount, 2)
+    legs = [(bucket, delta) for bucket, delta in ((from_bucket, -amount), (to_bucket, amount)) if bucket is not None]
+    # Fixed lock order so opposite transfers can't deadlock on PostgreSQL
+    legs.sort(key=lambda leg: leg[0].value)
+
+    await _ensure_balance_rows(db, user_id, [bucket for bucket, _ in legs])
+
+    transaction = BucketTransaction(
+        user_id=user_id,
+        type=type,
+        amount=amount,
+        from_bucket=from_bucket,
+        to_bucket=to_bucket,
+        reason=reason,
+        category=category,
+        notes=notes,
+        created_at=now
+    )
+    db.add(transaction)
+    await db.flush()
+
+    entries = []
+    for bucket, delta in legs:
+        balance_after = await _move_balance(db, user_id, bucket, delta, now)
+        entries.append(BucketEntry(
+            user_id=user_id,
+            transaction_id=transaction.id,
+            bucket=bucket,
+            amount=delta,
+            balance_after=balance_after,
+            created_at=now
+        ))
+    db.add_all(entries)
+    await db.flush()
+
+    return transaction, entries
+
+async def get_balances(db: AsyncSession, user_id: int) -> Dict[Bucket, Optional[BucketBalance]]:
+    """Materialized balances for every bucket (None where the bucket was never used)"""
+    rows = (await db.scalars(select(BucketBalance).where(BucketBalance.user_id == user_id))).all()
+    balances = {bucket: None for bucket in Bucket}
+    balances.update({row.bucket: row for row in rows})
+    return balances
+
+async def transaction_statistics(
+    db: AsyncSession,
+    user_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> dict:
+    """
+    Counts and totals by type, category, month and bucket for a time range.
+
+    One grouped query over the (user, created_at) index range - the work
+    grows with the transactions in the range, not with the user's history.
+    """
+    month = year_month(BucketTransaction.created_at)
+    query = (
+        select(
+            BucketTransaction.type,
+            BucketTransaction.category,
+            month.label("month"),
+            BucketTransaction.from_bucket,
+            BucketTransaction.to_bucket,
+            func.count().label("count"),
+            func.sum(BucketTransaction.amount).label("total")
+        )
+        .where(BucketTransaction.user_id == user_id)
+        .group_by(
+            BucketTransaction.type,
+            BucketTransaction.category,
+            month,
+            BucketTransaction.from_bucket,
+            BucketTransaction.to_bucket
+        )
+    )
+    if start is not None:
+        query = query.where(BucketTransaction.created_at >= start)
+    if end is not None:
+        query = query.where(BucketTransaction.created_at <= end)
+
+    stats = {
+        "total_transactions": 0,
+        "by_type": {},
+        "by_category": {},
+        "monthly_activity": {},
+        "bucket_activity": {bucket.value: {"inflow": 0.0, "outflow": 0.0, "transactions": 0} for bucket in Bucket},
+    }
+    for row in (await db.execute(query)).all():
+        stats["total_transactions"] += row.count
+        for key, name in (("by_type", row.type.value), ("by_category", row.category.value)):
+            group = stats[key].setdefault(name, {"count": 0, "amount": 0.0})
+            group["count"] += row.count
+            group["amount"] = round(group["amount"] + row.total, 2)
+        stats["monthly_activity"][row.month] = stats["monthly_activity"].get(row.month, 0) + row.count
+        if row.from_bucket is not None:
+            activity = stats["bucket_activity"][row.from_bucket.value]
+            activity["outflow"] = round(activity["outflow"] + row.total, 2)
+            activity["transactions"] += row.count
+        if row.to_bucket is not None:
+            activity = stats["bucket_activity"][row.to_bucket.value]
+            activity["inflow"] = round(activity["inflow"] + row.total, 2)
+            activity["transactions"] += row.count
+
+    stats["monthly_activity"] = dict(sorted(stats["monthly_activity"].items()))
+    return stats
@@ -0,0 +1,204 @@
+"""
+Derived dream metrics, computed once per dream per day
+
+Every number shown next to a dream - days left, daily/weekly/monthly
+amounts, progress, the coffee comparisons - follows from three stored
+fields and today's date. Metrics are computed together in one pass and
+memoized per dream, keyed by those fields (the dream's version) and the
+calendar day, so building a response reads them instead of re-running the
+annuity math for every property.
+
+When the date changes every memoized dream is recomputed in one vectorized
+batch. A scheduled job does this just after midnight (app.services.sweeps);
+if a request gets there first it triggers the same batch.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.calculations import (
+    ACHIEVABLE_DAILY_LIMIT,
+    COFFEE_PRICE,
+    LUNCH_PRICE,
+    MOVIE_PRICE,
+    STREAMING_PRICE,
+)
+from app.services.finance import required_contribution, required_contributions
+
+logger = logging.getLogger(__name__)
+
+class DreamMetrics(NamedTuple):
+    """Everything derived from a dream's amounts and dates on one day"""
+    days_remaining: int
+    amount_remaining: float
+    daily_amount: float
+    weekly_amount: float
+    monthly_amount: float
+    progress_percentage: float
+    is_achievable: bool
+    coffees: float
+    lunches_per_week: float
+    movie_tickets: float
+    streaming_services: float
+
+    def comparisons(self) -> dict:
+        """Relatable comparisons for the savings amounts"""
+        return {
+            "coffees": self.coffees,
+            "lunches_per_week": self.lunches_per_week,
+            "movie_tickets": self.movie_tickets,
+            "streaming_services": self.streaming_services
+        }
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+def _progress(target_amount: float, current_saved: float) -> float:
+    if target_amount <= 0:
+        return 0.0
+    return min(100.0, (current_saved / target_amount) * 100)
+
+def compute_metrics(target_amount: float, current_saved: float, target_date, today: date) -> DreamMetrics:
+    """All derived metrics of one dream for `today`"""
+    days = max(0, (_as_date(target_date) - today).days)
+    daily, weekly, monthly = (
+        required_contribution(target_amount, current_saved, days, frequency)
+        for frequency in ("daily", "weekly", "monthly")
+    )
+    return DreamMetrics(
+        days_remaining=days,
+        amount_remaining=max(0, target_amount - current_saved),
+        daily_amount=daily,
+        weekly_amount=weekly,
+        monthly_amount=monthly,
+        progress_percentage=_progress(target_amount, current_saved),
+        is_achievable=daily <= ACHIEVABLE_DAILY_LIMIT,
+        coffees=round(daily / COFFEE_PRICE, 1),
+        lunches_per_week=round(weekly / LUNCH_PRICE, 1),
+        movie_tickets=round(daily / MOVIE_PRICE, 1),
+        streaming_services=round(monthly / STREAMING_PRICE, 1)
+    )
+
+def compute_metrics_batch(versions: list, today: date) -> list:
+    """
+    compute_metrics for many (target_amount, current_saved, target_date)
+    tuples at once, with the annuity math done as array operations.
+    """
+    if not versions:
+        return []
+    targets = np.fromiter((version[0] for version in versions), dtype=np.float64, count=len(versions))
+    saved = np.fromiter((version[1] for version in versions), dtype=np.float64, count=len(versions))
+    dates = np.array([_as_date(version[2]) for version in versions], dtype="datetime64[D]")
+    days = np.maximum((dates - np.datetime64(today, "D")).astype(np.int64), 0)
+
+    daily, weekly, monthly = (
+        required_contributions(targets, saved, days, frequency)
+        for frequency in ("daily", "weekly", "monthly")
+    )
+    achievable = daily <= ACHIEVABLE_DAILY_LIMIT
+
+    # Plain Python lists: indexing NumPy scalars one by one is the slow part
+    columns = zip(
+        days.tolist(),
+        daily.tolist(),
+        weekly.tolist(),
+        monthly.tolist(),
+        achievable.tolist(),
+        np.round(daily / COFFEE_PRICE, 1).tolist(),
+        np.round(weekly / LUNCH_PRICE, 1).tolist(),
+        np.round(daily / MOVIE_PRICE, 1).tolist(),
+        np.round(monthly / STREAMING_PRICE, 1).tolist(),
+    )
+    return [
+        DreamMetrics(
+            days_left, max(0, target - current), day_amount, week_amount, month_amount,
+            _progress(target, current), is_achievable, coffees, lunches, movies, streaming
+        )
+        for (target, current, _), (
+            days_left, day_amount, week_amount, month_amount, is_achievable, coffees, lunches, movies, streaming
+        ) in zip(versions, columns)
+    ]
+
+class MetricsMemo:
+    """LRU of dream id -> (version, metrics) for the current day"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(0, max_entries)
+        self.day = date.today()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rollovers = 0
+        self.last_rollover_ms = None
+
+    def get(self, dream) -> DreamMetrics:
+        """Metrics for a Dream instance, computed at most once per version and day"""
+        return self.lookup(dream.id, dream.target_amount, dream.current_saved, dream.target_date)
+
+    def lookup(self, dream_id: Optional[int], target_amount: float, current_saved: Optional[float], target_date) -> DreamMetrics:
+        """Metrics from a dream's raw column values (for rows loaded without the ORM)"""
+        today = date.today()
+        if today != self.day:
+            self.rollover(today)
+
+        version = (target_amount, current_saved or 0.0, target_date)
+        if dream_id is None or self.max_entries == 0:
+            return compute_metrics(*version, today)
+
+        with self._lock:
+            entry = self._entries.get(dream_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(dream_id)
+                self.hits += 1
+                return entry[1]
+
+        metrics = compute_metrics(*version, today)
+        with self._lock:
+            self.misses += 1
+            self._entries[dream_id] = (version, metrics)
+            self._entries.move_to_end(dream_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return metrics
+
+    def rollover(self, day: Optional[date] = None) -> int:
+        """Recompute every memoized dream for a new day; returns how many"""
+        day = day or date.today()
+        started = time.perf_counter()
+        with self._lock:
+            if day == self.day:
+                return 0  # Another caller already rolled over
+            ids = list(self._entries)
+            versions = [self._entries[dream_id][0] for dream_id in ids]
+            metrics = compute_metrics_batch(versions, day)
+            self._entries = OrderedDict(zip(ids, zip(versions, metrics)))
+            self.day = day
+            self.rollovers += 1
+            self.last_rollover_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info("Recomputed metrics for %d dreams for %s in %sms", len(ids), day, self.last_rollover_ms)
+        return len(ids)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "day": self.day.isoformat(),
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else None,
+                "rollovers": self.rollovers,
+                "last_rollover_ms": self.last_rollover_ms,
+            }
+
+# Shared memo for the API process
+dream_metrics = MetricsMemo(settings.metrics_memo_size)
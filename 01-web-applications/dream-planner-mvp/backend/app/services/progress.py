@@ -0,0 +1,223 @@
+"""
+Daily progress check-ins with incrementally maintained streaks
+
+Recording a check-in touches three things inside one database transaction:
+the (dream, day) event, the dream's current_saved (moved by the difference
+from any earlier amount for that day with a single UPDATE ... RETURNING),
+and the dream's progress state. Streaks extend in O(1) as new days arrive;
+only a check-in backfilled before the latest day re-counts the runs.
+
+The savings rate is an exponentially decayed sum of amounts: each
+check-in decays the stored sum to its day and adds the amount. Dividing by
+the total weight the days since the first check-in could carry gives an
+unbiased daily rate - exact for a steady saver, fading when check-ins stop
+- without reading any history.
+"""
+
+import enum
+import math
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.dream import Dream
+from app.models.progress import DreamProgress, ProgressEvent
+from app.models.sql_functions import dialect_insert
+from app.services.finance import PERIODS_PER_YEAR, periods_to_goal
+from app.services.metrics import dream_metrics
+
+# Projected finish within this many days of the target date counts as on track
+ON_TRACK_DAYS = 7
+
+# Projections further out than this are reported as never
+MAX_PROJECTION_DAYS = 36_500
+
+class ProgressStatus(str, enum.Enum):
+    """Where a dream stands against its target date"""
+    ahead = "ahead"          # Current pace finishes more than a week early
+    on_track = "on_track"
+    behind = "behind"        # Current pace finishes more than a week late (or there's no pace)
+    completed = "completed"
+    overdue = "overdue"      # Target date passed before the dream was funded
+
+class ProgressUpdate(NamedTuple):
+    """Result of recording a check-in"""
+    state: DreamProgress
+    previous_amount: Optional[float]  # That day's amount before this check-in, if any
+    current_saved: float
+    target_amount: float
+    target_date: datetime
+
+def count_streaks(days: List[date]) -> tuple:
+    """(run ending at the last day, longest run) of consecutive days in sorted, distinct days"""
+    if not days:
+        return 0, 0
+    ordinals = np.fromiter((day.toordinal() for day in days), dtype=np.int64, count=len(days))
+    run_ids = np.concatenate(([0], np.cumsum(np.diff(ordinals) != 1)))
+    lengths = np.bincount(run_ids)
+    return int(lengths[-1]), int(lengths.max())
+
+async def record_progress(
+    db: AsyncSession,
+    user_id: int,
+    dream_id: int,
+    day: date,
+    amount: float,
+) -> ProgressUpdate:
+    """
+    Record the amount saved towards a dream on a day (replacing that day's
+    earlier amount) and update the dream and its progress state.
+
+    The dream must exist and belong to the user. Doesn't commit - the
+    caller commits so the event, current_saved and the state land together.
+    """
+    # Make sure the state row exists, then hold it for the rest of the transaction
+    await db.execute(
+        dialect_insert(db.bind)(DreamProgress)
+        .values(
+            dream_id=dream_id, user_id=user_id, current_streak=0, longest_streak=0,
+            total_days=0, total_amount=0.0, rate_mass=0.0
+        )
+        .on_conflict_do_nothing()
+    )
+    state = await db.scalar(
+        select(DreamProgress)
+        .where(DreamProgress.dream_id == dream_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+
+    previous = await db.scalar(
+        select(ProgressEvent.amount).where(ProgressEvent.dream_id == dream_id, ProgressEvent.event_date == day)
+    )
+    delta = amount - (previous or 0.0)
+
+    current_saved, target_amount, target_date = (await db.execute(
+        update(Dream)
+        .where(Dream.id == dream_id, Dream.user_id == user_id)
+        .values(current_saved=func.coalesce(Dream.current_saved, 0.0) + delta)
+        .returning(Dream.current_saved, Dream.target_amount, Dream.target_date)
+        .execution_options(synchronize_session=False)
+    )).one()
+
+    stmt = dialect_insert(db.bind)(ProgressEvent).values(
+        dream_id=dream_id, event_date=day, user_id=user_id, amount=amount
+    )
+    table = ProgressEvent.__table__
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.dream_id, table.c.event_date],
+        set_={"amount": stmt.excluded.amount, "updated_at": func.now()}
+    ))
+
+    if previous is None:
+        state.total_days += 1
+        state.first_date = min(state.first_date or day, day)
+        if state.last_date is None or day > state.last_date:
+            extends = state.last_date is not None and (day - state.last_date).days == 1
+            state.current_streak = state.current_streak + 1 if extends else 1
+            state.longest_streak = max(state.longest_streak, state.current_streak)
+            state.last_date = day
+        else:
+            # A backfilled day can join runs anywhere in the history - recount them (rare)
+            days = (await db.scalars(
+                select(ProgressEvent.event_date)
+                .where(ProgressEvent.dream_id == dream_id)
+                .order_by(ProgressEvent.event_date)
+            )).all()
+            state.current_streak, state.longest_streak = count_streaks(days)
+    state.total_amount += delta
+
+    # Decay the stored sum to the later of the two days, then add the change
+    window = settings.progress_rate_window
+    if state.rate_date is None:
+        state.rate_mass, state.rate_date = delta, day
+    elif day >= state.rate_date:
+        state.rate_mass = state.rate_mass * math.exp(-(day - state.rate_date).days / window) + delta
+        state.rate_date = day
+    else:
+        state.rate_mass += delta * math.exp(-(state.rate_date - day).days / window)
+
+    await db.flush()
+    return ProgressUpdate(state, previous, current_saved, target_amount, target_date)
+
+def current_streak(state: Optional[DreamProgress], today: date) -> int:
+    """The streak still counts until a whole day is missed"""
+    if state is None or state.last_date is None or (today - state.last_date).days > 1:
+        return 0
+    return state.current_streak
+
+def savings_rate(state: Optional[DreamProgress], today: date) -> float:
+    """Estimated amount saved per day, weighting recent days most"""
+    if state is None or state.rate_date is None or state.first_date is None:
+        return 0.0
+    window = settings.progress_rate_window
+    mass = state.rate_mass * math.exp(-max(0, (today - state.rate_date).days) / window)
+    # Weight of one unit on every day from the first check-in to today
+    days = max(0, (today - state.first_date).days) + 1
+    weight = -math.expm1(-days / window) / -math.expm1(-1.0 / window)
+    return max(0.0, mass / weight)
+
+def progress_summary(
+    state: Optional[DreamProgress],
+    dream_id: int,
+    target_amount: float,
+    current_saved: Optional[float],
+    target_date,
+    today: Optional[date] = None,
+) -> dict:
+    """
+    Streak, pace and projected completion for a dream - a constant amount
+    of work from the stored state, whatever the history's length.
+    """
+    today = today or date.today()
+    metrics = dream_metrics.lookup(dream_id, target_amount, current_saved, target_date)
+    rate = savings_rate(state, today)
+
+    projected = None
+    days_ahead_behind = 0
+    if metrics.progress_percentage >= 100:
+        status = ProgressStatus.completed
+    elif metrics.days_remaining <= 0:
+        status = ProgressStatus.overdue
+    else:
+        days_needed = float(periods_to_goal(
+            target_amount, current_saved or 0.0, rate, settings.savings_annual_rate / PERIODS_PER_YEAR["daily"]
+        )) if rate > 0 else math.inf
+        if days_needed <= MAX_PROJECTION_DAYS:
+            days_needed = math.ceil(days_needed)
+            projected = today + timedelta(days=days_needed)
+            days_ahead_behind = metrics.days_remaining - days_needed
+        else:
+            days_ahead_behind = -metrics.days_remaining
+        if projected is not None and days_ahead_behind > ON_TRACK_DAYS:
+            status = ProgressStatus.ahead
+        elif projected is not None and days_ahead_behind >= -ON_TRACK_DAYS:
+            status = ProgressStatus.on_track
+        else:
+            status = ProgressStatus.behind
+
+    total_days = state.total_days if state is not None else 0
+    return {
+        "dream_id": dream_id,
+        "status": status,
+        "current_saved": round(current_saved or 0.0, 2),
+        "amount_remaining": round(metrics.amount_remaining, 2),
+        "progress_percentage": metrics.progress_percentage,
+        "days_remaining": metrics.days_remaining,
+        "required_daily_rate": metrics.daily_amount,
+        "actual_daily_rate": round(rate, 2),
+        "projected_completion_date": projected,
+        "days_ahead_behind": days_ahead_behind,
+        "streak": {
+            "current_streak": current_streak(state, today),
+            "longest_streak": state.longest_streak if state is not None else 0,
+            "last_progress_date": state.last_date if state is not None else None,
+            "is_active_today": state is not None and state.last_date == today,
+            "total_progress_days": total_days,
+            "average_amount": round(state.total_amount / total_days, 2) if total_days else 0.0,
+        },
+    }
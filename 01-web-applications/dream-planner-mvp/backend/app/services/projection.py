@@ -0,0 +1,499 @@
+"""
+Someday life projection engine
+
+Server-side port of the frontend's runSomedayProjection: thousands of
+simulated futures for a household's whole financial picture (income,
+expenses, inflation, a stock/bond/cash portfolio and life events) measured
+against the amount the "someday" life needs.
+
+Every simulation runs at once - market draws and life events are
+(years x simulations) NumPy arrays and each year is a handful of vector
+operations on one contiguous row, so 10k simulations over 30 years take milliseconds instead of
+a 300k-iteration loop in the browser. Results are deterministic for a given
+profile, goals and options, which is what makes them safe to cache.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+DEFAULT_SIMULATIONS = 10_000
+MAX_SIMULATIONS = 50_000
+DEFAULT_YEARS = 30
+MAX_YEARS = 50
+DEFAULT_MAX_POINTS = 60
+
+# Bands drawn on the fan chart, and the final-asset rank behind each scenario
+BAND_PERCENTILES = (10, 25, 50, 75, 90)
+SCENARIO_PERCENTILES = {
+    "pessimistic": 25,
+    "realistic": 50,
+    "optimistic": 75,
+}
+
+DEFAULT_ALLOCATION = {"stocks": 70, "bonds": 20, "cash": 10}
+
+# Historical market assumptions (same numbers as the frontend engine)
+MARKET_ASSUMPTIONS = {
+    "stocks": {"mean_return": 0.10, "standard_deviation": 0.16},
+    "bonds": {"mean_return": 0.05, "standard_deviation": 0.04},
+    "cash": {"mean_return": 0.02, "standard_deviation": 0.01},
+    "inflation": {"mean_rate": 0.03, "standard_deviation": 0.015, "min_rate": -0.02, "max_rate": 0.08},
+}
+MAX_ANNUAL_RETURN = 0.50  # Portfolio return is clipped to +/-50% a year
+
+# Life events with a financial effect, per year
+LIFE_EVENTS = {
+    "job_loss": {
+        "probability": 0.03,
+        "duration_months": 6,   # No savings while out of work
+    },
+    "promotion": {
+        "probability": 0.08,
+        "income_boost": 0.15,   # Permanent raise
+    },
+    "major_medical": {
+        "probability": 0.02,
+        "cost": 25_000,
+        "range": (0.5, 2.5),    # Multiple of the average cost
+    },
+    "home_repair": {
+        "probability": 0.15,
+        "cost": 8_000,
+        "range": (0.3, 1.8),
+    },
+}
+
+
+def _draw_market(rng: np.random.Generator, simulations: int, years: int, allocation: dict) -> tuple:
+    """Annual portfolio returns and inflation rates, both (years x simulations)"""
+    shape = (years, simulations)
+    returns = np.zeros(shape)
+    for asset in ("stocks", "bonds", "cash"):
+        weight = allocation.get(asset, 0) / 100
+        if weight:
+            assumptions = MARKET_ASSUMPTIONS[asset]
+            returns += weight * rng.normal(
+                assumptions["mean_return"], assumptions["standard_deviation"], shape
+            )
+    np.clip(returns, -MAX_ANNUAL_RETURN, MAX_ANNUAL_RETURN, out=returns)
+
+    assumptions = MARKET_ASSUMPTIONS["inflation"]
+    inflation = rng.normal(assumptions["mean_rate"], assumptions["standard_deviation"], shape)
+    np.clip(inflation, assumptions["min_rate"], assumptions["max_rate"], out=inflation)
+    return returns, inflation
+
+
+def _draw_life_events(rng: np.random.Generator, simulations: int, years: int) -> dict:
+    """
+    Life event effects per (year, simulation).
+
+    Returns:
+        income_factor: multiplier applied to monthly income that year
+        paused_months: months without savings that year
+        one_time_costs: cash taken out of assets that year
+        event_counts: number of events per simulation
+    """
+    shape = (years, simulations)
+    event_counts = np.zeros(simulations, dtype=np.int32)
+
+    job_loss = rng.random(shape) < LIFE_EVENTS["job_loss"]["probability"]
+    paused_months = job_loss * float(LIFE_EVENTS["job_loss"]["duration_months"])
+
+    promotion = rng.random(shape) < LIFE_EVENTS["promotion"]["probability"]
+    income_factor = np.where(promotion, 1.0 + LIFE_EVENTS["promotion"]["income_boost"], 1.0)
+
+    one_time_costs = np.zeros(shape)
+    flat_costs = one_time_costs.reshape(-1)
+    for name in ("major_medical", "home_repair"):
+        event = LIFE_EVENTS[name]
+        cells = np.flatnonzero(rng.random(shape) < event["probability"])
+        # Costs are only drawn for the cells where the event happened
+        flat_costs[cells] += event["cost"] * rng.uniform(*event["range"], cells.size)
+        event_counts += np.bincount(cells % simulations, minlength=simulations).astype(np.int32)
+
+    event_counts += job_loss.sum(axis=0, dtype=np.int32) + promotion.sum(axis=0, dtype=np.int32)
+    return {
+        "income_factor": income_factor,
+        "paused_months": paused_months,
+        "one_time_costs": one_time_costs,
+        "event_counts": event_counts,
+    }
+
+
+def project_paths(
+    draws: dict,
+    current_assets: float,
+    monthly_income: float,
+    monthly_expenses: float,
+    paths: Optional[dict] = None,
+    start_year: int = 0,
+) -> dict:
+    """
+    Walk every simulation forward one year at a time from start_year.
+
+    Per year (same order as the frontend): life events change income (and
+    expenses, when draws carry an expense_factor) and take one-time costs, inflation raises expenses, the year's savings are
+    added, then the portfolio return is applied and assets floor at zero.
+    Years before start_year are kept from `paths`, so a change late in the
+    horizon only recomputes what comes after it.
+    """
+    returns = draws["returns"]
+    expense_factor = draws.get("expense_factor")
+    years, simulations = returns.shape
+    if paths is None:
+        paths = {
+            "assets": np.empty((years, simulations)),
+            "monthly_income": np.empty((years, simulations)),
+            "monthly_expenses": np.empty((years, simulations)),
+        }
+
+    if start_year == 0:
+        assets = np.full(simulations, float(current_assets))
+        income = np.full(simulations, float(monthly_income))
+        expenses = np.full(simulations, float(monthly_expenses))
+    else:
+        assets = paths["assets"][start_year - 1].copy()
+        income = paths["monthly_income"][start_year - 1].copy()
+        expenses = paths["monthly_expenses"][start_year - 1].copy()
+
+    for year in range(start_year, years):
+        income *= draws["income_factor"][year]
+        assets -= draws["one_time_costs"][year]
+        if expense_factor is not None:
+            expenses *= expense_factor[year]
+        expenses *= 1.0 + draws["inflation"][year]
+
+        saving_months = 12.0 - draws["paused_months"][year]
+        assets += np.maximum(income - expenses, 0.0) * saving_months
+        assets *= 1.0 + returns[year]
+        np.maximum(assets, 0.0, out=assets)
+
+        paths["assets"][year] = assets
+        paths["monthly_income"][year] = income
+        paths["monthly_expenses"][year] = expenses
+
+    return paths
+
+
+def _downsample_indices(length: int, max_points: int) -> np.ndarray:
+    """Evenly spaced indices into a series, always keeping the first and last point"""
+    if length <= max_points:
+        return np.arange(length)
+    return np.unique(np.linspace(0, length - 1, max(2, max_points)).round().astype(int))
+
+
+def _rank(simulations: int, percentile: int) -> int:
+    """Nearest-rank index of a percentile in sorted results (as the frontend picks them)"""
+    return min(simulations - 1, simulations * percentile // 100)
+
+
+def percentile_bands(assets: np.ndarray, bands: Optional[np.ndarray] = None, start_year: int = 0) -> np.ndarray:
+    """
+    Per-year asset percentiles, shape (len(BAND_PERCENTILES), years).
+
+    Only years from start_year on are (re)computed into `bands`. One sort per
+    year row beats np.percentile's repeated partitioning for five percentiles.
+    """
+    years, simulations = assets.shape
+    if bands is None:
+        bands = np.empty((len(BAND_PERCENTILES), years))
+    ranks = [_rank(simulations, p) for p in BAND_PERCENTILES]
+    bands[:, start_year:] = np.sort(assets[start_year:], axis=1)[:, ranks].T
+    return bands
+
+
+def _round_list(values) -> list:
+    return [round(float(v), 2) for v in values]
+
+
+def _confidence_level(success_rate: float) -> dict:
+    """Plain-language confidence band for a success rate (percentage)"""
+    if success_rate >= 85:
+        return {"level": "very_high", "description": "Very High Confidence", "color": "green"}
+    if success_rate >= 75:
+        return {"level": "high", "description": "High Confidence", "color": "blue"}
+    if success_rate >= 65:
+        return {"level": "good", "description": "Good Confidence", "color": "yellow"}
+    if success_rate >= 50:
+        return {"level": "moderate", "description": "Moderate Confidence", "color": "orange"}
+    return {"level": "needs_improvement", "description": "Needs Improvement", "color": "red"}
+
+
+def _years_to_goal(path: np.ndarray, total_required: float) -> int:
+    """First projected year the path reaches the goal (the full horizon if never)"""
+    reached = np.flatnonzero(path >= total_required)
+    return int(reached[0]) + 1 if reached.size else int(path.size)
+
+
+def summarize_projection(
+    paths: dict,
+    draws: dict,
+    current_assets: float,
+    monthly_income: float,
+    monthly_expenses: float,
+    total_required: float,
+    max_points: int = DEFAULT_MAX_POINTS,
+    bands: Optional[np.ndarray] = None,
+) -> dict:
+    """
+    Reduce simulated paths to the projection result the dashboard renders.
+
+    Args:
+        paths: Per-year assets/income/expenses from project_paths
+        draws: Market and life event draws the paths were built from
+        current_assets: Starting assets
+        monthly_income: Starting monthly income
+        monthly_expenses: Starting monthly expenses
+        total_required: Assets the someday life needs
+        max_points: Maximum points per chart series
+        bands: Precomputed percentile_bands of the paths, if already known
+
+    Returns:
+        Dictionary with success rate, final-asset percentiles, scenario paths,
+        fan chart bands and the chart data generateVisualizationData builds
+    """
+    assets = paths["assets"]
+    years, simulations = assets.shape
+    finals = assets[-1]
+    succeeded = finals >= total_required
+    success_rate = round(float(succeeded.mean()) * 100, 2)
+    confidence = _confidence_level(success_rate)
+
+    # Year-by-year percentile bands for the fan chart, downsampled for the wire
+    if bands is None:
+        bands = percentile_bands(assets)
+    final_percentiles = dict(zip((f"p{p}" for p in BAND_PERCENTILES), _round_list(bands[:, -1])))
+    indices = _downsample_indices(years, max_points)
+    chart_years = (indices + 1).tolist()
+
+    # Each scenario is the simulation ranked at its percentile by final assets
+    ranks = [_rank(simulations, p) for p in SCENARIO_PERCENTILES.values()]
+    ranked = np.argpartition(finals, ranks)
+    monthly_savings = max(0.0, monthly_income - monthly_expenses)
+    total_contributions = monthly_savings * 12 * years
+    scenarios = {}
+    for name, percentile in SCENARIO_PERCENTILES.items():
+        chosen = ranked[_rank(simulations, percentile)]
+        path = assets[:, chosen]
+        scenarios[name] = {
+            "percentile": percentile,
+            "final_assets": round(float(path[-1]), 2),
+            "years_to_goal": _years_to_goal(path, total_required),
+            "total_contributions": round(total_contributions, 2),
+            "investment_growth": round(float(path[-1]) - current_assets - total_contributions, 2),
+            "path": _round_list(path[indices]),
+        }
+
+    shortfalls = total_required - finals[~succeeded]
+    returns = draws["returns"]
+    event_counts = draws["event_counts"]
+    risk_factors = []
+    if np.mean(np.any(np.abs(returns) > 0.20, axis=0)) > 0.3:
+        risk_factors.append("market_volatility")
+    if np.mean(np.any(draws["inflation"] > 0.05, axis=0)) > 0.2:
+        risk_factors.append("inflation_risk")
+    if np.mean(event_counts > 2) > 0.4:
+        risk_factors.append("life_events")
+
+    return {
+        "simulations": simulations,
+        "years_projected": years,
+        "target_amount": round(float(total_required), 2),
+        "current_amount": round(float(current_assets), 2),
+        "success_rate": success_rate,
+        "confidence_level": confidence,
+        "final_asset_percentiles": final_percentiles,
+        "averages": {
+            "final_assets": round(float(finals.mean()), 2),
+            "total_return": round(float((finals.mean() - current_assets) / current_assets), 4) if current_assets else 0.0,
+            "life_events_per_simulation": round(float(event_counts.mean()), 2),
+        },
+        "average_shortfall": round(float(shortfalls.mean()), 2) if shortfalls.size else 0.0,
+        "risk_factors": risk_factors,
+        "scenarios": scenarios,
+        "fan_chart": {
+            "years": chart_years,
+            "bands": {f"p{p}": _round_list(band[indices]) for p, band in zip(BAND_PERCENTILES, bands)},
+        },
+        "visualization": {
+            "confidence_gauge": {"value": success_rate, **confidence},
+            "scenario_comparison": {
+                "labels": ["Pessimistic", "Realistic", "Optimistic"],
+                "final_assets": [
+                    scenarios["pessimistic"]["final_assets"],
+                    scenarios["realistic"]["final_assets"],
+                    scenarios["optimistic"]["final_assets"],
+                ],
+            },
+            "probability_distribution": {
+                "labels": ["10th", "25th", "50th", "75th", "90th"],
+                "percentiles": list(final_percentiles.values()),
+            },
+        },
+    }
+
+
+def simulate_projection(
+    current_assets: float,
+    monthly_income: float,
+    monthly_expenses: float,
+    years: int,
+    simulations: int,
+    seed: int,
+    asset_allocation: Optional[dict] = None,
+    include_life_events: bool = True,
+) -> tuple:
+    """Draw market and life events and project every path - returns (draws, paths)"""
+    rng = np.random.default_rng(seed)
+    returns, inflation = _draw_market(rng, simulations, years, asset_allocation or DEFAULT_ALLOCATION)
+    if include_life_events:
+        draws = _draw_life_events(rng, simulations, years)
+    else:
+        draws = {
+            "income_factor": np.ones((years, simulations)),
+            "paused_months": np.zeros((years, simulations)),
+            "one_time_costs": np.zeros((years, simulations)),
+            "event_counts": np.zeros(simulations, dtype=np.int32),
+        }
+    draws["returns"] = returns
+    draws["inflation"] = inflation
+
+    paths = project_paths(draws, current_assets, monthly_income, monthly_expenses)
+    return draws, paths
+
+
+def resolve_options(
+    profile: dict,
+    goals: dict,
+    simulations: int,
+    years: Optional[int],
+    include_life_events: bool,
+    seed: Optional[int],
+) -> tuple:
+    """Clamp simulations/years and derive the seed from the inputs when none is given"""
+    simulations = max(1, min(int(simulations), MAX_SIMULATIONS))
+    years = max(1, min(int(years or goals.get("years_to_someday") or DEFAULT_YEARS), MAX_YEARS))
+    if seed is None:
+        seed = int(projection_key(profile, goals, {
+            "simulations": simulations,
+            "years": years,
+            "include_life_events": include_life_events,
+        })[:8], 16)
+    return simulations, years, seed
+
+
+def run_someday_projection(
+    profile: dict,
+    goals: dict,
+    simulations: int = DEFAULT_SIMULATIONS,
+    years: Optional[int] = None,
+    include_life_events: bool = True,
+    seed: Optional[int] = None,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> dict:
+    """
+    Run the someday life Monte Carlo projection.
+
+    Args:
+        profile: current_assets, monthly_income, monthly_expenses and an
+            optional asset_allocation ({"stocks": 70, "bonds": 20, "cash": 10})
+        goals: total_required and years_to_someday
+        simulations: Number of simulated futures (capped at MAX_SIMULATIONS)
+        years: Years to project (defaults to goals["years_to_someday"])
+        include_life_events: Whether to apply job loss, promotions and big expenses
+        seed: Random seed - defaults to one derived from the inputs, so the
+            same inputs always give the same projection
+        max_points: Maximum points per chart series
+
+    Returns:
+        Projection summary (see summarize_projection) plus the seed used
+    """
+    simulations, years, seed = resolve_options(profile, goals, simulations, years, include_life_events, seed)
+
+    draws, paths = simulate_projection(
+        profile["current_assets"],
+        profile["monthly_income"],
+        profile["monthly_expenses"],
+        years,
+        simulations,
+        seed,
+        profile.get("asset_allocation"),
+        include_life_events,
+    )
+    result = summarize_projection(
+        paths,
+        draws,
+        profile["current_assets"],
+        profile["monthly_income"],
+        profile["monthly_expenses"],
+        goals["total_required"],
+        max_points,
+    )
+    result["seed"] = seed
+    return result
+
+
+def projection_key(profile: dict, goals: dict, options: dict) -> str:
+    """Stable hash of everything a projection depends on"""
+    canonical = json.dumps(
+        {"profile": profile, "goals": goals, "options": options},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ProjectionCache:
+    """
+    Small thread-safe LRU of finished projections keyed by projection_key.
+
+    Projections are deterministic for their inputs, so entries never go
+    stale - they only fall out when the cache is full.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(0, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: dict):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared cache for the API process - compute workers never touch it
+projection_cache = ProjectionCache(settings.projection_cache_size)
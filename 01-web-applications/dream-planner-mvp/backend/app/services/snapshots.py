@@ -0,0 +1,72 @@
+"""
+Dream progress snapshot recording
+
+Rollups are maintained on write rather than computed on read: each
+savings change is one upsert per resolution (day, week, month) that moves
+the closing amount and widens the low/high range. Charts then read
+ready-made points instead of replaying raw history.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.snapshot import DreamSnapshot, SnapshotResolution
+from app.models.sql_functions import dialect_insert
+
+def period_start(day: date, resolution: SnapshotResolution) -> date:
+    """First day of the period containing `day`"""
+    if resolution == SnapshotResolution.week:
+        return day - timedelta(days=day.weekday())
+    if resolution == SnapshotResolution.month:
+        return day.replace(day=1)
+    return day
+
+async def record_snapshots(
+    db: AsyncSession,
+    points: Iterable[Tuple[int, float, float]],
+    day: Optional[date] = None,
+):
+    """
+    Record (dream_id, current_saved, target_amount) for each dream into its
+    day, week and month snapshots.
+
+    Runs inside the caller's transaction, so the snapshot commits (or rolls
+    back) together with the change it describes.
+    """
+    day = day or date.today()
+    rows = []
+    for dream_id, saved, target_amount in points:
+        saved = saved or 0.0
+        for resolution in SnapshotResolution:
+            rows.append({
+                "dream_id": dream_id,
+                "resolution": resolution,
+                "period_start": period_start(day, resolution),
+                "opening_saved": saved,
+                "closing_saved": saved,
+                "low_saved": saved,
+                "high_saved": saved,
+                "target_amount": target_amount,
+                "updates": 1,
+            })
+    if not rows:
+        return
+
+    table = DreamSnapshot.__table__
+    stmt = dialect_insert(db.bind)(DreamSnapshot)
+    new = stmt.excluded
+    # The opening amount is kept from the first write in the period
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.dream_id, table.c.resolution, table.c.period_start],
+        set_={
+            "closing_saved": new.closing_saved,
+            "low_saved": case((table.c.low_saved < new.low_saved, table.c.low_saved), else_=new.low_saved),
+            "high_saved": case((table.c.high_saved > new.high_saved, table.c.high_saved), else_=new.high_saved),
+            "target_amount": new.target_amount,
+            "updates": table.c.updates + 1,
+        }
+    )
+    await db.execute(stmt, rows)
@@ -0,0 +1,339 @@
+"""
+Spending intelligence: incremental aggregates, predictions and anomalies
+
+Server-side version of the frontend's spendingIntelligence.js. Instead of
+filtering and sorting the whole history for every category on every call,
+transactions are folded into per-category monthly statistics when they
+arrive (Welford/Chan merges, so mean and variance stay exact without
+keeping the amounts). Predictions and anomaly checks then read at most a
+year of monthly rows plus twelve seasonal rows per category.
+"""
+
+import calendar
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.spending import SpendingMonth, SpendingSeason
+from app.models.sql_functions import dialect_insert
+
+# Built-in seasonal patterns by calendar month, used until a category has a
+# year of history to learn its own (same figures as the frontend)
+SEASONAL_PATTERNS = {
+    "groceries": [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.1, 1.1, 1.0, 1.0, 1.2, 1.3],
+    "utilities": [1.3, 1.2, 1.1, 1.0, 0.9, 0.8, 0.8, 0.8, 0.9, 1.0, 1.1, 1.2],
+    "entertainment": [1.0, 1.0, 1.1, 1.1, 1.2, 1.3, 1.3, 1.2, 1.0, 1.0, 1.1, 1.2],
+    "clothing": [0.9, 0.9, 1.1, 1.2, 1.1, 1.0, 0.9, 1.1, 1.2, 1.1, 1.2, 1.3],
+    "travel": [0.8, 0.8, 1.1, 1.2, 1.3, 1.4, 1.5, 1.4, 1.1, 1.0, 0.9, 1.2],
+    "healthcare": [1.1, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.1, 1.1, 1.0],
+}
+
+# Months of history (including the current one) predictions look at
+HISTORY_MONTHS = 12
+
+# Months with spending needed before a category's own seasonal factors are used
+MIN_SEASONAL_HISTORY = 12
+
+# Learned seasonal factors are clamped to this range
+SEASONAL_FACTOR_RANGE = (0.5, 2.0)
+
+# Recent average this far from the overall average counts as a trend
+TREND_THRESHOLD = 0.15
+
+# (minor, major) relative deviations per anomaly sensitivity
+ANOMALY_THRESHOLDS = {
+    "low": (0.5, 1.0),
+    "medium": (0.3, 0.7),
+    "high": (0.2, 0.5),
+}
+
+# Rows per upsert statement (keeps SQLite under its bound-parameter limit)
+UPSERT_CHUNK = 500
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) `month`"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+class RunningStats:
+    """Count, total, mean, M2, min and max of a stream of amounts"""
+
+    __slots__ = ("count", "total", "mean", "m2", "min_amount", "max_amount")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_amount = float("inf")
+        self.max_amount = float("-inf")
+
+    def add(self, amount: float):
+        # Welford's update - numerically stable, one pass
+        self.count += 1
+        self.total += amount
+        delta = amount - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (amount - self.mean)
+        self.min_amount = min(self.min_amount, amount)
+        self.max_amount = max(self.max_amount, amount)
+
+    def merge(self, count: int, mean: float, m2: float):
+        """Fold in another set's count/mean/M2 (Chan et al.)"""
+        if count == 0:
+            return
+        combined = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / combined
+        self.m2 += m2 + delta * delta * self.count * count / combined
+        self.count = combined
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+async def ingest_spending(db: AsyncSession, user_id: int, transactions: Iterable[Tuple[str, float, date]]) -> dict:
+    """
+    Fold (category, amount, day) transactions into the user's aggregates.
+
+    The batch is summarized in memory first, so each touched month costs one
+    upsert however many transactions it had. Doesn't commit.
+
+    Returns:
+        Counts of transactions, categories and months touched
+    """
+    groups: Dict[Tuple[str, date], RunningStats] = {}
+    ingested = 0
+    for category, amount, day in transactions:
+        key = (category, month_start(day))
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = RunningStats()
+        stats.add(amount)
+        ingested += 1
+    if not groups:
+        return {"ingested": 0, "categories": 0, "months": 0}
+
+    table = SpendingMonth.__table__
+    insert = dialect_insert(db.bind)
+    new_months = set()
+    items = list(groups.items())
+    for offset in range(0, len(items), UPSERT_CHUNK):
+        chunk = items[offset:offset + UPSERT_CHUNK]
+        stmt = insert(SpendingMonth).values([
+            {
+                "user_id": user_id,
+                "category": category,
+                "month": month,
+                "count": stats.count,
+                "total": stats.total,
+                "mean": stats.mean,
+                "m2": stats.m2,
+                "min_amount": stats.min_amount,
+                "max_amount": stats.max_amount,
+            }
+            for (category, month), stats in chunk
+        ])
+        new = stmt.excluded
+        combined = table.c.count + new.count
+        delta = new.mean - table.c.mean
+        # Parallel merge of the stored and incoming statistics, done by the database
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.category, table.c.month],
+            set_={
+                "count": combined,
+                "total": table.c.total + new.total,
+                "mean": table.c.mean + delta * new.count / combined,
+                "m2": table.c.m2 + new.m2 + delta * delta * table.c.count * new.count / combined,
+                "min_amount": case((new.min_amount < table.c.min_amount, new.min_amount), else_=table.c.min_amount),
+                "max_amount": case((new.max_amount > table.c.max_amount, new.max_amount), else_=table.c.max_amount),
+            }
+        ).returning(table.c.category, table.c.month, table.c.count)
+        for category, month, count in (await db.execute(stmt)).all():
+            # Only this batch's transactions in the row: the month is new
+            if count == groups[(category, month)].count:
+                new_months.add((category, month))
+
+    # Month totals by calendar month, for seasonal factors
+    seasons: Dict[Tuple[str, int], List[float]] = {}
+    for (category, month), stats in groups.items():
+        season = seasons.setdefault((category, month.month), [0.0, 0])
+        season[0] += stats.total
+        season[1] += (category, month) in new_months
+
+    season_table = SpendingSeason.__table__
+    season_items = list(seasons.items())
+    for offset in range(0, len(season_items), UPSERT_CHUNK):
+        stmt = insert(SpendingSeason).values([
+            {"user_id": user_id, "category": category, "month_of_year": month_of_year, "total": total, "months": months}
+            for (category, month_of_year), (total, months) in season_items[offset:offset + UPSERT_CHUNK]
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[season_table.c.user_id, season_table.c.category, season_table.c.month_of_year],
+            set_={
+                "total": season_table.c.total + stmt.excluded.total,
+                "months": season_table.c.months + stmt.excluded.months,
+            }
+        )
+        await db.execute(stmt)
+
+    return {
+        "ingested": ingested,
+        "categories": len({category for category, _ in groups}),
+        "months": len(groups),
+    }
+
+async def load_profile(db: AsyncSession, user_id: int, today: date) -> Dict[str, dict]:
+    """
+    The aggregates predictions need, per category: the last HISTORY_MONTHS
+    monthly rows (newest first) and the twelve seasonal rows.
+    """
+    since = add_months(month_start(today), -(HISTORY_MONTHS - 1))
+    profile: Dict[str, dict] = {}
+
+    months = await db.execute(
+        select(SpendingMonth)
+        .where(SpendingMonth.user_id == user_id, SpendingMonth.month >= since, SpendingMonth.month <= today)
+        .order_by(SpendingMonth.category, SpendingMonth.month.desc())
+    )
+    for row in months.scalars():
+        profile.setdefault(row.category, {"months": [], "seasonal": {}})["months"].append(row)
+
+    seasons = await db.execute(select(SpendingSeason).where(SpendingSeason.user_id == user_id))
+    for row in seasons.scalars():
+        if row.category in profile:
+            profile[row.category]["seasonal"][row.month_of_year] = (row.total, row.months)
+
+    return profile
+
+def seasonal_factor(category: str, seasonal: Dict[int, Tuple[float, int]], month_of_year: int) -> Tuple[float, bool]:
+    """
+    Factor for this calendar month: learned from the category's own history
+    once it spans a year, otherwise the built-in pattern.
+
+    Returns:
+        (factor, whether it was learned)
+    """
+    history_months = sum(months for _, months in seasonal.values())
+    total, months = seasonal.get(month_of_year, (0.0, 0))
+    if history_months >= MIN_SEASONAL_HISTORY and months:
+        overall = sum(total for total, _ in seasonal.values()) / history_months
+        if overall > 0:
+            low, high = SEASONAL_FACTOR_RANGE
+            return round(min(high, max(low, (total / months) / overall)), 2), True
+    pattern = SEASONAL_PATTERNS.get(category.lower())
+    return (pattern[month_of_year - 1] if pattern else 1.0), False
+
+def predict_category(category: str, data: dict, today: date) -> dict:
+    """Next-month spending prediction for one category (mirrors predictMonthlyNeeds)"""
+    totals = [row.total for row in data["months"]]  # Newest first
+    recent = totals[:3]
+    rolling_average = sum(recent) / len(recent)
+    overall_average = sum(totals) / len(totals)
+
+    trend = "stable"
+    if rolling_average > overall_average * (1 + TREND_THRESHOLD):
+        trend = "increasing"
+    elif rolling_average < overall_average * (1 - TREND_THRESHOLD):
+        trend = "decreasing"
+
+    factor, learned = seasonal_factor(category, data["seasonal"], today.month)
+
+    variance = sum((total - rolling_average) ** 2 for total in recent) / len(recent)
+    cv = variance ** 0.5 / rolling_average if rolling_average > 0 else 0.0
+    confidence = "low" if cv > 0.5 else "medium" if cv > 0.25 else "high"
+
+    # Typical single transaction across the window, merged from the monthly rows
+    transactions = RunningStats()
+    for row in data["months"]:
+        transactions.merge(row.count, row.mean, row.m2)
+
+    insight = f"Based on your last {len(recent)} months, you typically spend ${round(rolling_average)} on {category}"
+    if trend == "increasing":
+        insight += ". Your spending in this category has been trending upward."
+    elif trend == "decreasing":
+        insight += ". Your spending in this category has been trending downward."
+    if factor != 1.0:
+        change = round((factor - 1) * 100)
+        direction = "higher" if change > 0 else "lower"
+        insight += f" This month typically sees {abs(change)}% {direction} spending."
+
+    return {
+        "category": category,
+        "predicted_amount": round(rolling_average * factor),
+        "confidence": confidence,
+        "trend": trend,
+        "seasonal_factor": factor,
+        "seasonal_learned": learned,
+        "historical_average": round(overall_average),
+        "data_points": len(totals),
+        "average_transaction": round(transactions.mean, 2),
+        "transaction_stddev": round(transactions.variance ** 0.5, 2),
+        "insight": insight,
+    }
+
+def check_category(category: str, data: dict, today: date, sensitivity: str = "medium") -> dict:
+    """
+    Compare this month's spending so far with the same share of a typical
+    month (mirrors detectAnomalies).
+    """
+    minor, major = ANOMALY_THRESHOLDS.get(sensitivity, ANOMALY_THRESHOLDS["medium"])
+    current_month = month_start(today)
+    current = sum(row.total for row in data["months"] if row.month == current_month)
+    history = [row.total for row in data["months"] if row.month < current_month]
+
+    result = {"category": category, "current_spend": round(current, 2), "threshold": {"minor": minor, "major": major}}
+    if not history:
+        return {
+            **result,
+            "is_anomaly": current > 0,
+            "severity": "new_category" if current > 0 else "none",
+            "message": f"New spending detected in {category}" if current > 0 else "No spending detected",
+            "recommendation": "Consider if this aligns with your goals" if current > 0 else None,
+            "expected_spend": 0.0,
+            "percentage_change": None,
+        }
+
+    elapsed = today.day / calendar.monthrange(today.year, today.month)[1]
+    expected = sum(history) / len(history) * elapsed
+    change = (current - expected) / expected if expected > 0 else 0.0
+
+    severity = "none"
+    if abs(change) >= major:
+        severity = "major"
+    elif abs(change) >= minor:
+        severity = "minor"
+
+    recommendation = None
+    if severity == "none":
+        message = f"Your {category} spending is within normal range"
+    else:
+        direction = "higher" if change > 0 else "lower"
+        message = f"Your {category} spending is {round(abs(change) * 100)}% {direction} than usual"
+        if change > 0:
+            recommendation = (
+                "This significant increase might impact your dream timeline. Consider if this was planned or if adjustments are needed."
+                if severity == "major" else
+                "Slight increase noticed. This could be seasonal or due to special circumstances."
+            )
+        else:
+            recommendation = (
+                "Great job reducing spending in this category! This could accelerate your dreams."
+                if severity == "major" else
+                "Nice work keeping spending lower than usual in this category."
+            )
+
+    return {
+        **result,
+        "is_anomaly": severity != "none",
+        "severity": severity,
+        "message": message,
+        "recommendation": recommendation,
+        "expected_spend": round(expected, 2),
+        "percentage_change": round(change * 100),
+    }
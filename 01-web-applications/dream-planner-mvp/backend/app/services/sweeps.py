@@ -0,0 +1,158 @@
+"""
+Scheduled sweeps over the dreams table
+
+Each sweep is a scheduler step: it handles one id-ordered chunk of dreams
+after the cursor and returns where to continue. Everything here is
+idempotent - a chunk that is re-run after a failure changes nothing twice.
+
+- metrics_rollover (daily): recompute memoized dream metrics for the new day
+- complete_funded (every few minutes): mark active dreams whose savings
+  reached the target as completed
+- daily_nudges (daily): write today's nudge for every active dream
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.scheduler import Job, Scheduler
+from app.models.dream import Dream, DreamStatus
+from app.models.nudge import DreamNudge, NudgeKind
+from app.models.sql_functions import dialect_insert
+from app.services.metrics import DreamMetrics, compute_metrics_batch, dream_metrics
+
+# Nudges about the deadline start this many days before the target date
+DEADLINE_NUDGE_DAYS = 30
+
+# Progress this many points behind the share of time elapsed counts as behind pace
+BEHIND_PACE_POINTS = 10.0
+
+async def rollover_metrics(db: AsyncSession, cursor: Optional[int], batch_size: int) -> Tuple[Optional[int], int]:
+    """Recompute the metrics memo for today (in memory - one step)"""
+    return None, dream_metrics.rollover()
+
+async def complete_funded(db: AsyncSession, cursor: Optional[int], batch_size: int) -> Tuple[Optional[int], int, list]:
+    """Mark the next chunk of funded active dreams as completed; also returns (user_id, dream_id) of each"""
+    rows = (await db.execute(
+        select(Dream.id, Dream.user_id, Dream.title)
+        .where(
+            Dream.id > (cursor or 0),
+            Dream.status == DreamStatus.active,
+            Dream.current_saved >= Dream.target_amount
+        )
+        .order_by(Dream.id)
+        .limit(batch_size)
+    )).all()
+    if not rows:
+        return None, 0, []
+
+    ids = [row.id for row in rows]
+    # Re-check the condition so a dream edited since the select is left alone
+    completed = (await db.execute(
+        update(Dream)
+        .where(Dream.id.in_(ids), Dream.status == DreamStatus.active, Dream.current_saved >= Dream.target_amount)
+        .values(status=DreamStatus.completed)
+        .returning(Dream.id, Dream.user_id, Dream.title)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await _add_nudges(db, [
+        (row.user_id, row.id, NudgeKind.completed, f"{row.title} is fully funded - time to make it happen!")
+        for row in completed
+    ])
+
+    cursor = ids[-1] if len(rows) == batch_size else None
+    return cursor, len(completed), [(row.user_id, row.id) for row in completed]
+
+async def invalidate_dreams(changed: list):
+    """Drop cached responses of (user_id, dream_id) pairs a committed chunk changed"""
+    for user_id, dream_id in changed:
+        await response_cache.invalidate_dream(user_id, dream_id)
+
+async def daily_nudges(db: AsyncSession, cursor: Optional[int], batch_size: int) -> Tuple[Optional[int], int]:
+    """Write today's nudge for the next chunk of active dreams"""
+    today = date.today()
+    if cursor is None:
+        # Start of a sweep: drop nudges past the retention window
+        await db.execute(
+            delete(DreamNudge).where(DreamNudge.nudge_date < today - timedelta(days=settings.nudge_retention_days))
+        )
+
+    rows = (await db.execute(
+        select(
+            Dream.id, Dream.user_id, Dream.title, Dream.target_amount,
+            Dream.current_saved, Dream.target_date, Dream.created_at
+        )
+        .where(Dream.id > (cursor or 0), Dream.status == DreamStatus.active)
+        .order_by(Dream.id)
+        .limit(batch_size)
+    )).all()
+    if not rows:
+        return None, 0
+
+    all_metrics = compute_metrics_batch(
+        [(row.target_amount, row.current_saved or 0.0, row.target_date) for row in rows], today
+    )
+    await _add_nudges(db, [
+        (row.user_id, row.id, *pick_nudge(row, metrics, today))
+        for row, metrics in zip(rows, all_metrics)
+    ])
+
+    return (rows[-1].id if len(rows) == batch_size else None), len(rows)
+
+def pick_nudge(dream, metrics: DreamMetrics, today: date) -> Tuple[NudgeKind, str]:
+    """The single most useful nudge for a dream today"""
+    title = dream.title
+    if metrics.progress_percentage >= 100:
+        return NudgeKind.completed, f"{title} is fully funded - time to make it happen!"
+    if 0 < metrics.days_remaining <= DEADLINE_NUDGE_DAYS:
+        return NudgeKind.deadline_near, (
+            f"{metrics.days_remaining} days left for {title} - "
+            f"${metrics.daily_amount:.2f}/day closes the ${metrics.amount_remaining:,.0f} gap"
+        )
+    if not metrics.is_achievable:
+        return NudgeKind.stretch, (
+            f"{title} needs ${metrics.daily_amount:.2f}/day - a later date or a smaller first step keeps it within reach"
+        )
+
+    created = dream.created_at.date() if isinstance(dream.created_at, datetime) else today
+    target = dream.target_date.date() if isinstance(dream.target_date, datetime) else dream.target_date
+    span = (target - created).days
+    elapsed = 100.0 * (today - created).days / span if span > 0 else 0.0
+    if metrics.progress_percentage + BEHIND_PACE_POINTS < elapsed:
+        return NudgeKind.behind_pace, (
+            f"{title} is {metrics.progress_percentage:.0f}% funded with {elapsed:.0f}% of the time gone - "
+            f"${metrics.weekly_amount:.2f} this week gets you back on pace"
+        )
+    return NudgeKind.on_track, (
+        f"${metrics.daily_amount:.2f} today keeps {title} on track - about {metrics.coffees:g} coffees"
+    )
+
+async def _add_nudges(db: AsyncSession, nudges: list):
+    """Upsert (user_id, dream_id, kind, message) nudges for today - the latest replaces a dream's earlier one"""
+    if not nudges:
+        return
+    table = DreamNudge.__table__
+    today = date.today()
+    insert = dialect_insert(db.bind)(DreamNudge)
+    await db.execute(
+        insert.on_conflict_do_update(
+            index_elements=[table.c.dream_id, table.c.nudge_date],
+            set_={"kind": insert.excluded.kind, "message": insert.excluded.message}
+        ),
+        [
+            {"user_id": user_id, "dream_id": dream_id, "nudge_date": today, "kind": kind, "message": message[:300]}
+            for user_id, dream_id, kind, message in nudges
+        ]
+    )
+
+def register_jobs(scheduler: Scheduler):
+    """Add the dream sweeps to a scheduler"""
+    scheduler.register(Job("metrics_rollover", rollover_metrics, daily=True, jitter=5.0))
+    scheduler.register(Job(
+        "complete_funded", complete_funded, interval=settings.auto_complete_interval, on_commit=invalidate_dreams
+    ))
+    scheduler.register(Job("daily_nudges", daily_nudges, daily=True))
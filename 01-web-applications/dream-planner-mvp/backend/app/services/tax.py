@@ -0,0 +1,343 @@
+"""
+Tax engine for Dream Planner
+
+Federal and state income-tax schedules are compiled once, at import, into
+sorted arrays: each bracket's lower bound, its rate, and the tax owed on
+everything below it. Tax on any income is then a binary search
+(np.searchsorted) plus one multiply-add, and works on whole arrays of
+incomes at once - no walking the bracket list per call.
+
+On top of that, after_tax_needs scores every (dream x savings vehicle)
+pair in one set of array operations: how much pre-tax income each dream
+costs per month through each vehicle, the taxes paid along the way, and
+whether the contributions fit the vehicle's annual limit.
+
+Figures are 2024 federal brackets and simplified flat state rates, the
+same tables the frontend's taxOptimizer uses.
+"""
+
+import enum
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+class FilingStatus(str, enum.Enum):
+    """Federal filing statuses"""
+    single = "single"
+    married_jointly = "married_jointly"
+    married_separately = "married_separately"
+    head_of_household = "head_of_household"
+
+class SavingsVehicle(str, enum.Enum):
+    """Accounts a dream can be saved in"""
+    taxable = "taxable"                    # Regular brokerage/savings account
+    traditional_401k = "traditional_401k"
+    traditional_ira = "traditional_ira"
+    roth_401k = "roth_401k"
+    roth_ira = "roth_ira"
+    hsa = "hsa"                            # Health savings account (medical goals)
+
+# 2024 federal brackets: (lower bound of taxable income, rate)
+FEDERAL_BRACKETS_2024 = {
+    FilingStatus.single: [
+        (0, 0.10), (11_000, 0.12), (44_725, 0.22), (95_375, 0.24),
+        (182_050, 0.32), (231_250, 0.35), (578_125, 0.37),
+    ],
+    FilingStatus.married_jointly: [
+        (0, 0.10), (22_000, 0.12), (89_450, 0.22), (190_750, 0.24),
+        (364_200, 0.32), (462_500, 0.35), (693_750, 0.37),
+    ],
+    FilingStatus.married_separately: [
+        (0, 0.10), (11_000, 0.12), (44_725, 0.22), (95_375, 0.24),
+        (182_100, 0.32), (231_250, 0.35), (346_875, 0.37),
+    ],
+    FilingStatus.head_of_household: [
+        (0, 0.10), (15_700, 0.12), (59_850, 0.22), (95_350, 0.24),
+        (182_050, 0.32), (231_250, 0.35), (578_100, 0.37),
+    ],
+}
+
+STANDARD_DEDUCTIONS_2024 = {
+    FilingStatus.single: 14_600,
+    FilingStatus.married_jointly: 29_200,
+    FilingStatus.married_separately: 14_600,
+    FilingStatus.head_of_household: 21_900,
+}
+
+# Simplified flat state rates on taxable income (0 where there is no income tax)
+STATE_TAX_RATES = {
+    "Alaska": 0, "Florida": 0, "Nevada": 0, "New Hampshire": 0, "South Dakota": 0,
+    "Tennessee": 0, "Texas": 0, "Washington": 0, "Wyoming": 0,
+    "Utah": 0.0485, "North Dakota": 0.029, "Pennsylvania": 0.0307, "Indiana": 0.0323,
+    "Colorado": 0.0455, "Illinois": 0.0495, "Iowa": 0.0853, "Kansas": 0.057,
+    "Kentucky": 0.05, "Louisiana": 0.06, "Michigan": 0.0425, "Mississippi": 0.05,
+    "Missouri": 0.054, "Montana": 0.0675, "Nebraska": 0.0684, "North Carolina": 0.0499,
+    "Ohio": 0.0399, "Oklahoma": 0.05, "South Carolina": 0.07, "West Virginia": 0.065,
+    "Wisconsin": 0.0765,
+    "Alabama": 0.05, "Arizona": 0.045, "Arkansas": 0.0695, "Connecticut": 0.0699,
+    "Delaware": 0.066, "Georgia": 0.0575, "Idaho": 0.058, "Maine": 0.0715,
+    "Maryland": 0.0575, "Massachusetts": 0.05, "Minnesota": 0.0985, "New Mexico": 0.059,
+    "Rhode Island": 0.0599, "Vermont": 0.0895, "Virginia": 0.0575,
+    "California": 0.133, "Hawaii": 0.11, "New Jersey": 0.1075, "New York": 0.109,
+    "Oregon": 0.099, "District of Columbia": 0.0975,
+}
+
+# Long-term capital gains rate on taxable-account growth
+CAPITAL_GAINS_RATE = 0.15
+
+# Penalty on early withdrawals from retirement accounts, and the age it stops
+EARLY_WITHDRAWAL_PENALTY = 0.10
+PENALTY_FREE_AGE = 59.5
+
+# Retirement assumptions, matching the client: brackets grow with inflation
+# and retirement income is 70% of today's
+RETIREMENT_AGE = 65
+RETIREMENT_INCOME_RATIO = 0.70
+BRACKET_INFLATION = 0.03
+
+# Annual return assumed inside every vehicle
+DEFAULT_ANNUAL_RETURN = 0.07
+
+class VehicleRules(NamedTuple):
+    """How a vehicle is taxed going in and coming out"""
+    pre_tax: bool                 # Contributions come out of pre-tax income
+    withdrawal: str               # "gains" (capital gains on growth), "ordinary" (whole balance),
+                                  # "roth" (growth tax-free once qualified) or "free"
+    annual_limit: float
+    catch_up_limit: float         # Limit once catch_up_age is reached
+    catch_up_age: int
+
+# 2024 contribution limits; HSA withdrawals assume qualified medical spending
+VEHICLE_RULES = {
+    SavingsVehicle.taxable: VehicleRules(False, "gains", float("inf"), float("inf"), 0),
+    SavingsVehicle.traditional_401k: VehicleRules(True, "ordinary", 23_000, 30_500, 50),
+    SavingsVehicle.traditional_ira: VehicleRules(True, "ordinary", 7_000, 8_000, 50),
+    SavingsVehicle.roth_401k: VehicleRules(False, "roth", 23_000, 30_500, 50),
+    SavingsVehicle.roth_ira: VehicleRules(False, "roth", 7_000, 8_000, 50),
+    SavingsVehicle.hsa: VehicleRules(True, "free", 4_300, 5_300, 55),
+}
+
+# Compared unless the caller picks vehicles - the HSA only fits medical goals
+DEFAULT_VEHICLES = tuple(vehicle for vehicle in SavingsVehicle if vehicle != SavingsVehicle.hsa)
+
+class BracketSchedule:
+    """
+    A progressive schedule compiled to sorted arrays.
+
+    thresholds[k] is the lower bound of bracket k, rates[k] its rate and
+    base[k] the tax owed on income up to thresholds[k], so the tax on x in
+    bracket k is base[k] + (x - thresholds[k]) * rates[k].
+    """
+
+    def __init__(self, brackets: Sequence[Tuple[float, float]]):
+        brackets = sorted(brackets)
+        self.thresholds = np.array([lower for lower, _ in brackets], dtype=np.float64)
+        self.rates = np.array([rate for _, rate in brackets], dtype=np.float64)
+        widths = np.diff(self.thresholds)
+        self.base = np.concatenate(([0.0], np.cumsum(widths * self.rates[:-1])))
+        for array in (self.thresholds, self.rates, self.base):
+            array.flags.writeable = False  # Shared by every request
+
+    def bracket(self, taxable_income) -> np.ndarray:
+        """Index of the bracket each income falls in (an income on a threshold is in the upper bracket)"""
+        income = np.maximum(np.asarray(taxable_income, dtype=np.float64), 0.0)
+        return np.searchsorted(self.thresholds, income, side="right") - 1
+
+    def tax(self, taxable_income) -> np.ndarray:
+        income = np.maximum(np.asarray(taxable_income, dtype=np.float64), 0.0)
+        k = self.bracket(income)
+        return self.base[k] + (income - self.thresholds[k]) * self.rates[k]
+
+    def marginal_rate(self, taxable_income) -> np.ndarray:
+        return self.rates[self.bracket(taxable_income)]
+
+    def scaled(self, factor: float) -> "BracketSchedule":
+        """The same rates with every threshold multiplied by factor (inflation indexing)"""
+        return BracketSchedule(list(zip((self.thresholds * factor).tolist(), self.rates.tolist())))
+
+# Compiled once - every request reads these
+FEDERAL_SCHEDULES: Dict[FilingStatus, BracketSchedule] = {
+    status: BracketSchedule(brackets) for status, brackets in FEDERAL_BRACKETS_2024.items()
+}
+STATE_SCHEDULES: Dict[str, BracketSchedule] = {
+    state: BracketSchedule([(0, rate)]) for state, rate in STATE_TAX_RATES.items()
+}
+_STATE_NAMES = {state.lower(): state for state in STATE_TAX_RATES}
+
+def resolve_state(state: str) -> Optional[str]:
+    """Canonical state name for a case-insensitive name, or None if unknown"""
+    return _STATE_NAMES.get(state.strip().lower())
+
+class TaxRates(NamedTuple):
+    """Tax on arrays of gross incomes (all fields aligned with the incomes)"""
+    taxable_income: np.ndarray
+    federal_tax: np.ndarray
+    state_tax: np.ndarray
+    total_tax: np.ndarray
+    effective_rate: np.ndarray   # Total tax / gross income
+    marginal_rate: np.ndarray    # Federal + state rate on the next dollar
+
+def tax_rates(
+    gross_income,
+    state: str,
+    filing_status: FilingStatus = FilingStatus.single,
+    deductions: Optional[float] = None,
+    inflation_factor: float = 1.0,
+) -> TaxRates:
+    """
+    Federal and state tax for any number of gross incomes at once.
+
+    Args:
+        gross_income: Scalar or array of annual gross incomes
+        state: Canonical state name (see resolve_state)
+        filing_status: Federal filing status
+        deductions: Total deductions (defaults to the standard deduction)
+        inflation_factor: Scale brackets and the standard deduction for a future year
+
+    Returns:
+        TaxRates with arrays shaped like gross_income
+    """
+    gross = np.asarray(gross_income, dtype=np.float64)
+    federal = FEDERAL_SCHEDULES[filing_status]
+    if deductions is None:
+        deductions = STANDARD_DEDUCTIONS_2024[filing_status] * inflation_factor
+    if inflation_factor != 1.0:
+        federal = federal.scaled(inflation_factor)
+    state_schedule = STATE_SCHEDULES[state]
+
+    taxable = np.maximum(gross - deductions, 0.0)
+    federal_tax = federal.tax(taxable)
+    state_tax = state_schedule.tax(taxable)
+    total = federal_tax + state_tax
+    effective = np.divide(total, gross, out=np.zeros_like(total), where=gross > 0)
+    marginal = federal.marginal_rate(taxable) + state_schedule.marginal_rate(taxable)
+    return TaxRates(taxable, federal_tax, state_tax, total, effective, marginal)
+
+class TaxProfile(NamedTuple):
+    """The user's tax situation"""
+    gross_income: float
+    state: str
+    filing_status: FilingStatus
+    age: int
+    deductions: Optional[float] = None
+
+def retirement_rates(profile: TaxProfile) -> TaxRates:
+    """Projected tax on retirement income, with brackets indexed to the retirement year"""
+    years = max(1, RETIREMENT_AGE - profile.age)
+    return tax_rates(
+        profile.gross_income * RETIREMENT_INCOME_RATIO,
+        profile.state,
+        profile.filing_status,
+        inflation_factor=(1.0 + BRACKET_INFLATION) ** years,
+    )
+
+class AfterTaxNeeds(NamedTuple):
+    """
+    Per-dream arrays (shape (dreams,)) and per (dream, vehicle) arrays
+    (shape (dreams, vehicles)).
+    """
+    vehicles: Tuple[SavingsVehicle, ...]
+    is_retirement_goal: np.ndarray
+    applicable_rate: np.ndarray          # Tax rate on income set aside for the goal
+    gross_needed: np.ndarray             # Pre-tax income to end up with the amount
+    monthly_income: np.ndarray           # Pre-tax income per month through each vehicle
+    monthly_contribution: np.ndarray     # What actually goes into the account
+    taxes_paid: np.ndarray               # Income tax on contributions plus tax on withdrawal
+    within_limit: np.ndarray             # Annual contributions fit the vehicle's limit
+    best_vehicle: np.ndarray             # Per dream: index of the cheapest vehicle within limits (-1: none fits)
+
+def after_tax_needs(
+    amounts,
+    years,
+    profile: TaxProfile,
+    vehicles: Sequence[SavingsVehicle] = DEFAULT_VEHICLES,
+    annual_return: float = DEFAULT_ANNUAL_RETURN,
+) -> AfterTaxNeeds:
+    """
+    What every dream costs through every vehicle, in one pass.
+
+    For each vehicle, one dollar of monthly pre-tax income becomes a
+    contribution (the whole dollar for pre-tax vehicles, the dollar less
+    the marginal rate otherwise), grows as a monthly annuity, and is taxed
+    on the way out by the vehicle's rules. Dividing each dream's after-tax
+    amount by what that dollar delivers gives the monthly income needed.
+
+    Args:
+        amounts: After-tax amount each dream still needs
+        years: Years until each dream (must be positive)
+        profile: Income, state, filing status and age
+        vehicles: Vehicles to compare
+        annual_return: Expected return inside the vehicles
+
+    Returns:
+        AfterTaxNeeds arrays
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
+    vehicles = tuple(vehicles)
+    rules = [VEHICLE_RULES[vehicle] for vehicle in vehicles]
+
+    current = tax_rates(profile.gross_income, profile.state, profile.filing_status, profile.deductions)
+    retirement = retirement_rates(profile)
+    marginal = float(current.marginal_rate)
+
+    # Per dream: which rate applies when the money comes out, and the plain gross-up
+    is_retirement_goal = years >= max(1, RETIREMENT_AGE - profile.age)
+    applicable_rate = np.where(is_retirement_goal, float(retirement.effective_rate), float(current.effective_rate))
+    gross_needed = amounts / (1.0 - applicable_rate)
+    early = profile.age + years < PENALTY_FREE_AGE
+    ordinary_rate = np.where(is_retirement_goal, float(retirement.effective_rate), marginal)
+
+    # What $1/month of pre-tax income turns into, per dream (column vectors against vehicles)
+    months = np.maximum(np.round(years * 12.0), 1.0)[:, None]
+    monthly_rate = annual_return / 12.0
+    if monthly_rate == 0:
+        annuity = months
+    else:
+        annuity = np.expm1(months * np.log1p(monthly_rate)) / monthly_rate
+    early = early[:, None]
+    ordinary_rate = ordinary_rate[:, None]
+
+    pre_tax = np.array([rule.pre_tax for rule in rules])
+    contribution = np.where(pre_tax, 1.0, 1.0 - marginal)       # (vehicles,)
+    principal = contribution * months                            # (dreams, vehicles)
+    balance = contribution * annuity
+    growth = balance - principal
+
+    kinds = np.array([rule.withdrawal for rule in rules])
+    withdrawal_tax = np.select(
+        [kinds == "gains", kinds == "ordinary", kinds == "roth"],
+        [
+            CAPITAL_GAINS_RATE * growth,
+            (ordinary_rate + EARLY_WITHDRAWAL_PENALTY * early) * balance,
+            early * (marginal + EARLY_WITHDRAWAL_PENALTY) * growth,
+        ],
+        default=0.0,
+    )
+    delivered = balance - withdrawal_tax
+
+    monthly_income = amounts[:, None] / delivered
+    monthly_contribution = monthly_income * contribution
+    upfront_tax = np.where(pre_tax, 0.0, marginal) * monthly_income * months
+    taxes_paid = upfront_tax + withdrawal_tax * monthly_income
+
+    limits = np.array([
+        rule.catch_up_limit if profile.age >= rule.catch_up_age else rule.annual_limit for rule in rules
+    ])
+    within_limit = monthly_contribution * 12.0 <= limits
+
+    # Cheapest vehicle that can actually take the contributions
+    best_vehicle = np.argmin(np.where(within_limit, monthly_income, np.inf), axis=1)
+    best_vehicle[~within_limit.any(axis=1)] = -1
+
+    return AfterTaxNeeds(
+        vehicles=vehicles,
+        is_retirement_goal=is_retirement_goal,
+        applicable_rate=applicable_rate,
+        gross_needed=gross_needed,
+        monthly_income=monthly_income,
+        monthly_contribution=monthly_contribution,
+        taxes_paid=taxes_paid,
+        within_limit=within_limit,
+        best_vehicle=best_vehicle,
+    )
@@ -0,0 +1 @@
+# Performance benchmarks for the Dream Planner backend - run the whole suite with `python -m benchmarks`
@@ -0,0 +1,108 @@
+"""
+Benchmark suite runner
+
+Runs the micro-benchmarks and the API load benchmark at each database
+size, each in its own process (the app binds its engines at import),
+merges their results into one JSON document and compares it with a
+stored baseline, so a regression shows up as a number:
+
+    benchmark                          metric    baseline   current   change
+    api.100000.list_dreams_filtered    p95_ms       41.20     58.90   +43.0%  REGRESSED
+
+Typical use, from the backend directory:
+    python -m benchmarks --save-baseline            # on main, once per machine
+    python -m benchmarks --fail-on-regression       # on a branch
+
+Seeded databases are kept in --db-dir so the 1M-dream database is only
+built once. Baselines are only meaningful on the machine that made them.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import compare, environment, read_json, write_json
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def run_suite(module: str, arguments, tmp: str) -> dict:
+    """Run one benchmark module in a fresh interpreter and return its results"""
+    out = os.path.join(tmp, f"{module.rsplit('.', 1)[-1]}-{len(os.listdir(tmp))}.json")
+    command = [sys.executable, "-m", module, *map(str, arguments), "--json-out", out]
+    print(f"$ {' '.join(command[1:])}", flush=True)
+    subprocess.run(command, check=True)
+    return read_json(out)["results"]
+
+
+def print_changes(changes, tolerance: float):
+    print(f"\n{'benchmark':<44} {'metric':<16} {'baseline':>10} {'current':>10} {'change':>8}")
+    for row in changes:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['benchmark']:<44} {row['metric']:<16} {row['baseline']:>10} "
+            f"{row['current']:>10} {row['change']:>+8.1%}{flag}"
+        )
+    regressed = sum(row["regressed"] for row in changes)
+    print(f"\n{regressed} of {len(changes)} metrics regressed by more than {tolerance:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", nargs="+", choices=["micro", "api"], default=["micro", "api"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Dreams in each seeded database")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per API scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="API requests in flight")
+    parser.add_argument("--repeats", type=int, default=2000, help="Timed calls per micro-benchmark")
+    parser.add_argument("--db-dir", default=os.path.join(tempfile.gettempdir(), "dream-planner-bench"),
+                        help="Where seeded databases are kept between runs")
+    parser.add_argument("--output", default="benchmark-results.json", help="Results file (- for stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown before a metric counts as regressed")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 if anything regressed")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if "micro" in args.suites:
+            results.update(run_suite("benchmarks.micro", ["--repeats", args.repeats], tmp))
+        if "api" in args.suites:
+            for size in args.sizes:
+                results.update(run_suite("benchmarks.api", [
+                    "--dreams", size, "--requests", args.requests,
+                    "--concurrency", args.concurrency, "--db-dir", args.db_dir
+                ], tmp))
+
+    document = {
+        "environment": {**environment(), "concurrency": args.concurrency, "requests": args.requests},
+        "results": results,
+    }
+    write_json(args.output, document)
+    if args.output != "-":
+        print(f"\nWrote {len(results)} benchmark results to {args.output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, document)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} - run with --save-baseline to create one")
+        return
+
+    baseline = read_json(args.baseline)
+    if baseline["environment"].get("machine") != document["environment"]["machine"] or \
+            baseline["environment"].get("cpus") != document["environment"]["cpus"]:
+        print("Warning: baseline was recorded on a different machine; changes may not mean much")
+    changes = compare(results, baseline["results"], args.tolerance)
+    print_changes(changes, args.tolerance)
+    if args.fail_on_regression and any(row["regressed"] for row in changes):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+API load benchmark against a seeded database
+
+Seeds (or reuses) a SQLite database of --dreams dreams, --user-rows of
+them owned by the benchmarked user, then drives the real ASGI app
+in-process through httpx's ASGI transport - middleware, dependencies,
+async sessions and serialization included, no network. Each scenario
+sends --requests requests with --concurrency in flight and reports
+p50/p95/p99 latency and throughput.
+
+The app builds its engines from DATABASE_URL at import, so one process
+benchmarks one database size; `python -m benchmarks` runs a process per
+size. The response cache is off unless --response-cache is given, so
+repeated list requests measure the query path rather than cache hits.
+
+Run from the backend directory:
+    python -m benchmarks.api --dreams 100000 --requests 2000 --db-dir /tmp/dream-bench --json-out api.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import environment, seed_dreams, summarize, write_json
+
+
+def scenarios(dream_ids, requests: int):
+    """Scenario name -> list of (method, path, json body) requests"""
+    rng = random.Random(11)
+    calculate_bodies = [
+        {
+            "target_amount": round(rng.uniform(500, 50_000), 2),
+            "target_date": (datetime.now() + timedelta(days=rng.randint(30, 3000))).isoformat(),
+            "current_saved": round(rng.uniform(0, 400), 2),
+        }
+        for _ in range(100)
+    ]
+    return {
+        "get_dream": [("GET", f"/api/v1/dreams/{rng.choice(dream_ids)}", None) for _ in range(requests)],
+        "list_dreams": [("GET", "/api/v1/dreams/?limit=50", None)] * requests,
+        "list_dreams_by_daily_amount": [("GET", "/api/v1/dreams/?sort=daily_amount&limit=50", None)] * requests,
+        "list_dreams_filtered": [
+            ("GET", f"/api/v1/dreams/?status=active&max_daily_amount={rng.choice((5, 20, 50))}&limit=50", None)
+            for _ in range(requests)
+        ],
+        "calculate": [("POST", "/api/v1/dreams/calculate", rng.choice(calculate_bodies)) for _ in range(requests)],
+    }
+
+
+async def drive(app, calls, concurrency: int) -> dict:
+    """Send every call through the app with `concurrency` requests in flight"""
+    import httpx
+
+    latencies = []
+    queue = list(reversed(calls))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while queue:
+                method, path, body = queue.pop()
+                began = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                latencies.append((time.perf_counter() - began) * 1000)
+                response.raise_for_status()
+
+        # Warm-up: first requests pay for imports, statement compilation and pool connects
+        for method, path, body in calls[:min(20, len(calls))]:
+            (await client.request(method, path, json=body)).raise_for_status()
+
+        began = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - began
+
+    return summarize(latencies, elapsed)
+
+
+def prepare_database(path: str, dreams: int, user_rows: int):
+    """Seed the database unless it already holds exactly this data set"""
+    from sqlalchemy import func, select
+
+    from app.models.database import Base, engine
+    from app.models.dream import Dream
+
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        existing = conn.scalar(select(func.count()).select_from(Dream))
+        owned = conn.scalar(select(func.count()).select_from(Dream).where(Dream.user_id == 1))
+    if existing == dreams and owned == min(dreams, user_rows):
+        return
+    if existing:
+        raise SystemExit(f"{path} holds {existing:,} dreams, not {dreams:,} - use another --db-dir or delete it")
+
+    print(f"Seeding {dreams:,} dreams into {path} ...")
+    began = time.perf_counter()
+    seed_dreams(engine, dreams, min(dreams, user_rows))
+    print(f"  seeded in {time.perf_counter() - began:.1f}s")
+
+
+def run(dreams: int, user_rows: int, requests: int, concurrency: int, db_dir: str) -> dict:
+    path = os.path.join(db_dir, f"dreams_{dreams}_{user_rows}.db")
+    # Must be set before the app modules build their engines
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+    from sqlalchemy import select
+
+    from app.main import app
+    from app.models.database import engine
+    from app.models.dream import Dream
+
+    prepare_database(path, dreams, user_rows)
+    with engine.connect() as conn:
+        dream_ids = conn.scalars(select(Dream.id).where(Dream.user_id == 1).limit(10_000)).all()
+
+    results = {}
+    for name, calls in scenarios(dream_ids, requests).items():
+        results[f"api.{dreams}.{name}"] = asyncio.run(drive(app, calls, concurrency))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dreams", type=int, default=1000, help="Dreams in the seeded table")
+    parser.add_argument("--user-rows", type=int, default=10_000, help="How many of them belong to the benchmarked user")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight")
+    parser.add_argument("--db-dir", help="Keep seeded databases here and reuse them (default: a temporary directory)")
+    parser.add_argument("--response-cache", action="store_true", help="Leave the response cache on")
+    parser.add_argument("--json-out", help="Write results as JSON to this file (- for stdout)")
+    args = parser.parse_args()
+
+    os.environ["SCHEDULER_ENABLED"] = "0"
+    os.environ["RESPONSE_CACHE_ENABLED"] = "1" if args.response_cache else "0"
+
+    if args.db_dir:
+        os.makedirs(args.db_dir, exist_ok=True)
+        results = run(args.dreams, args.user_rows, args.requests, args.concurrency, args.db_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run(args.dreams, args.user_rows, args.requests, args.concurrency, tmp)
+
+    if args.json_out:
+        write_json(args.json_out, {
+            "environment": {**environment(), "concurrency": args.concurrency, "response_cache": args.response_cache},
+            "results": results,
+        })
+    if args.json_out != "-":
+        print(f"{'benchmark':<40} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9}")
+        for name, stats in results.items():
+            print(f"{name:<40} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['throughput_per_s']:>9}")
+
+
+if __name__ == "__main__":
+    main()
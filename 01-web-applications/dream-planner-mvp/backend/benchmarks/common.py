@@ -0,0 +1,160 @@
+"""
+Shared helpers for the benchmarks
+
+Every suite summarizes its samples the same way (latency percentiles and
+throughput under the same keys), so `python -m benchmarks` can merge the
+suites into one JSON document and compare it with a stored baseline
+metric by metric. Seeding is shared too, so the load and pagination
+benchmarks see the same data for the same row counts.
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, insert
+
+SEED_BATCH = 50_000
+
+# Latency keys compared with the baseline (higher is worse) and throughput keys (lower is worse);
+# p99 is reported but too noisy over a thousand requests to gate on
+LATENCY_KEYS = ("p50_ms", "p95_ms")
+THROUGHPUT_KEYS = ("throughput_per_s",)
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms, elapsed_seconds: float = None) -> dict:
+    """
+    Percentiles of latency samples, plus throughput over the wall time.
+
+    Without a wall time (sequential micro-benchmarks) throughput is calls
+    per second of the summed samples.
+    """
+    total_seconds = elapsed_seconds if elapsed_seconds is not None else sum(samples_ms) / 1000
+    return {
+        "samples": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+        "mean_ms": round(statistics.fmean(samples_ms), 4),
+        "throughput_per_s": round(len(samples_ms) / total_seconds, 1) if total_seconds > 0 else None,
+    }
+
+
+def make_engine(path: str):
+    """SQLite engine for a benchmark database with the app's SQL functions"""
+    from app.models.sql_functions import register_sqlite_functions
+
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", lambda conn, _: register_sqlite_functions(conn))
+    return engine
+
+
+def seed_dreams(engine, rows: int, user_rows: int, seed: int = 42):
+    """
+    Create the schema and bulk insert `rows` random dreams, `user_rows` of
+    them for user 1 (spread evenly through the table, the rest spread over
+    other users). Deterministic for a given seed.
+    """
+    from app.models.database import Base
+    from app.models.dream import Dream, DreamCategory, DreamStatus
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    statuses = list(DreamStatus)
+    categories = list(DreamCategory)
+    stride = max(1, rows // max(1, user_rows))
+
+    with engine.begin() as conn:
+        for offset in range(0, rows, SEED_BATCH):
+            batch = []
+            for i in range(offset, min(offset + SEED_BATCH, rows)):
+                target = rng.uniform(500, 200_000)
+                batch.append({
+                    # Benchmarked user's rows are interleaved with other tenants'
+                    "user_id": 1 if i % stride == 0 else rng.randint(2, 100_000),
+                    "title": f"Dream {i}",
+                    "category": rng.choice(categories),
+                    "target_amount": round(target, 2),
+                    "current_saved": round(rng.uniform(0, target), 2),
+                    "target_date": start + timedelta(days=rng.randint(400, 8000)),
+                    "status": rng.choice(statuses),
+                    # Many rows share a second, so the id tie-breaker is exercised
+                    "created_at": start + timedelta(seconds=i // 3),
+                })
+            conn.execute(insert(Dream.__table__), batch)
+
+
+def environment() -> dict:
+    """Where the numbers came from - compare baselines from the same machine"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def write_json(path: str, document: dict):
+    """Write a results document (`-` for stdout)"""
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if path == "-":
+        sys.stdout.write(text + "\n")
+        return
+    with open(path, "w") as f:
+        f.write(text + "\n")
+
+
+def read_json(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Metrics that moved beyond `tolerance` (a fraction) against the baseline.
+
+    Returns one dict per compared metric, worst change first; `regressed`
+    marks the ones past the tolerance in the bad direction. Benchmarks
+    present on only one side are skipped.
+    """
+    changes = []
+    for name in sorted(set(results) & set(baseline)):
+        current, previous = results[name], baseline[name]
+        for key in LATENCY_KEYS + THROUGHPUT_KEYS:
+            before, after = previous.get(key), current.get(key)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = change if key in LATENCY_KEYS else -change
+            changes.append({
+                "benchmark": name,
+                "metric": key,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+                "regressed": worse > tolerance,
+            })
+    changes.sort(key=lambda row: -(row["change"] if row["metric"] in LATENCY_KEYS else -row["change"]))
+    return changes
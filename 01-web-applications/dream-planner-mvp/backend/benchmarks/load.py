@@ -0,0 +1,136 @@
+"""
+Sync vs async database load benchmark
+
+Drives the dream detail and list endpoints in-process (httpx ASGI transport)
+at increasing concurrency, once through the real async endpoints and once
+through equivalent handlers that use the sync Session from a threadpool.
+Reports throughput and latency percentiles for each mode.
+
+Run from the backend directory:
+    python -m benchmarks.load --dreams 5000 --requests 2000 --concurrency 1 10 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import summarize
+
+
+def build_sync_app():
+    """The dream read endpoints as plain `def` handlers on the sync Session"""
+    from typing import List
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy.orm import Session
+
+    from app.api.v1.endpoints.dreams import _build_dream_response
+    from app.models.database import get_db
+    from app.models.dream import Dream
+    from app.schemas.dream import DreamResponse, DreamSummary
+
+    app = FastAPI()
+
+    @app.get("/api/v1/dreams/{dream_id}", response_model=DreamResponse)
+    def get_dream(dream_id: int, db: Session = Depends(get_db)):
+        dream = db.query(Dream).filter(Dream.id == dream_id, Dream.user_id == 1).first()
+        if not dream:
+            raise HTTPException(status_code=404, detail="Dream not found")
+        return _build_dream_response(dream)
+
+    @app.get("/api/v1/dreams/", response_model=List[DreamSummary])
+    def list_dreams(limit: int = 20, db: Session = Depends(get_db)):
+        return (
+            db.query(Dream)
+            .filter(Dream.user_id == 1)
+            .order_by(Dream.created_at.desc(), Dream.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    return app
+
+
+def seed(dreams: int):
+    """Create tables and insert dreams for user 1 through the sync engine"""
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+
+    from app.models.database import Base, engine
+    from app.models.dream import Dream, DreamCategory, DreamStatus
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    rows = [{
+        "user_id": 1,
+        "title": f"Dream {i}",
+        "category": rng.choice(list(DreamCategory)),
+        "target_amount": round(rng.uniform(500, 50_000), 2),
+        "current_saved": 0.0,
+        "target_date": datetime(2027, 1, 1) + timedelta(days=rng.randint(0, 3000)),
+        "status": DreamStatus.active,
+    } for i in range(dreams)]
+    with engine.begin() as conn:
+        conn.execute(insert(Dream.__table__), rows)
+
+
+async def drive(app, paths, concurrency: int) -> dict:
+    """Send every path through the app with `concurrency` requests in flight"""
+    import httpx
+
+    latencies = []
+    queue = list(paths)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while queue:
+                path = queue.pop()
+                began = time.perf_counter()
+                response = await client.get(path)
+                latencies.append((time.perf_counter() - began) * 1000)
+                response.raise_for_status()
+
+        began = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - began
+
+    return summarize(latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dreams", type=int, default=5000, help="Dreams to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before the app modules build their engines
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+
+        from app.main import app as async_app
+
+        seed(args.dreams)
+        sync_app = build_sync_app()
+
+        rng = random.Random(11)
+        paths = [
+            f"/api/v1/dreams/{rng.randint(1, args.dreams)}" if i % 4 else "/api/v1/dreams/?limit=20"
+            for i in range(args.requests)
+        ]
+
+        print(f"{'mode':>6} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for concurrency in args.concurrency:
+            for mode, app in (("sync", sync_app), ("async", async_app)):
+                stats = asyncio.run(drive(app, paths, concurrency))
+                print(
+                    f"{mode:>6} {concurrency:>5} {stats['throughput_per_s']:>9} "
+                    f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
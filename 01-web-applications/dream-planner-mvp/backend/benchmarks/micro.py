@@ -0,0 +1,134 @@
+"""
+Calculation hot-path micro-benchmarks
+
+Times, per call, the code every dream response runs through:
+
+  dream_properties_memo   all derived Dream properties with the metrics memo warm
+  dream_properties_cold   the same on unsaved dreams (no id - computed every time)
+  build_dream_response    the detail payload dict for one dream
+  calculate_dream_amounts the /dreams/calculate endpoint function
+  calculate_batch         the batch calculation over --batch-rows goals
+
+No database or HTTP involved - see benchmarks.api for the request path.
+
+Run from the backend directory:
+    python -m benchmarks.micro --dreams 1000 --repeats 2000 --json-out micro.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import environment, summarize, write_json
+
+
+def make_dreams(count: int, with_ids: bool):
+    """Transient Dream instances with random targets, dates and savings"""
+    from app.models.dream import Dream, DreamCategory, DreamStatus
+
+    rng = random.Random(42)
+    now = datetime.now()
+    dreams = []
+    for i in range(count):
+        target = round(rng.uniform(500, 200_000), 2)
+        dreams.append(Dream(
+            id=i + 1 if with_ids else None,
+            user_id=1,
+            title=f"Dream {i}",
+            category=rng.choice(list(DreamCategory)),
+            target_amount=target,
+            current_saved=round(rng.uniform(0, target), 2),
+            target_date=now + timedelta(days=rng.randint(30, 8000)),
+            status=DreamStatus.active,
+            created_at=now,
+            updated_at=now,
+        ))
+    return dreams
+
+
+def time_each(fn, items, repeats: int):
+    """Milliseconds per fn(item) call, cycling through the items"""
+    samples = []
+    for i in range(repeats):
+        item = items[i % len(items)]
+        began = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - began) * 1000)
+    return samples
+
+
+def read_properties(dream):
+    return (
+        dream.days_remaining, dream.amount_remaining, dream.daily_amount, dream.weekly_amount,
+        dream.monthly_amount, dream.progress_percentage, dream.is_achievable, dream.get_comparisons()
+    )
+
+
+async def time_calculate(requests, repeats: int):
+    """Milliseconds per awaited calculate_dream_amounts call"""
+    from app.api.v1.endpoints.dreams import calculate_dream_amounts
+
+    samples = []
+    for i in range(repeats):
+        request = requests[i % len(requests)]
+        began = time.perf_counter()
+        await calculate_dream_amounts(request)
+        samples.append((time.perf_counter() - began) * 1000)
+    return samples
+
+
+def run(dreams: int, repeats: int, batch_rows: int) -> dict:
+    from app.api.v1.endpoints.dreams import _build_dream_response
+    from app.schemas.dream import CalculationRequest
+    from app.services.calculations import calculate_batch
+
+    saved = make_dreams(dreams, with_ids=True)
+    unsaved = make_dreams(dreams, with_ids=False)
+    for dream in saved:
+        read_properties(dream)  # Warm the memo
+
+    requests = [
+        CalculationRequest(target_amount=d.target_amount, target_date=d.target_date, current_saved=d.current_saved)
+        for d in unsaved[:100]
+    ]
+    batch_targets = [d.target_amount for d in unsaved[:batch_rows]]
+    batch_dates = [d.target_date.date() for d in unsaved[:batch_rows]]
+    batch_saved = [d.current_saved for d in unsaved[:batch_rows]]
+
+    return {
+        "micro.dream_properties_memo": summarize(time_each(read_properties, saved, repeats)),
+        "micro.dream_properties_cold": summarize(time_each(read_properties, unsaved, repeats)),
+        "micro.build_dream_response": summarize(time_each(_build_dream_response, saved, repeats)),
+        "micro.calculate_dream_amounts": summarize(asyncio.run(time_calculate(requests, repeats))),
+        f"micro.calculate_batch_{len(batch_targets)}": summarize(time_each(
+            lambda _: calculate_batch(batch_targets, batch_dates, batch_saved), [None], max(1, repeats // 10)
+        )),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dreams", type=int, default=1000, help="Distinct dreams cycled through")
+    parser.add_argument("--repeats", type=int, default=2000, help="Timed calls per benchmark")
+    parser.add_argument("--batch-rows", type=int, default=1000, help="Goals per calculate_batch call")
+    parser.add_argument("--json-out", help="Write results as JSON to this file (- for stdout)")
+    args = parser.parse_args()
+
+    # Nothing here touches the database; keep the app's engines off the real one
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SCHEDULER_ENABLED", "0")
+
+    results = run(args.dreams, args.repeats, min(args.batch_rows, args.dreams))
+    if args.json_out:
+        write_json(args.json_out, {"environment": environment(), "results": results})
+    if args.json_out != "-":
+        print(f"{'benchmark':<34} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'calls/s':>11}")
+        for name, stats in results.items():
+            print(f"{name:<34} {stats['p50_ms']:>9.4f} {stats['p95_ms']:>9.4f} {stats['p99_ms']:>9.4f} {stats['throughput_per_s']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Dream list pagination benchmark
+
+Seeds a SQLite database with up to a million dreams and times fetching
+deep pages of one user's dreams with keyset cursors versus OFFSET. Keyset
+page latency should stay flat from page 1 to page 10,000; OFFSET grows with
+the page number. The benchmarked user owns --user-rows dreams and everyone
+else's rows are noise that the user-scoped indexes should skip entirely.
+
+Run from the backend directory:
+    python -m benchmarks.pagination --rows 2000000 --user-rows 1000000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.dream import Dream
+from app.services.pagination import apply_keyset
+from benchmarks.common import make_engine, seed_dreams
+
+
+def time_query(query, repeats: int) -> float:
+    """Median wall time of running the query, in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        query.all()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, user_rows: int, page_size: int, pages, repeats: int, db_path: str):
+    engine = make_engine(db_path)
+    if not os.path.exists(db_path) or os.path.getsize(db_path) == 0:
+        print(f"Seeding {rows:,} dreams into {db_path} ...")
+        began = time.perf_counter()
+        seed_dreams(engine, rows, user_rows)
+        print(f"  seeded in {time.perf_counter() - began:.1f}s")
+
+    session = sessionmaker(bind=engine)()
+    columns = (Dream.created_at, Dream.id)
+    base = session.query(Dream).filter(Dream.user_id == 1)
+
+    print(f"\n{'page':>8} {'keyset ms':>10} {'offset ms':>10}")
+    results = []
+    for page in pages:
+        offset = (page - 1) * page_size
+
+        # Find where the previous page ended (setup, not timed)
+        after = None
+        if offset:
+            after = tuple(
+                session.query(*columns)
+                .filter(Dream.user_id == 1)
+                .order_by(Dream.created_at.desc(), Dream.id.desc())
+                .offset(offset - 1)
+                .limit(1)
+                .one()
+            )
+
+        keyset = apply_keyset(base, Dream.created_at, Dream.id, True, after).limit(page_size)
+        offset_query = base.order_by(Dream.created_at.desc(), Dream.id.desc()).offset(offset).limit(page_size)
+
+        keyset_ms = time_query(keyset, repeats)
+        offset_ms = time_query(offset_query, repeats)
+        results.append({"page": page, "keyset_ms": keyset_ms, "offset_ms": offset_ms})
+        print(f"{page:>8} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
+
+    session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Dreams to seed across all users")
+    parser.add_argument("--user-rows", type=int, default=1_000_000, help="How many of them belong to the benchmarked user")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per query (median reported)")
+    parser.add_argument("--db", help="Reuse a seeded database file instead of a temporary one")
+    args = parser.parse_args()
+
+    if args.db:
+        run(args.rows, args.user_rows, args.page_size, args.pages, args.repeats, args.db)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(args.rows, args.user_rows, args.page_size, args.pages, args.repeats, os.path.join(tmp, "bench.db"))
+
+
+if __name__ == "__main__":
+    main()
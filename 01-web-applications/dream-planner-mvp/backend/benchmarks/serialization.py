@@ -0,0 +1,144 @@
+"""
+Dream response serialization benchmark
+
+Times turning database rows into response bytes, per item, for the dream
+detail and list payloads:
+
+  model     ORM objects -> Pydantic models -> response_model validation and
+            serialization -> json.dumps (what FastAPI does for a returned model)
+  fast      the endpoints' path: plain dicts (summary rows from column tuples)
+            encoded once by app.core.serialization
+  columnar  the fast path in the one-array-per-field layout
+  msgpack   the fast path as MessagePack (skipped without the msgpack package)
+
+Query time is excluded: rows are loaded once and only the conversion is timed.
+
+Run from the backend directory:
+    python -m benchmarks.serialization --dreams 100 --repeats 200
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints.dreams import SUMMARY_COLUMNS, SUMMARY_FIELDS, _build_dream_response, _summary_row
+from app.core import serialization
+from app.core.serialization import ListFormat, encode
+from app.models.database import Base
+from app.models.dream import Dream, DreamCategory, DreamStatus
+from app.models.sql_functions import register_sqlite_functions
+from app.schemas.dream import DreamResponse, DreamSummary
+
+
+def seed(path: str, dreams: int):
+    """SQLite database with `dreams` random dreams for user 1"""
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", lambda conn, _: register_sqlite_functions(conn))
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    now = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Dream.__table__), [
+            {
+                "user_id": 1,
+                "title": f"Dream {i}",
+                "description": "Somewhere warm with a good book",
+                "category": rng.choice(list(DreamCategory)),
+                "target_amount": round(rng.uniform(500, 200_000), 2),
+                "current_saved": round(rng.uniform(0, 400), 2),
+                "target_date": now + timedelta(days=rng.randint(800, 8000)),
+                "status": DreamStatus.active,
+                "created_at": now + timedelta(seconds=i),
+            }
+            for i in range(dreams)
+        ])
+    return engine
+
+
+def per_item_us(fn, items: int, repeats: int) -> float:
+    """Median microseconds per item of calling fn() (which handles `items` items)"""
+    samples = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1e6 / items)
+    return statistics.median(samples)
+
+
+def model_bytes(adapter: TypeAdapter, value) -> bytes:
+    """What FastAPI does with a returned value and a response_model"""
+    validated = adapter.validate_python(value, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def run(dreams: int, repeats: int, db_path: str):
+    engine = seed(db_path, dreams)
+    session = sessionmaker(bind=engine)()
+    orm_rows = session.scalars(select(Dream)).all()
+    column_rows = session.execute(select(*SUMMARY_COLUMNS)).all()
+    n = len(orm_rows)
+
+    detail_adapter = TypeAdapter(DreamResponse)
+    list_adapter = TypeAdapter(List[DreamSummary])
+
+    def detail_model():
+        for dream in orm_rows:
+            model_bytes(detail_adapter, DreamResponse(**_build_dream_response(dream)))
+
+    def detail_fast():
+        for dream in orm_rows:
+            serialization.dumps(_build_dream_response(dream))
+
+    def list_model():
+        model_bytes(list_adapter, [DreamSummary.model_validate(dream) for dream in orm_rows])
+
+    def list_fast(format):
+        return lambda: encode([_summary_row(row) for row in column_rows], format, SUMMARY_FIELDS)
+
+    cases = [
+        ("detail", "model", detail_model, model_bytes(detail_adapter, DreamResponse(**_build_dream_response(orm_rows[0])))),
+        ("detail", "fast", detail_fast, serialization.dumps(_build_dream_response(orm_rows[0]))),
+        ("list", "model", list_model, model_bytes(list_adapter, [DreamSummary.model_validate(d) for d in orm_rows])),
+    ]
+    for format in (ListFormat.json, ListFormat.columnar, ListFormat.msgpack):
+        if format == ListFormat.msgpack and serialization.msgpack is None:
+            continue
+        name = "fast" if format == ListFormat.json else format.value
+        cases.append(("list", name, list_fast(format), list_fast(format)()[0]))
+
+    print(f"JSON encoder: {'orjson' if serialization.orjson else 'json (stdlib)'}, {n} dreams\n")
+    print(f"{'payload':<8} {'path':<10} {'us/item':>9} {'bytes/item':>11}")
+    results = []
+    for payload, path, fn, sample in cases:
+        fn()  # Warm the metrics memo and any caches
+        micros = per_item_us(fn, n, repeats)
+        size = len(sample) / (1 if payload == "detail" else n)
+        results.append({"payload": payload, "path": path, "us_per_item": micros, "bytes_per_item": size})
+        print(f"{payload:<8} {path:<10} {micros:>9.2f} {size:>11.1f}")
+
+    session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dreams", type=int, default=100, help="Dreams per list page / detail loop")
+    parser.add_argument("--repeats", type=int, default=200, help="Timed runs per case (median reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run(args.dreams, args.repeats, os.path.join(tmp, "bench.db"))
+
+
+if __name__ == "__main__":
+    main()
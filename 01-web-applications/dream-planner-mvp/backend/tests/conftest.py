@@ -0,0 +1,53 @@
+"""
+Shared test setup
+
+The app builds its database engines from DATABASE_URL when it is first
+imported, so the tests point it at a throwaway SQLite file (and switch the
+background scheduler off) before any test module imports from app.
+
+Run from the backend directory (pytest comes from requirements-dev.txt):
+    python -m pytest -q
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="dream-planner-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["SCHEDULER_ENABLED"] = "0"
+
+@pytest.fixture(scope="session")
+def run():
+    """
+    Run a coroutine to completion: run(ingest_spending(db, ...)).
+
+    Every test shares one event loop, because the async engine's pooled
+    connections belong to the loop that opened them. The tables are created
+    the way the app's startup does it.
+    """
+    import app.main  # noqa: F401 - importing the app registers every model on Base
+    from app.models.database import async_engine, create_tables
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(create_tables())
+    yield loop.run_until_complete
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+
+@pytest.fixture(scope="session")
+def client(run):
+    """
+    An httpx client wired straight to the app, on the shared event loop:
+    run(client.get("/api/v1/dreams/")). Requests without an Authorization
+    header act as the default user.
+    """
+    import httpx
+
+    from app.main import app
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    yield client
+    run(client.aclose())
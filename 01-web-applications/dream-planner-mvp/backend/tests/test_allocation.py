@@ -0,0 +1,83 @@
+"""
+Pareto fronts against an O(n^2) dominance check
+
+pareto_mask finds the non-dominated rows with a staircase and a bisect per
+row, and large sweeps merge per-piece fronts. Both must keep exactly the
+rows that no other row dominates, which comparing every pair decides
+directly.
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from app.services.allocation import (
+    build_plan, dominated_by, merge_fronts, pareto_mask, score_splits, split_grid, sweep_front
+)
+
+def brute_force_mask(objectives: np.ndarray) -> np.ndarray:
+    """Row i is kept unless some row is no worse everywhere and better somewhere"""
+    keep = np.ones(len(objectives), dtype=bool)
+    for i, row in enumerate(objectives):
+        for other in objectives:
+            if (other <= row).all() and (other < row).any():
+                keep[i] = False
+                break
+    return keep
+
+@pytest.mark.parametrize("seed", range(8))
+def test_pareto_mask_matches_brute_force_on_random_rows(seed):
+    rng = np.random.default_rng(seed)
+    objectives = rng.normal(size=(300, 3))
+    np.testing.assert_array_equal(pareto_mask(objectives), brute_force_mask(objectives))
+
+@pytest.mark.parametrize("seed", range(8))
+def test_pareto_mask_matches_brute_force_with_ties(seed):
+    """Few distinct values: duplicate rows and ties on every objective"""
+    rng = np.random.default_rng(100 + seed)
+    objectives = rng.integers(0, 4, size=(250, 3)).astype(float)
+    np.testing.assert_array_equal(pareto_mask(objectives), brute_force_mask(objectives))
+
+def test_pareto_mask_edge_cases():
+    np.testing.assert_array_equal(pareto_mask(np.array([[1.0, 2.0, 3.0]])), [True])
+    same = np.tile([[1.0, 2.0, 3.0]], (4, 1))
+    np.testing.assert_array_equal(pareto_mask(same), [True] * 4)
+    chain = np.array([[3.0, 3.0, 3.0], [2.0, 2.0, 2.0], [1.0, 1.0, 1.0]])
+    np.testing.assert_array_equal(pareto_mask(chain), [False, False, True])
+
+def test_dominated_by_matches_brute_force():
+    rng = np.random.default_rng(9)
+    objectives = rng.integers(0, 5, size=(120, 3)).astype(float)
+    candidates = rng.integers(0, 5, size=(40, 3)).astype(float)
+    expected = [
+        any((other <= row).all() and (other < row).any() for other in candidates)
+        for row in objectives
+    ]
+    np.testing.assert_array_equal(dominated_by(objectives, candidates), expected)
+
+def test_merged_piece_fronts_match_the_whole_grid():
+    plan = build_plan(
+        2_500.0,
+        [(12_000.0, 1_500.0, 700, 480.0), (40_000.0, 0.0, 1_800, 700.0), (5_000.0, 4_000.0, 90, 330.0)],
+        savings_rate=0.05,
+        foundation_balance=20_000.0,
+        foundation_return=0.07,
+        horizon_years=25,
+        emergency_gap=9_000.0,
+    )
+    shares = split_grid(0.02, {}, {})
+    objectives = score_splits(shares, plan).objectives()
+    expected = shares[brute_force_mask(objectives)]
+
+    merged = merge_fronts([sweep_front(piece, plan) for piece in np.array_split(shares, 5)])
+    assert sorted(map(tuple, merged.shares.round(9))) == sorted(map(tuple, expected.round(9)))
+
+def test_no_emergency_gap_scores_without_warnings():
+    """Splits with no Life share divide 0 by 0 when there is no gap to close"""
+    plan = build_plan(1_000.0, [], savings_rate=0.05, foundation_balance=0.0,
+                      foundation_return=0.07, horizon_years=30, emergency_gap=0.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        scores = score_splits(split_grid(0.05, {}, {}), plan)
+    assert (scores.emergency_months == 0).all()
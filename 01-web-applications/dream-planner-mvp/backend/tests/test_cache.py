@@ -0,0 +1,167 @@
+"""
+Response cache invalidation, ETags and per-user keys
+
+Every write to a user's dreams - through the API or the funded-dream
+sweep - must drop both the cached detail and the cached list pages, a
+client's ETag must round-trip to a 304, and one user's entries must never
+be served to (or invalidated by) another.
+"""
+
+import itertools
+
+import pytest
+
+from app.core.auth import issue_token
+from app.core.cache import CacheBackend, MemoryCacheBackend, response_cache
+from app.core.scheduler import Scheduler
+from app.services.sweeps import register_jobs
+
+pytestmark = pytest.mark.skipif(not response_cache.enabled, reason="RESPONSE_CACHE_ENABLED is off")
+
+DREAMS = "/api/v1/dreams/"
+USER_IDS = itertools.count(4001)
+
+def auth(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {issue_token(user_id)}"}
+
+class Api:
+    """Requests as one user, noting whether each GET came from the cache"""
+
+    def __init__(self, run, client, user_id: int):
+        self.run, self.client, self.headers = run, client, auth(user_id)
+
+    def request(self, method: str, path: str, **kwargs):
+        return self.run(self.client.request(method, path, headers={**self.headers, **kwargs.pop("headers", {})}, **kwargs))
+
+    def get(self, path: str, **kwargs):
+        """(response, served from the cache)"""
+        hits = response_cache.hits
+        response = self.request("GET", path, **kwargs)
+        return response, response_cache.hits > hits
+
+    def create(self, **fields) -> dict:
+        body = {"title": "Trip", "target_amount": 5000, "target_date": "2031-01-01T00:00:00", **fields}
+        response = self.request("POST", DREAMS, json=body)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    def warm(self, *paths):
+        """GET each path twice so it is cached, and check the second one was a hit"""
+        for path in paths:
+            self.get(path)
+            assert self.get(path)[1], f"{path} wasn't cached"
+
+@pytest.fixture
+def api(run, client):
+    # A user of its own per test, so cached entries never carry over
+    return Api(run, client, next(USER_IDS))
+
+def test_create_drops_detail_and_list(api):
+    first = api.create(title="First")
+    detail = f"{DREAMS}{first['id']}"
+    api.warm(detail, DREAMS)
+
+    api.create(title="Second")
+    listing, cached = api.get(DREAMS)
+    assert not cached
+    assert {dream["title"] for dream in listing.json()} == {"First", "Second"}
+    assert not api.get(detail)[1]
+
+def test_update_drops_detail_and_list(api):
+    dream = api.create(title="Before")
+    detail = f"{DREAMS}{dream['id']}"
+    api.warm(detail, DREAMS)
+
+    assert api.request("PUT", detail, json={"title": "After"}).status_code == 200
+    response, cached = api.get(detail)
+    assert not cached and response.json()["title"] == "After"
+    listing, cached = api.get(DREAMS)
+    assert not cached and [row["title"] for row in listing.json()] == ["After"]
+
+def test_delete_drops_detail_and_list(api):
+    archived, removed = api.create(title="Archived"), api.create(title="Removed")
+    archived_path, removed_path = f"{DREAMS}{archived['id']}", f"{DREAMS}{removed['id']}"
+    api.warm(archived_path, removed_path, DREAMS)
+
+    # Soft delete: the dream is archived, not gone
+    assert api.request("DELETE", archived_path).status_code == 200
+    response, cached = api.get(archived_path)
+    assert not cached and response.json()["status"] == "archived"
+    listing, cached = api.get(DREAMS)
+    assert not cached
+    assert {row["title"]: row["status"] for row in listing.json()}.get("Archived") in (None, "archived")
+    api.warm(removed_path, DREAMS)
+
+    assert api.request("DELETE", removed_path, params={"hard_delete": True}).status_code == 200
+    assert api.get(removed_path)[0].status_code == 404
+    listing, cached = api.get(DREAMS)
+    assert not cached and "Removed" not in {row["title"] for row in listing.json()}
+
+def test_funded_sweep_drops_detail_and_list_after_commit(run, api):
+    dream = api.create(target_amount=800)
+    detail = f"{DREAMS}{dream['id']}"
+    assert api.request("PUT", detail, json={"current_saved": 800}).status_code == 200
+    api.warm(detail, DREAMS)
+
+    scheduler = Scheduler()
+    register_jobs(scheduler)
+    assert run(scheduler.run_job("complete_funded")) >= 1
+
+    response, cached = api.get(detail)
+    assert not cached and response.json()["status"] == "completed"
+    listing, cached = api.get(DREAMS)
+    assert not cached and listing.json()[0]["status"] == "completed"
+
+def test_if_none_match_gets_304_with_the_same_etag(api):
+    dream = api.create()
+    detail = f"{DREAMS}{dream['id']}"
+    for path in (detail, DREAMS):
+        first, _ = api.get(path)
+        etag = first.headers["ETag"]
+        again, cached = api.get(path, headers={"If-None-Match": etag})
+        assert cached and again.status_code == 304
+        assert again.headers["ETag"] == etag and again.content == b""
+        # Any of several tags, or *, matches too
+        assert api.get(path, headers={"If-None-Match": f'"other", {etag}'})[0].status_code == 304
+        assert api.get(path, headers={"If-None-Match": "*"})[0].status_code == 304
+
+    assert api.request("PUT", detail, json={"title": "Changed"}).status_code == 200
+    changed, _ = api.get(detail, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+def test_entries_do_not_leak_across_users(run, client):
+    owner, other = Api(run, client, next(USER_IDS)), Api(run, client, next(USER_IDS))
+    dream = owner.create(title="Owner's")
+    detail = f"{DREAMS}{dream['id']}"
+    owner.warm(detail, DREAMS)
+
+    # Same paths, other user: never the owner's cached bodies
+    assert other.get(detail)[0].status_code == 404
+    assert other.get(DREAMS)[0].json() == []
+
+    # The other user's writes don't invalidate the owner's entries (or the reverse)
+    other_dream = other.create(title="Other's")
+    other.warm(f"{DREAMS}{other_dream['id']}", DREAMS)
+    assert owner.get(detail)[1] and owner.get(DREAMS)[1]
+    assert owner.request("PUT", detail, json={"title": "Renamed"}).status_code == 200
+    assert other.get(DREAMS)[1]
+    assert [row["title"] for row in other.get(DREAMS)[0].json()] == ["Other's"]
+
+def test_incomplete_backend_fails_at_construction():
+    class GetOnly(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+def test_memory_backend_lru_and_ttl(run):
+    backend = MemoryCacheBackend(max_entries=2, default_ttl=60)
+    run(backend.set("a", 1))
+    run(backend.set("b", 2))
+    assert run(backend.get("a")) == 1  # "a" is now the most recently used
+    run(backend.set("c", 3))
+    assert run(backend.get("b")) is None and run(backend.get("a")) == 1
+    run(backend.set("d", 4, ttl=-1))  # Already expired
+    assert run(backend.get("d")) is None
+    assert backend.stats()["evictions"] == 2 and backend.stats()["expirations"] == 1
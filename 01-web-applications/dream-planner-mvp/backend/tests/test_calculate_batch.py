@@ -0,0 +1,51 @@
+"""
+Batch calculation input bounds
+
+The JSON parser accepts the literals Infinity and NaN, so the batch
+validators have to reject them (and enforce the single-dream cap) before
+they reach the arrays - and the 422 that says so must itself be JSON.
+"""
+
+import json
+
+import pytest
+
+from app.services.calculations import COFFEE_PRICE, LUNCH_PRICE, STREAMING_PRICE
+
+URL = "/api/v1/dreams/calculate/batch"
+
+def post(run, client, body: str, format: str = "columnar"):
+    return run(client.post(f"{URL}?format={format}", content=body, headers={"content-type": "application/json"}))
+
+@pytest.mark.parametrize("format", ["columnar", "json"])
+@pytest.mark.parametrize("body, field", [
+    ('{"target_amount": [Infinity, 1000], "target_date": ["2030-01-01", "2030-01-01"]}', "target_amount"),
+    ('{"target_amount": [NaN], "target_date": ["2030-01-01"]}', "target_amount"),
+    ('{"target_amount": [-Infinity], "target_date": ["2030-01-01"]}', "target_amount"),
+    ('{"target_amount": [10000000.01], "target_date": ["2030-01-01"]}', "target_amount"),
+    ('{"target_amount": [1000], "target_date": ["2030-01-01"], "current_saved": [Infinity]}', "current_saved"),
+    ('{"target_amount": [1000], "target_date": ["2030-01-01"], "current_saved": [NaN]}', "current_saved"),
+    ('{"target_amount": [1000], "target_date": ["2030-01-01"], "current_saved": [20000000]}', "current_saved"),
+])
+def test_non_finite_and_oversized_amounts_are_rejected(run, client, body, field, format):
+    response = post(run, client, body, format)
+    assert response.status_code == 422
+    detail = json.loads(response.text)["detail"]  # Strict JSON, even though the input wasn't
+    assert detail[0]["loc"] == ["body", field]
+
+@pytest.mark.parametrize("format", ["columnar", "json"])
+def test_valid_batch_is_strict_json(run, client, format):
+    body = '{"target_amount": [10000000, 500], "target_date": ["2031-06-01", "2030-01-01"], "current_saved": [0, 100]}'
+    response = post(run, client, body, format)
+    assert response.status_code == 200
+    json.loads(response.text, parse_constant=lambda constant: pytest.fail(f"{constant} in the response"))
+
+def test_single_calculation_uses_the_shared_prices(run, client):
+    response = run(client.post("/calculate", params={"target_amount": 5000, "target_date": "2031-01-01"}))
+    result = response.json()
+    # Within 0.1: the response's amounts are rounded to cents before we divide them
+    assert result["comparisons"] == {
+        "coffees_per_day": pytest.approx(result["daily_amount"] / COFFEE_PRICE, abs=0.1),
+        "streaming_services": pytest.approx(result["monthly_amount"] / STREAMING_PRICE, abs=0.1),
+        "lunches_per_week": pytest.approx(result["weekly_amount"] / LUNCH_PRICE, abs=0.1),
+    }
@@ -0,0 +1,129 @@
+"""
+Singleflight folding, failures and cancellation
+
+Concurrent calls with one key must share a single execution and all get
+its result or its exception; a waiter going away must not cancel the
+others' work, and the work is cancelled only when every waiter has gone.
+"""
+
+import asyncio
+
+from app.core.coalesce import SingleFlight, fingerprint
+
+class Gated:
+    """A computation that counts its runs and waits for release()"""
+
+    def __init__(self, result="done", error: Exception = None):
+        self.result, self.error = result, error
+        self.runs = 0
+        self.cancelled = False
+        self.gate = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        try:
+            await self.gate.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def release(self):
+        self.gate.set()
+
+async def start(group: SingleFlight, fn, count: int, key="key") -> list:
+    """count concurrent callers, all past their first await"""
+    tasks = [asyncio.ensure_future(group.do(key, fn)) for _ in range(count)]
+    await asyncio.sleep(0)
+    return tasks
+
+def test_concurrent_calls_share_one_execution(run):
+    async def scenario():
+        group, fn = SingleFlight("test"), Gated(result={"total": 42})
+        tasks = await start(group, fn, 10)
+        assert group.stats()["in_flight"] == 1
+        fn.release()
+        results = await asyncio.gather(*tasks)
+        return group, fn, results
+
+    group, fn, results = run(scenario())
+    assert fn.runs == 1
+    assert all(result is results[0] for result in results)
+    stats = group.stats()
+    assert (stats["executed"], stats["folded"], stats["in_flight"]) == (1, 9, 0)
+    assert stats["fold_rate"] == 0.9
+
+def test_finished_key_runs_again(run):
+    """Folding isn't caching: a call after the flight lands runs fn again"""
+    async def scenario():
+        group, fn = SingleFlight("test"), Gated()
+        fn.release()
+        await group.do("key", fn)
+        await group.do("key", fn)
+        await asyncio.gather(*(group.do(key, fn) for key in ("a", "b")))
+        return group, fn
+
+    group, fn = run(scenario())
+    assert fn.runs == 4 and group.executed == 4 and group.folded == 0
+
+def test_exception_reaches_every_waiter(run):
+    async def scenario():
+        group, fn = SingleFlight("test"), Gated(error=ValueError("bad plan"))
+        tasks = await start(group, fn, 5)
+        fn.release()
+        return group, fn, await asyncio.gather(*tasks, return_exceptions=True)
+
+    group, fn, outcomes = run(scenario())
+    assert fn.runs == 1
+    assert all(isinstance(outcome, ValueError) and outcome is outcomes[0] for outcome in outcomes)
+    assert group.failed == 1 and group.stats()["in_flight"] == 0
+
+def test_cancelling_one_waiter_leaves_the_others(run):
+    async def scenario():
+        group, fn = SingleFlight("test"), Gated()
+        first, *others = await start(group, fn, 4)
+        first.cancel()
+        await asyncio.sleep(0)
+        fn.release()
+        results = await asyncio.gather(*others)
+        return group, fn, first, results
+
+    group, fn, first, results = run(scenario())
+    assert first.cancelled()
+    assert results == ["done"] * 3
+    assert not fn.cancelled and fn.runs == 1
+    assert group.abandoned == 0
+
+def test_cancelling_every_waiter_cancels_the_work(run):
+    async def scenario():
+        group, fn = SingleFlight("test"), Gated()
+        tasks = await start(group, fn, 3)
+        for task in tasks:
+            task.cancel()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0)
+        return group, fn, tasks
+
+    group, fn, tasks = run(scenario())
+    assert all(task.cancelled() for task in tasks)
+    assert fn.cancelled
+    assert group.abandoned == 1 and group.failed == 0
+    assert group.stats()["in_flight"] == 0
+
+def test_disabled_group_runs_every_call(run):
+    async def scenario():
+        group, fn = SingleFlight("test", enabled=False), Gated()
+        tasks = await start(group, fn, 3)
+        fn.release()
+        await asyncio.gather(*tasks)
+        return group, fn
+
+    group, fn = run(scenario())
+    assert fn.runs == 3 and group.executed == 0 and group.folded == 0
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": [2, 3]}, "x") == fingerprint({"b": [2, 3], "a": 1}, "x")
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
@@ -0,0 +1,66 @@
+"""
+Compute pool admission and the calculation time it reports
+
+A request's calculation time counts what its jobs spent running in a
+worker: time waiting behind other jobs in the queue, rejected jobs and
+jobs that timed out add nothing.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.compute import ComputeExecutor, ComputeQueueFull, ComputeTimeout
+from app.core.telemetry import telemetry
+
+JOB_SECONDS = 0.3
+
+@pytest.fixture
+def executor():
+    executor = ComputeExecutor(max_workers=1, max_queue_depth=1, job_timeout=10)
+    yield executor
+    executor.shutdown()
+
+async def traced(work):
+    """Run work under a request trace and return (its outcome, the trace's calc seconds)"""
+    trace = telemetry.begin("GET", "/test")
+    try:
+        outcome = await work
+    finally:
+        telemetry.finish("GET", "/test", "/test", trace, 200, 0.0)
+    return outcome, trace.calc_seconds
+
+def test_queued_job_counts_only_its_running_time(run, executor):
+    async def two_jobs():
+        # One worker: the second job waits a whole job's time in the queue
+        return await asyncio.gather(*(executor.run(time.sleep, JOB_SECONDS) for _ in range(2)))
+
+    started = time.perf_counter()
+    _, calc_seconds = run(traced(two_jobs()))
+    waited = time.perf_counter() - started
+
+    assert waited >= 2 * JOB_SECONDS
+    # Queue wait would have made it about three jobs' worth
+    assert 2 * JOB_SECONDS <= calc_seconds < 2.5 * JOB_SECONDS
+    assert executor.stats()["completed"] == 2
+
+def test_rejected_and_timed_out_jobs_add_no_time(run, executor):
+    async def overflow():
+        jobs = [asyncio.ensure_future(executor.run(time.sleep, JOB_SECONDS)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ComputeQueueFull):
+            await executor.run(time.sleep, JOB_SECONDS)
+        await asyncio.gather(*jobs)
+
+    _, calc_seconds = run(traced(overflow()))
+    assert calc_seconds < 2.5 * JOB_SECONDS
+    assert executor.stats()["rejected"] == 1
+
+    async def too_slow():
+        with pytest.raises(ComputeTimeout):
+            await executor.run(time.sleep, 1.0, timeout=0.1)
+
+    _, calc_seconds = run(traced(too_slow()))
+    assert calc_seconds == 0.0
+    assert executor.stats()["timed_out"] == 1
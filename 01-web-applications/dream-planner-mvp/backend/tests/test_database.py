@@ -0,0 +1,70 @@
+"""
+Connection pool checkout timing
+
+Checkouts are timed around the pool's public connect(): a request that
+queues behind a busy pool records how long it waited, one that gives up
+counts as a timeout, and checked-out connections are tracked by the
+checkout/checkin events.
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.models.database import InstrumentedQueuePool, PoolMetrics, _instrument
+
+HOLD_SECONDS = 0.3
+
+@pytest.fixture
+def one_connection_pool(tmp_path):
+    """Factory for an engine with a single pooled connection and metrics of its own"""
+    engines = []
+
+    def build(timeout: float):
+        class Pool(InstrumentedQueuePool):
+            metrics = PoolMetrics()
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=Pool,
+                               pool_size=1, max_overflow=0, pool_timeout=timeout)
+        _instrument(engine, Pool.metrics)
+        engines.append(engine)
+        return engine, Pool.metrics
+
+    yield build
+    for engine in engines:
+        engine.dispose()
+
+def test_busy_pool_checkout_times_out(one_connection_pool):
+    engine, metrics = one_connection_pool(timeout=HOLD_SECONDS / 3)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert (metrics.checkouts, metrics.checked_out) == (1, 1)
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        assert metrics.timeouts == 1 and metrics.checkouts == 1
+
+    assert metrics.checked_out == 0
+
+def test_checkout_records_time_spent_waiting(one_connection_pool):
+    engine, metrics = one_connection_pool(timeout=HOLD_SECONDS * 3)
+    held = threading.Event()
+
+    def hold():
+        with engine.connect():
+            held.set()
+            time.sleep(HOLD_SECONDS)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    holder.join()
+
+    assert metrics.checkouts == 2 and metrics.timeouts == 0
+    assert HOLD_SECONDS / 2 <= metrics.max_wait_seconds < HOLD_SECONDS * 3
+    assert metrics.total_wait_seconds >= metrics.max_wait_seconds
+    assert metrics.peak_checked_out == 1 and metrics.checked_out == 0
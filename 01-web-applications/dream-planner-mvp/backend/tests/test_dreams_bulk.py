@@ -0,0 +1,86 @@
+"""
+Bulk import/export through the API
+
+Uploads are decoded incrementally, so the tests feed bodies in small
+chunks: a byte order mark, multibyte characters split across chunks and
+bad bytes all have to be handled the same way wherever the chunks fall.
+An export imported again must give back the same dreams.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from app.core.auth import issue_token
+from app.models.database import AsyncSessionLocal
+from app.models.dream import Dream, DreamCategory, DreamStatus
+
+# Export columns a new import assigns afresh
+IMPORT_ASSIGNED = ("id", "created_at", "updated_at")
+
+def auth(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {issue_token(user_id)}"}
+
+def chunked(body: bytes, size: int = 7):
+    async def chunks():
+        for offset in range(0, len(body), size):
+            yield body[offset:offset + size]
+    return chunks()
+
+def upload(run, client, user_id: int, body: bytes, format: str):
+    return run(client.post(
+        f"/api/v1/dreams/import?format={format}", content=chunked(body), headers=auth(user_id)
+    ))
+
+def test_csv_with_byte_order_mark(run, client):
+    body = "﻿title,target_amount,target_date\r\nCafé trip,1200,2031-05-01T00:00:00\r\n".encode("utf-8")
+    response = upload(run, client, 3001, body, "csv")
+    assert response.status_code == 200
+    assert response.json() == {"imported": 1, "failed": 0, "errors": []}
+    dreams = run(client.get("/api/v1/dreams/", headers=auth(3001))).json()
+    assert [dream["title"] for dream in dreams] == ["Café trip"]
+
+def test_invalid_utf8_is_a_400(run, client):
+    body = b'{"title": "A", "target_amount": 10, "target_date": "2031-01-01T00:00:00"}\n\xff\n'
+    assert upload(run, client, 3002, body, "ndjson").status_code == 400
+
+def seed_dreams(run, user_id: int):
+    """Dreams an export really holds: finished, archived, overdue and with odd text"""
+    async def seed():
+        async with AsyncSessionLocal() as db:
+            db.add_all([
+                Dream(user_id=user_id, title="Kyoto, in spring", description='Say "hi"\nto the deer',
+                      category=DreamCategory.travel, target_amount=4200.5, current_saved=120.25,
+                      target_date=datetime(2031, 4, 1), status=DreamStatus.active),
+                Dream(user_id=user_id, title="Road bike", target_amount=1800, current_saved=1800,
+                      target_date=datetime(2023, 6, 1), status=DreamStatus.completed),
+                Dream(user_id=user_id, title="Boat", target_amount=90_000, current_saved=0,
+                      target_date=datetime(2022, 1, 1), status=DreamStatus.archived),
+                Dream(user_id=user_id, title="Overdue laptop", image_url="https://example.com/l.png",
+                      target_amount=2500, current_saved=900, target_date=datetime(2024, 9, 30),
+                      status=DreamStatus.active),
+            ])
+            await db.commit()
+    run(seed())
+
+def exported(run, client, user_id: int, format: str) -> bytes:
+    response = run(client.get(f"/api/v1/dreams/export?format={format}", headers=auth(user_id)))
+    assert response.status_code == 200
+    return response.content
+
+def comparable(run, client, user_id: int) -> list:
+    """Exported rows without the fields a new import assigns afresh"""
+    rows = [json.loads(line) for line in exported(run, client, user_id, "ndjson").splitlines() if line.strip()]
+    return [{key: value for key, value in row.items() if key not in IMPORT_ASSIGNED} for row in rows]
+
+@pytest.mark.parametrize("format, target_user", [("ndjson", 3004), ("csv", 3005)])
+def test_export_then_import_round_trips(run, client, format, target_user):
+    source_user = 3003
+    if not comparable(run, client, source_user):
+        seed_dreams(run, source_user)
+
+    response = upload(run, client, target_user, exported(run, client, source_user, format), format)
+    assert response.status_code == 200
+    assert response.json() == {"imported": 4, "failed": 0, "errors": []}
+    assert comparable(run, client, target_user) == comparable(run, client, source_user)
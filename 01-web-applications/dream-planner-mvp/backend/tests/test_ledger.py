@@ -0,0 +1,116 @@
+"""
+Bucket balances at the overdraw boundary and under concurrent withdrawals
+
+Balances are kept in cents and outgoing legs are guarded by
+"balance >= amount" inside the UPDATE, so a bucket empties to exactly
+zero, a cent more is refused, and withdrawals racing each other can never
+take a bucket below zero between them.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.models.bucket import Bucket, BucketBalance, BucketEntry, TransactionType
+from app.models.database import AsyncSessionLocal
+from app.services.ledger import InsufficientFunds, record_transaction
+
+async def move(user_id: int, type: TransactionType, amount: float, from_bucket=None, to_bucket=None) -> bool:
+    """Record and commit one transaction in its own session; False if it was refused"""
+    async with AsyncSessionLocal() as db:
+        try:
+            await record_transaction(db, user_id, type, amount, from_bucket, to_bucket, "test")
+        except InsufficientFunds:
+            await db.rollback()
+            return False
+        await db.commit()
+        return True
+
+def deposit(user_id: int, amount: float, bucket: Bucket = Bucket.life):
+    return move(user_id, TransactionType.contribution, amount, to_bucket=bucket)
+
+def withdraw(user_id: int, amount: float, bucket: Bucket = Bucket.life):
+    return move(user_id, TransactionType.withdrawal, amount, from_bucket=bucket)
+
+async def balance_row(user_id: int, bucket: Bucket = Bucket.life) -> BucketBalance:
+    async with AsyncSessionLocal() as db:
+        return await db.get(BucketBalance, (user_id, bucket))
+
+async def running_balances(user_id: int, bucket: Bucket = Bucket.life) -> list:
+    async with AsyncSessionLocal() as db:
+        return (await db.scalars(
+            select(BucketEntry.balance_after)
+            .where(BucketEntry.user_id == user_id, BucketEntry.bucket == bucket)
+            .order_by(BucketEntry.id)
+        )).all()
+
+def test_bucket_empties_to_the_cent(run):
+    user_id = 3001
+    # Ten float 0.1s sum to 0.9999999999999999 - the balance must still be 1.00
+    for _ in range(10):
+        assert run(deposit(user_id, 0.10))
+    assert run(balance_row(user_id)).balance == 1.0
+
+    assert not run(withdraw(user_id, 1.01))
+    assert run(withdraw(user_id, 1.00))
+    row = run(balance_row(user_id))
+    assert row.balance == 0.0
+    assert (row.total_in, row.total_out, row.entry_count) == (1.0, 1.0, 11)
+    assert not run(withdraw(user_id, 0.01))
+
+def test_refusal_reports_the_balance_and_leaves_it(run):
+    user_id = 3002
+    run(deposit(user_id, 250.25))
+
+    async def overdraw():
+        async with AsyncSessionLocal() as db:
+            with pytest.raises(InsufficientFunds) as refused:
+                await record_transaction(db, user_id, TransactionType.withdrawal, 250.26, Bucket.life, None, "test")
+            await db.rollback()
+        return refused.value
+
+    error = run(overdraw())
+    assert (error.bucket, error.available, error.requested) == (Bucket.life, 250.25, 250.26)
+    assert run(balance_row(user_id)).balance == 250.25
+    assert run(running_balances(user_id)) == [250.25]
+
+def test_amounts_and_running_balances_stay_in_cents(run):
+    user_id = 3003
+    amounts = [19.99, 0.01, 7.333, 1234.565, 0.1, 0.2]
+    for amount in amounts:
+        run(deposit(user_id, amount))
+    expected = round(sum(round(amount, 2) for amount in amounts), 2)
+    assert run(balance_row(user_id)).balance == expected
+    assert all(value == round(value, 2) for value in run(running_balances(user_id)))
+
+def test_concurrent_withdrawals_never_overdraw(run):
+    user_id = 3004
+    run(deposit(user_id, 100.00))
+
+    async def race():
+        return await asyncio.gather(*(withdraw(user_id, 12.50) for _ in range(20)))
+
+    accepted = run(race())
+    assert sum(accepted) == 8
+    assert run(balance_row(user_id)).balance == 0.0
+    # Each accepted withdrawal saw the previous ones' balance, never a stale one
+    balances = run(running_balances(user_id))
+    assert balances == [100.0] + [100.0 - 12.5 * k for k in range(1, 9)]
+
+def test_concurrent_transfers_keep_the_total(run):
+    user_id = 3005
+    run(deposit(user_id, 60.00, Bucket.dream))
+    run(deposit(user_id, 60.00, Bucket.life))
+
+    async def race():
+        transfers = [
+            move(user_id, TransactionType.transfer, 7.5, *buckets)
+            for buckets in [(Bucket.dream, Bucket.life), (Bucket.life, Bucket.dream)] * 15
+        ]
+        return await asyncio.gather(*transfers)
+
+    run(race())
+    dream, life = run(balance_row(user_id, Bucket.dream)), run(balance_row(user_id, Bucket.life))
+    assert dream.balance >= 0.0 and life.balance >= 0.0
+    assert dream.balance + life.balance == 120.0
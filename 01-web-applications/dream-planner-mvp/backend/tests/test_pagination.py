@@ -0,0 +1,92 @@
+"""
+Keyset pages against the full listing
+
+Walking X-Next-Cursor from the first page to the last must return every
+row exactly once, in order, even when many rows share a sort value - the
+id breaks the tie - and the last page must not advertise a next one.
+"""
+
+import itertools
+import math
+from datetime import datetime
+
+import pytest
+
+from app.core.auth import issue_token
+from app.models.bucket import Bucket, TransactionType
+from app.models.database import AsyncSessionLocal
+from app.models.dream import Dream
+from app.services import ledger
+
+CREATED = datetime(2025, 3, 1, 9, 30)
+USER_IDS = itertools.count(5001)
+
+def auth(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {issue_token(user_id)}"}
+
+def walk(run, client, url: str, user_id: int, **params) -> list:
+    """Every page from the first until one has no X-Next-Cursor"""
+    pages, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = run(client.get(url, params=query, headers=auth(user_id)))
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        assert len(pages) < 100, "cursor never ran out"
+
+async def seed_dreams(user_id: int, count: int) -> list:
+    """Dreams sharing one created_at, target_date and target_amount; returns their ids"""
+    async with AsyncSessionLocal() as db:
+        dreams = [
+            Dream(user_id=user_id, title=f"Dream {k}", target_amount=1000.0 if k % 3 else 2500.0,
+                  current_saved=0.0, target_date=datetime(2031, 1, 1), created_at=CREATED)
+            for k in range(count)
+        ]
+        db.add_all(dreams)
+        await db.commit()
+        return [dream.id for dream in dreams]
+
+@pytest.mark.parametrize("count, limit", [(12, 4), (13, 4), (3, 5), (1, 1)])
+@pytest.mark.parametrize("sort, order", [("created", None), ("created", "asc"), ("target_amount", None),
+                                         ("target_date", "desc"), ("progress", None)])
+def test_dream_pages_cover_tied_rows_once(run, client, count, limit, sort, order):
+    user_id = next(USER_IDS)
+    ids = run(seed_dreams(user_id, count))
+    params = {"sort": sort, "limit": limit, **({"order": order} if order else {})}
+
+    pages = walk(run, client, "/api/v1/dreams/", user_id, **params)
+    walked = [dream["id"] for page in pages for dream in page]
+    assert sorted(walked) == sorted(ids) and len(walked) == len(set(walked))
+    # A full last page doesn't lead to an empty one
+    assert len(pages) == math.ceil(count / limit)
+    assert all(len(page) == limit for page in pages[:-1])
+
+    # Same order as one page holding everything
+    everything = run(client.get("/api/v1/dreams/", params={**params, "limit": 100}, headers=auth(user_id))).json()
+    assert walked == [dream["id"] for dream in everything]
+
+def test_empty_list_has_no_cursor(run, client):
+    assert walk(run, client, "/api/v1/dreams/", next(USER_IDS), limit=5) == [[]]
+
+@pytest.mark.parametrize("count, limit", [(10, 5), (11, 5)])
+def test_bucket_history_pages_cover_tied_entries_once(run, client, monkeypatch, count, limit):
+    user_id = next(USER_IDS)
+    # Every entry lands in the same second
+    monkeypatch.setattr(ledger, "_utcnow", lambda: CREATED)
+
+    async def deposit_all():
+        for k in range(count):
+            async with AsyncSessionLocal() as db:
+                await ledger.record_transaction(db, user_id, TransactionType.contribution, 10.0 + k,
+                                                None, Bucket.life, "test")
+                await db.commit()
+
+    run(deposit_all())
+    pages = walk(run, client, "/api/v1/buckets/life/history", user_id, limit=limit)
+    walked = [entry["entry_id"] for page in pages for entry in page]
+    assert len(walked) == count == len(set(walked))
+    assert walked == sorted(walked, reverse=True)
+    assert len(pages) == math.ceil(count / limit)
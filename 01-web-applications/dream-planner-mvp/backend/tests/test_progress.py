@@ -0,0 +1,119 @@
+"""
+Incremental progress state against a from-scratch recount
+
+record_progress extends streaks in O(1), re-counts runs only when a day is
+backfilled, and keeps the savings rate as a decayed sum updated one
+check-in at a time. After any sequence of check-ins - out of order,
+replacing earlier amounts - the stored state must match what counting the
+final history from scratch gives.
+"""
+
+import math
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.dream import Dream
+from app.models.progress import DreamProgress
+from app.services.progress import count_streaks, record_progress, savings_rate
+
+USER_ID = 2001
+
+def loop_streaks(days) -> tuple:
+    """(run ending at the last day, longest run), counted one day at a time"""
+    current = longest = 0
+    previous = None
+    for day in sorted(days):
+        current = current + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, current)
+        previous = day
+    return current, longest
+
+def direct_rate(amounts: dict, today: date) -> float:
+    """Decayed sum of every check-in over the decayed weight of every day since the first"""
+    window = settings.progress_rate_window
+    mass = sum(amount * math.exp(-(today - day).days / window) for day, amount in amounts.items())
+    days = (today - min(amounts)).days + 1
+    weight = sum(math.exp(-age / window) for age in range(days))
+    return max(0.0, mass / weight)
+
+def random_days(rng: random.Random, count: int) -> list:
+    """Sorted distinct days with gaps of mostly one day"""
+    day, days = date(2025, 1, 1), []
+    for _ in range(count):
+        day += timedelta(days=rng.choice((1, 1, 1, 1, 2, 3, 9)))
+        days.append(day)
+    return days
+
+@pytest.mark.parametrize("seed", range(20))
+def test_count_streaks_matches_loop(seed):
+    rng = random.Random(seed)
+    days = random_days(rng, rng.randrange(1, 200))
+    assert count_streaks(days) == loop_streaks(days)
+
+def test_count_streaks_edge_cases():
+    assert count_streaks([]) == (0, 0)
+    assert count_streaks([date(2025, 3, 1)]) == (1, 1)
+    # Runs across a month and a year boundary
+    assert count_streaks([date(2024, 12, 30), date(2024, 12, 31), date(2025, 1, 1)]) == (3, 3)
+
+async def check_in_all(check_ins: list) -> tuple:
+    """Record (day, amount) check-ins in order on a new dream; returns its id and final state"""
+    async with AsyncSessionLocal() as db:
+        dream = Dream(user_id=USER_ID, title="Trip", target_amount=50_000.0, current_saved=100.0,
+                      target_date=datetime(2030, 1, 1))
+        db.add(dream)
+        await db.commit()
+        dream_id = dream.id
+
+    for day, amount in check_ins:
+        async with AsyncSessionLocal() as db:
+            await record_progress(db, USER_ID, dream_id, day, amount)
+            await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        state = await db.get(DreamProgress, dream_id)
+        current_saved = await db.scalar(select(Dream.current_saved).where(Dream.id == dream_id))
+    return state, current_saved
+
+@pytest.mark.parametrize("seed", range(6))
+def test_state_matches_recount_after_backfills_and_replacements(run, seed):
+    rng = random.Random(seed)
+    days = random_days(rng, 60)
+    check_ins = [(day, round(rng.uniform(1, 40), 2)) for day in days]
+    rng.shuffle(check_ins)  # Most check-ins after the first land before the latest day: backfills
+    # Replace some days' amounts later on
+    check_ins += [(day, round(rng.uniform(0, 40), 2)) for day in rng.sample(days, 10)]
+    state, current_saved = run(check_in_all(check_ins))
+
+    final = {}
+    for day, amount in check_ins:
+        final[day] = amount
+
+    assert (state.current_streak, state.longest_streak) == loop_streaks(final)
+    assert state.total_days == len(final)
+    assert state.first_date == min(final)
+    assert state.last_date == max(final)
+    assert state.total_amount == pytest.approx(sum(final.values()), rel=1e-9)
+    assert current_saved == pytest.approx(100.0 + sum(final.values()), rel=1e-9)
+
+    for today in (max(final), max(final) + timedelta(days=1), max(final) + timedelta(days=45)):
+        assert savings_rate(state, today) == pytest.approx(direct_rate(final, today), rel=1e-9)
+
+def test_in_order_check_ins_match_recount(run):
+    """The O(1) path only: every check-in extends or restarts the current run"""
+    days = random_days(random.Random(99), 80)
+    state, _ = run(check_in_all([(day, 10.0) for day in days]))
+    assert (state.current_streak, state.longest_streak) == loop_streaks(days)
+
+def test_steady_saver_rate_is_the_daily_amount(run):
+    start = date(2025, 6, 1)
+    days = [start + timedelta(days=offset) for offset in range(90)]
+    state, _ = run(check_in_all([(day, 12.5) for day in days]))
+    assert savings_rate(state, days[-1]) == pytest.approx(12.5, rel=1e-9)
+    # Check-ins stop: the estimate fades instead of holding steady
+    assert savings_rate(state, days[-1] + timedelta(days=30)) < 12.5
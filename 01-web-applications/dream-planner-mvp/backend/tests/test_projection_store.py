@@ -0,0 +1,118 @@
+"""
+Incremental what-if projections against a full re-simulation
+
+A refreshed ProjectionState only recomputes the years from its earliest
+change on. Whatever the changes, its paths, bands and summary must be the
+ones a projection walked from year one over the same edited draws gives -
+and both must agree with a plain per-simulation loop.
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from app.services.projection import percentile_bands, project_paths, simulate_projection
+from app.services.projection_store import ProjectionState
+
+PROFILE = {"current_assets": 25_000.0, "monthly_income": 6_000.0, "monthly_expenses": 4_200.0}
+YEARS = 12
+SIMULATIONS = 300
+
+def make_state(include_life_events: bool = True, seed: int = 7) -> ProjectionState:
+    draws, paths = simulate_projection(
+        PROFILE["current_assets"], PROFILE["monthly_income"], PROFILE["monthly_expenses"],
+        YEARS, SIMULATIONS, seed, include_life_events=include_life_events
+    )
+    return ProjectionState(
+        1, PROFILE, {"total_required": 400_000.0}, {"max_points": 50}, seed, draws, paths
+    )
+
+def full_resimulation(state: ProjectionState):
+    """Paths and bands walked from year one over the state's current draws"""
+    paths = project_paths(
+        copy.deepcopy(state.draws),
+        PROFILE["current_assets"], PROFILE["monthly_income"], PROFILE["monthly_expenses"]
+    )
+    return paths, percentile_bands(paths["assets"])
+
+def full_resimulation_inputs(state: ProjectionState):
+    """Copies of the state's draws and their fully re-simulated paths"""
+    draws = copy.deepcopy(state.draws)
+    paths, _ = full_resimulation(state)
+    return draws, paths
+
+def loop_reference(draws: dict) -> np.ndarray:
+    """Assets per (year, simulation), one simulation and one year at a time"""
+    years, simulations = draws["returns"].shape
+    expense_factor = draws.get("expense_factor")
+    assets = np.empty((years, simulations))
+    for sim in range(simulations):
+        value = PROFILE["current_assets"]
+        income = PROFILE["monthly_income"]
+        expenses = PROFILE["monthly_expenses"]
+        for year in range(years):
+            income *= draws["income_factor"][year, sim]
+            value -= draws["one_time_costs"][year, sim]
+            if expense_factor is not None:
+                expenses *= expense_factor[year, sim]
+            expenses *= 1.0 + draws["inflation"][year, sim]
+            value += max(income - expenses, 0.0) * (12.0 - draws["paused_months"][year, sim])
+            value = max(value * (1.0 + draws["returns"][year, sim]), 0.0)
+            assets[year, sim] = value
+    return assets
+
+def assert_matches_full(state: ProjectionState):
+    paths, bands = full_resimulation(state)
+    for key in ("assets", "monthly_income", "monthly_expenses"):
+        np.testing.assert_array_equal(state.paths[key], paths[key])
+    np.testing.assert_array_equal(state.bands, bands)
+
+@pytest.mark.parametrize("include_life_events", [True, False])
+def test_fresh_projection_matches_loop(include_life_events):
+    state = make_state(include_life_events)
+    np.testing.assert_allclose(state.paths["assets"], loop_reference(state.draws), rtol=1e-9, atol=1e-6)
+
+@pytest.mark.parametrize("changes, recomputed_from", [
+    ({"actual_return": (5, -0.18)}, 5),
+    ({"inflation": (0.045, 3)}, 3),
+    ({"life_event": ("first_child", 30)}, 3),
+    ({"life_event": ("job_loss", 12 * YEARS - 1)}, YEARS),
+    ({"actual_return": (9, 0.12), "inflation": (0.02, 7), "life_event": ("marriage", 17)}, 2),
+])
+def test_refresh_matches_full_resimulation(changes, recomputed_from):
+    state = make_state()
+    state.apply_changes(**changes)
+    assert state.refresh() == recomputed_from
+
+    assert_matches_full(state)
+    np.testing.assert_allclose(state.paths["assets"], loop_reference(state.draws), rtol=1e-9, atol=1e-6)
+
+    fresh = ProjectionState(1, PROFILE, state.goals, state.options, state.seed, *full_resimulation_inputs(state))
+    assert state.summary() == fresh.summary()
+
+def test_successive_refreshes_match_full_resimulation():
+    """Each refresh builds on the last one's paths, so errors would compound"""
+    state = make_state(seed=11)
+    for year, rate in ((10, 0.3), (2, -0.25), (6, 0.0)):
+        state.apply_changes(actual_return=(year, rate))
+        state.refresh()
+        assert_matches_full(state)
+    state.apply_changes(life_event=("home_upgrade", 0), inflation=(0.06, 11))
+    assert state.refresh() == 1
+    assert_matches_full(state)
+
+def test_refresh_without_changes_recomputes_nothing():
+    state = make_state()
+    before = state.paths["assets"].copy()
+    assert state.refresh() is None
+    np.testing.assert_array_equal(state.paths["assets"], before)
+
+def test_rejected_changes_leave_projection_untouched():
+    state = make_state()
+    draws = copy.deepcopy(state.draws)
+    with pytest.raises(ValueError):
+        state.apply_changes(actual_return=(2, 0.1), life_event=("marriage", 12 * YEARS))
+    assert state.refresh() is None
+    for key, values in draws.items():
+        np.testing.assert_array_equal(state.draws[key], values)
@@ -0,0 +1,165 @@
+"""
+Scheduler sweeps: cursors, failures and nudges
+
+A sweep commits each chunk together with its cursor. A failing chunk is
+rolled back, recorded on the job's state and retried from the last
+committed cursor, and on_commit only ever sees committed chunks. Nudges
+are one per dream per day, the latest sweep's replacing an earlier one.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.scheduler import Job, Scheduler
+from app.models.database import AsyncSessionLocal
+from app.models.dream import Dream, DreamStatus
+from app.models.job import JobState
+from app.models.nudge import DreamNudge, NudgeKind
+from app.services.sweeps import register_jobs
+
+USER_ID = 7001
+
+@pytest.fixture(autouse=True)
+def no_chunk_pause(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_chunk_pause", 0.0)
+
+async def seed_dreams(count: int, **fields) -> list:
+    async with AsyncSessionLocal() as db:
+        dreams = [
+            Dream(user_id=USER_ID, title=f"Dream {k}", target_amount=1000.0, current_saved=0.0,
+                  target_date=datetime(2031, 1, 1), **fields)
+            for k in range(count)
+        ]
+        db.add_all(dreams)
+        await db.commit()
+        return [dream.id for dream in dreams]
+
+async def titles(ids: list) -> list:
+    async with AsyncSessionLocal() as db:
+        return (await db.scalars(select(Dream.title).where(Dream.id.in_(ids)).order_by(Dream.id))).all()
+
+async def job_state(name: str) -> JobState:
+    async with AsyncSessionLocal() as db:
+        return await db.get(JobState, name)
+
+class RenameSweep:
+    """Renames the given dreams chunk by chunk; can fail once when it reaches a cursor"""
+
+    def __init__(self, ids: list, fail_at=None):
+        self.ids = ids
+        self.fail_at = fail_at
+        self.cursors = []
+        self.committed = []
+
+    async def step(self, db, cursor, batch_size):
+        self.cursors.append(cursor)
+        chunk = [dream_id for dream_id in self.ids if dream_id > (cursor or 0)][:batch_size]
+        await db.execute(update(Dream).where(Dream.id.in_(chunk)).values(title="Renamed"))
+        if self.fail_at is not None and cursor == self.fail_at:
+            self.fail_at = None
+            raise RuntimeError("chunk failed")
+        return (chunk[-1] if len(chunk) == batch_size else None), len(chunk), chunk
+
+    async def on_commit(self, changed):
+        self.committed.extend(changed)
+
+def scheduler_with(job: Job) -> Scheduler:
+    scheduler = Scheduler()
+    scheduler.register(job)
+    return scheduler
+
+def test_sweep_walks_every_chunk(run):
+    ids = run(seed_dreams(7))
+    sweep = RenameSweep(ids)
+    scheduler = scheduler_with(Job("rename_all", sweep.step, interval=60, batch_size=3, on_commit=sweep.on_commit))
+
+    assert run(scheduler.run_job("rename_all")) == 7
+    assert sweep.cursors == [None, ids[2], ids[5]]
+    assert sweep.committed == ids
+    assert run(titles(ids)) == ["Renamed"] * 7
+
+    state = run(job_state("rename_all"))
+    assert state.cursor is None and state.last_status == "ok"
+    assert (state.runs, state.failures, state.last_processed) == (1, 0, 7)
+    assert state.next_run_at > state.last_finished_at
+
+def test_failed_chunk_rolls_back_and_resumes_from_the_cursor(run):
+    ids = run(seed_dreams(7))
+    sweep = RenameSweep(ids, fail_at=ids[2])
+    scheduler = scheduler_with(Job("rename_retry", sweep.step, interval=60, batch_size=3, on_commit=sweep.on_commit))
+
+    with pytest.raises(RuntimeError):
+        run(scheduler.run_job("rename_retry"))
+
+    # The first chunk stays committed; the failed one is rolled back and never reported
+    assert run(titles(ids)) == ["Renamed"] * 3 + ["Dream 3", "Dream 4", "Dream 5", "Dream 6"]
+    assert sweep.committed == ids[:3]
+    state = run(job_state("rename_retry"))
+    assert state.last_status == "failed" and state.failures == 1 and state.runs == 0
+    assert state.last_error == "RuntimeError: chunk failed"
+    assert state.cursor == ids[2]
+    assert state.next_run_at == scheduler._next_run["rename_retry"] and state.next_run_at > state.last_started_at
+
+    # The retry starts after the last committed chunk, not from the beginning
+    sweep.cursors.clear()
+    assert run(scheduler.run_job("rename_retry")) == 4
+    assert sweep.cursors == [ids[2], ids[5]]
+    assert sweep.committed == ids
+    assert run(titles(ids)) == ["Renamed"] * 7
+    state = run(job_state("rename_retry"))
+    assert state.last_status == "ok" and state.last_error is None
+    assert (state.cursor, state.runs, state.failures) == (None, 1, 1)
+
+def test_restart_finishes_an_interrupted_sweep_first(run):
+    run(seed_dreams(1))
+    scheduler = scheduler_with(Job("interrupted", RenameSweep([]).step, daily=True, jitter=0))
+
+    async def interrupt():
+        async with AsyncSessionLocal() as db:
+            db.add(JobState(name="interrupted", cursor=5, runs=0, failures=0, last_processed=0,
+                            next_run_at=datetime(2099, 1, 1)))
+            await db.commit()
+        await scheduler._load_state()
+
+    run(interrupt())
+    assert scheduler._next_run["interrupted"] < datetime(2099, 1, 1)
+
+async def nudges_today(dream_id: int) -> list:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(
+            select(DreamNudge.kind, DreamNudge.message)
+            .where(DreamNudge.dream_id == dream_id, DreamNudge.nudge_date == date.today())
+        )).all()
+
+def test_completed_nudge_replaces_the_days_earlier_one(run):
+    scheduler = Scheduler()
+    register_jobs(scheduler)
+    dream_id, = run(seed_dreams(1))
+
+    run(scheduler.run_job("daily_nudges"))
+    (kind, _), = run(nudges_today(dream_id))
+    assert kind != NudgeKind.completed
+
+    async def fund():
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Dream).where(Dream.id == dream_id).values(current_saved=1000.0))
+            await db.commit()
+
+    run(fund())
+    run(scheduler.run_job("complete_funded"))
+    (kind, message), = run(nudges_today(dream_id))
+    assert kind == NudgeKind.completed and "fully funded" in message
+
+    # Re-running either sweep the same day leaves the one nudge alone
+    run(scheduler.run_job("daily_nudges"))
+    run(scheduler.run_job("complete_funded"))
+    assert run(nudges_today(dream_id)) == [(kind, message)]
+
+    async def status():
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(Dream.status).where(Dream.id == dream_id))
+
+    assert run(status()) == DreamStatus.completed
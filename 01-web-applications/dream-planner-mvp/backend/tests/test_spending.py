@@ -0,0 +1,118 @@
+"""
+Spending aggregates against a two-pass reference
+
+ingest_spending merges each batch into the stored monthly statistics with
+Chan's parallel formula, inside the upsert. However the transactions are
+split into batches, the stored rows must hold what a two-pass computation
+over every transaction of the month gives.
+"""
+
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.database import AsyncSessionLocal
+from app.models.spending import SpendingMonth, SpendingSeason
+from app.services.spending import RunningStats, ingest_spending
+
+CATEGORIES = ("groceries", "travel", "utilities")
+
+def random_transactions(rng: random.Random, count: int, base: float = 0.0) -> list:
+    """(category, amount, day) over about two years; base shifts every amount"""
+    start = date(2023, 1, 1)
+    return [
+        (rng.choice(CATEGORIES), round(base + rng.lognormvariate(3.5, 1.0), 2), start + timedelta(days=rng.randrange(800)))
+        for _ in range(count)
+    ]
+
+def two_pass(amounts: list) -> dict:
+    count = len(amounts)
+    mean = sum(amounts) / count
+    return {
+        "count": count,
+        "total": sum(amounts),
+        "mean": mean,
+        "m2": sum((amount - mean) ** 2 for amount in amounts),
+        "min_amount": min(amounts),
+        "max_amount": max(amounts),
+    }
+
+def split_batches(rng: random.Random, transactions: list) -> list:
+    """Random-sized batches, so months are merged across many upserts"""
+    batches, offset = [], 0
+    while offset < len(transactions):
+        size = rng.choice((1, 2, 7, 50, 400))
+        batches.append(transactions[offset:offset + size])
+        offset += size
+    return batches
+
+async def ingest_all(user_id: int, batches: list):
+    for batch in batches:
+        async with AsyncSessionLocal() as db:
+            await ingest_spending(db, user_id, batch)
+            await db.commit()
+
+async def load_rows(user_id: int):
+    async with AsyncSessionLocal() as db:
+        months = (await db.scalars(select(SpendingMonth).where(SpendingMonth.user_id == user_id))).all()
+        seasons = (await db.scalars(select(SpendingSeason).where(SpendingSeason.user_id == user_id))).all()
+    return months, seasons
+
+@pytest.mark.parametrize("user_id, base", [(1001, 0.0), (1002, 1_000_000.0)])
+def test_monthly_merge_matches_two_pass(run, user_id, base):
+    """base = 1e6 puts a large offset under a small spread, where a naive sum of squares loses digits"""
+    rng = random.Random(user_id)
+    transactions = random_transactions(rng, 3000, base)
+    run(ingest_all(user_id, split_batches(rng, transactions)))
+    months, _ = run(load_rows(user_id))
+
+    by_month = defaultdict(list)
+    for category, amount, day in transactions:
+        by_month[(category, day.replace(day=1))].append(amount)
+    assert {(row.category, row.month) for row in months} == set(by_month)
+
+    for row in months:
+        expected = two_pass(by_month[(row.category, row.month)])
+        assert row.count == expected["count"]
+        assert row.min_amount == expected["min_amount"]
+        assert row.max_amount == expected["max_amount"]
+        assert row.total == pytest.approx(expected["total"], rel=1e-12)
+        assert row.mean == pytest.approx(expected["mean"], rel=1e-12)
+        # Relative to the spread, not the mean - that's what variance accuracy means
+        assert row.m2 == pytest.approx(expected["m2"], rel=1e-7, abs=1e-9 * expected["count"] * base)
+
+def test_seasonal_totals_match_recount(run):
+    user_id = 1003
+    rng = random.Random(user_id)
+    transactions = random_transactions(rng, 1500)
+    run(ingest_all(user_id, split_batches(rng, transactions)))
+    _, seasons = run(load_rows(user_id))
+
+    totals, months = defaultdict(float), defaultdict(set)
+    for category, amount, day in transactions:
+        totals[(category, day.month)] += amount
+        months[(category, day.month)].add(day.year)
+
+    assert {(row.category, row.month_of_year) for row in seasons} == set(totals)
+    for row in seasons:
+        key = (row.category, row.month_of_year)
+        assert row.total == pytest.approx(totals[key], rel=1e-12)
+        assert row.months == len(months[key])
+
+def test_running_stats_merge_matches_two_pass():
+    rng = random.Random(5)
+    amounts = [rng.uniform(-50, 500) for _ in range(1000)]
+    left, right = RunningStats(), RunningStats()
+    for amount in amounts[:313]:
+        left.add(amount)
+    for amount in amounts[313:]:
+        right.add(amount)
+    left.merge(right.count, right.mean, right.m2)
+
+    expected = two_pass(amounts)
+    assert left.count == expected["count"]
+    assert left.mean == pytest.approx(expected["mean"], rel=1e-12)
+    assert left.variance == pytest.approx(expected["m2"] / expected["count"], rel=1e-10)
@@ -0,0 +1,95 @@
+"""
+Compiled bracket schedules against a per-bracket loop
+
+BracketSchedule precomputes each bracket's base tax with a cumulative sum
+and answers any income with one searchsorted. The tax, bracket and
+marginal rate it gives must be what walking the brackets one by one
+gives, including on the thresholds themselves.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.tax import (
+    FEDERAL_BRACKETS_2024, STANDARD_DEDUCTIONS_2024, STATE_TAX_RATES, BracketSchedule, FilingStatus, tax_rates
+)
+
+def loop_tax(brackets, income: float) -> float:
+    """Tax each bracket's slice of the income at its rate"""
+    brackets = sorted(brackets)
+    income = max(income, 0.0)
+    tax = 0.0
+    for k, (lower, rate) in enumerate(brackets):
+        upper = brackets[k + 1][0] if k + 1 < len(brackets) else float("inf")
+        if income <= lower:
+            break
+        tax += (min(income, upper) - lower) * rate
+    return tax
+
+def loop_rate(brackets, income: float) -> float:
+    """Rate of the highest bracket whose lower bound the income reaches"""
+    return [rate for lower, rate in sorted(brackets) if max(income, 0.0) >= lower][-1]
+
+def sample_incomes(brackets) -> np.ndarray:
+    """Random incomes plus every threshold, and a cent either side of it"""
+    rng = np.random.default_rng(3)
+    thresholds = np.array([lower for lower, _ in brackets], dtype=np.float64)
+    return np.concatenate((
+        rng.uniform(-5_000, 1_200_000, 2_000),
+        thresholds, thresholds - 0.01, thresholds + 0.01,
+        [0.0, 1e9],
+    ))
+
+@pytest.mark.parametrize("filing_status", list(FilingStatus))
+def test_federal_tax_matches_bracket_loop(filing_status):
+    brackets = FEDERAL_BRACKETS_2024[filing_status]
+    schedule = BracketSchedule(brackets)
+    incomes = sample_incomes(brackets)
+
+    np.testing.assert_allclose(
+        schedule.tax(incomes), [loop_tax(brackets, income) for income in incomes], rtol=1e-12, atol=1e-6
+    )
+    np.testing.assert_array_equal(schedule.marginal_rate(incomes), [loop_rate(brackets, income) for income in incomes])
+
+def test_base_matches_tax_at_each_threshold():
+    for brackets in FEDERAL_BRACKETS_2024.values():
+        schedule = BracketSchedule(brackets)
+        expected = [loop_tax(brackets, lower) for lower, _ in sorted(brackets)]
+        np.testing.assert_allclose(schedule.base, expected, rtol=1e-12, atol=1e-9)
+
+def test_unsorted_and_random_schedules_match_bracket_loop():
+    rng = np.random.default_rng(21)
+    for _ in range(20):
+        lowers = np.concatenate(([0.0], np.sort(rng.uniform(1_000, 500_000, rng.integers(1, 9)))))
+        brackets = list(zip(lowers.tolist(), np.sort(rng.uniform(0.0, 0.5, len(lowers))).tolist()))
+        rng.shuffle(brackets)
+        schedule = BracketSchedule(brackets)
+        incomes = sample_incomes(brackets)
+        np.testing.assert_allclose(
+            schedule.tax(incomes), [loop_tax(brackets, income) for income in incomes], rtol=1e-12, atol=1e-6
+        )
+
+def test_scaled_schedule_matches_scaled_brackets():
+    brackets = FEDERAL_BRACKETS_2024[FilingStatus.single]
+    factor = 1.025 ** 17
+    scaled = [(lower * factor, rate) for lower, rate in brackets]
+    incomes = sample_incomes(scaled)
+    np.testing.assert_allclose(
+        BracketSchedule(brackets).scaled(factor).tax(incomes),
+        [loop_tax(scaled, income) for income in incomes],
+        rtol=1e-12, atol=1e-6
+    )
+
+def test_tax_rates_match_loop_with_state_and_deduction():
+    status, state = FilingStatus.married_jointly, "California"
+    brackets = FEDERAL_BRACKETS_2024[status]
+    gross = np.array([0.0, 25_000.0, 95_000.0, 250_000.0, 900_000.0])
+    rates = tax_rates(gross, state, status)
+
+    taxable = np.maximum(gross - STANDARD_DEDUCTIONS_2024[status], 0.0)
+    federal = np.array([loop_tax(brackets, income) for income in taxable])
+    state_tax = taxable * STATE_TAX_RATES[state]
+    np.testing.assert_allclose(rates.federal_tax, federal, rtol=1e-12)
+    np.testing.assert_allclose(rates.total_tax, federal + state_tax, rtol=1e-12)
+    np.testing.assert_allclose(rates.effective_rate[1:], (federal + state_tax)[1:] / gross[1:], rtol=1e-12)
+    assert rates.effective_rate[0] == 0.0